@@ -0,0 +1,161 @@
+import numpy as np
+import pandas as pd
+
+from network_data import MAPPINGS, records_frame, logical_series, merge_duplicate_cells, haversine_km
+from neighbours import site_table
+from spatial_index import SpatialIndex
+
+COLOCATION_COLUMNS = ["LTE Site", "NR Site", "Match", "Distance (km)"]
+# Evidence a pair is co-located, strongest first
+MATCH_TYPES = ["DSS", "USID", "Coordinates"]
+# Sites whose mean cell positions are this close are taken as one location
+COLOCATION_KM = 0.1
+
+
+def dss_pairs(dataset):
+    """(LTE site, NR site) pairs from 5GNR DSS_LTECELL references to LTE cells"""
+    nr = dataset.fields("5GNR", ["Site", "DSS_LTECELL"])
+    nr = nr[(nr["Site"] != "") & (nr["DSS_LTECELL"] != "")]
+    lte = dataset.fields("LTE", ["cell", "Site"])
+    lte_site = lte[(lte["cell"] != "") & (lte["Site"] != "")].drop_duplicates("cell").set_index("cell")["Site"]
+    pairs = pd.DataFrame({"LTE Site": nr["DSS_LTECELL"].map(lte_site).to_numpy(), "NR Site": nr["Site"].to_numpy()})
+    return pairs.dropna().drop_duplicates()
+
+
+def usid_pairs(dataset):
+    """(LTE site, NR site) pairs sharing a USID
+
+    Integer USIDs are joined as int64; the few that are not integers are
+    joined as text.
+    """
+    numeric, text = [], []
+    for tech in ("LTE", "5GNR"):
+        usid, valid = dataset.int_ids(tech, "USID")
+        usid_text = dataset.field(tech, "USID").to_numpy(dtype=object)
+        site = dataset.field(tech, "Site").to_numpy(dtype=object)
+        has_site = site != ""
+        numeric.append(pd.DataFrame({"USID": usid[valid & has_site], "Site": site[valid & has_site]}).drop_duplicates())
+        other = ~valid & (usid_text != "") & has_site
+        text.append(pd.DataFrame({"USID": usid_text[other], "Site": site[other]}).drop_duplicates())
+    pairs = pd.concat([lte.merge(nr, on="USID", suffixes=(" LTE", " NR")) for lte, nr in (numeric, text)])
+    return pd.DataFrame({"LTE Site": pairs["Site LTE"], "NR Site": pairs["Site NR"]}).drop_duplicates()
+
+
+def coordinate_pairs(lte_sites, nr_sites, km=COLOCATION_KM):
+    """(LTE site, NR site) pairs whose site positions lie within km of each other"""
+    if lte_sites.empty or nr_sites.empty:
+        return pd.DataFrame(columns=["LTE Site", "NR Site"])
+    # One index over both site sets; only LTE -> NR pairs are kept
+    lat = np.concatenate((lte_sites["lat"].to_numpy(), nr_sites["lat"].to_numpy()))
+    lon = np.concatenate((lte_sites["lon"].to_numpy(), nr_sites["lon"].to_numpy()))
+    i, j, _ = SpatialIndex(lat, lon, km).pairs_from(np.arange(len(lte_sites)), km)
+    cross = j >= len(lte_sites)
+    return pd.DataFrame({
+        "LTE Site": lte_sites.index.to_numpy()[i[cross]],
+        "NR Site": nr_sites.index.to_numpy()[j[cross] - len(lte_sites)]
+    })
+
+
+def colocation_pairs(dataset, km=COLOCATION_KM):
+    """Every co-located (LTE site, NR site) pair with its evidence and site distance
+
+    Pairs come from DSS_LTECELL references, shared USIDs and site positions
+    within km. Match lists every kind of evidence found, strongest first.
+    """
+    if dataset.frame("LTE").empty or dataset.frame("5GNR").empty:
+        return pd.DataFrame(columns=COLOCATION_COLUMNS)
+    lte_sites = site_table(dataset.field("LTE", "Site"), *dataset.coordinates("LTE"))
+    nr_sites = site_table(dataset.field("5GNR", "Site"), *dataset.coordinates("5GNR"))
+    # Each kind of evidence is one bit, so a pair's evidence is the sum of its (deduplicated) rows
+    parts = [
+        dss_pairs(dataset).assign(Match=1),
+        usid_pairs(dataset).assign(Match=2),
+        coordinate_pairs(lte_sites, nr_sites, km).assign(Match=4)
+    ]
+    pairs = pd.concat(parts, ignore_index=True).groupby(["LTE Site", "NR Site"], sort=True)["Match"].sum().reset_index()
+    labels = {bits: ", ".join(name for k, name in enumerate(MATCH_TYPES) if bits & (1 << k)) for bits in range(8)}
+    pairs["Match"] = pairs["Match"].map(labels)
+    lte_pos = lte_sites.reindex(pairs["LTE Site"])
+    nr_pos = nr_sites.reindex(pairs["NR Site"])
+    pairs["Distance (km)"] = np.round(haversine_km(lte_pos["lat"].to_numpy(), lte_pos["lon"].to_numpy(),
+                                                   nr_pos["lat"].to_numpy(), nr_pos["lon"].to_numpy()), 4)
+    return pairs[COLOCATION_COLUMNS]
+
+
+def site_lookup(keys, values):
+    """(sorted keys, values in key order) for searchsorted lookups"""
+    keys = np.asarray(keys, dtype=str)
+    values = np.asarray(values, dtype=str)
+    order = np.lexsort((values, keys))
+    return keys[order], values[order]
+
+
+class ColocationIndex:
+    """LTE <-> 5GNR site lookups built once from colocation_pairs
+
+    Pairs are kept as sorted arrays per direction, so building the index is
+    two sorts and each lookup a binary search.
+    """
+
+    def __init__(self, pairs):
+        self.pairs = pairs
+        self._lookups = {
+            "LTE": site_lookup(pairs["LTE Site"], pairs["NR Site"]),
+            "5GNR": site_lookup(pairs["NR Site"], pairs["LTE Site"])
+        }
+
+    def __len__(self):
+        return len(self.pairs)
+
+    def partners(self, tech, site):
+        """Sites of the other technology co-located with one site of tech"""
+        keys, values = self._lookups[tech]
+        lo = np.searchsorted(keys, site, side="left")
+        hi = np.searchsorted(keys, site, side="right")
+        return values[lo:hi].tolist()
+
+    def counterparts(self, tech, sites):
+        """Sorted sites of the other technology co-located with any of the given sites"""
+        keys, values = self._lookups[tech]
+        sites = np.asarray(list(sites), dtype=str)
+        lo = np.searchsorted(keys, sites, side="left")
+        hi = np.searchsorted(keys, sites, side="right")
+        found = set()
+        for a, b in zip(lo, hi):
+            found.update(values[a:b].tolist())
+        return sorted(found)
+
+    def vdt_pairs(self, lte_sites, nr_sites):
+        """(LTE site, NR site) rows: each LTE site beside its co-located NR sites, the rest on their own"""
+        nr_sites = set(nr_sites)
+        paired = set()
+        rows = []
+        for lte_site in sorted(set(lte_sites)):
+            partners = [nr_site for nr_site in self.partners("LTE", lte_site) if nr_site in nr_sites]
+            rows.extend((lte_site, nr_site) for nr_site in partners or [""])
+            paired.update(partners)
+        rows.extend(("", nr_site) for nr_site in sorted(nr_sites - paired))
+        return rows
+
+
+def dataset_colocation(dataset, km=COLOCATION_KM):
+    """ColocationIndex over every site of a NetworkDataset"""
+    return ColocationIndex(colocation_pairs(dataset, km))
+
+
+def counterpart_records(dataset, index, records, mappings=MAPPINGS):
+    """(tech, row) records of the co-located sites of the other technology not already in records"""
+    sites = {}
+    for tech in ("LTE", "5GNR"):
+        df = records_frame(records, tech)
+        sites[tech] = set(logical_series(df, mappings[tech]["Site"], tech)) - {""} if not df.empty else set()
+    added = []
+    for tech, other in (("LTE", "5GNR"), ("5GNR", "LTE")):
+        wanted = [site for site in index.counterparts(tech, sites[tech]) if site not in sites[other]]
+        site_index = dataset.index(other, "Site") if wanted else {}
+        positions = [site_index[site] for site in wanted if site in site_index]
+        if not positions:
+            continue
+        matched = dataset.frame(other).iloc[np.sort(np.concatenate(positions))]
+        added.extend((other, row) for _, row in merge_duplicate_cells(matched, other).iterrows())
+    return added
@@ -0,0 +1,139 @@
+import numpy as np
+import pandas as pd
+
+from network_data import MAPPINGS, resolve_columns, clean_series, angle_diff_deg
+
+CONSISTENCY_COLUMNS = [
+    "Tech", "Market", "Site", "Cell", "Field", "OSS Column", "OSS Value", "Atoll Column", "Atoll Value", "Difference"
+]
+CONSISTENCY_SUMMARY_COLUMNS = [
+    "Tech", "Market", "Field", "Compared", "Mismatches", "Mismatch %", "Missing in Atoll", "Missing in OSS"
+]
+# Numeric differences up to these are not mismatches; other fields must match exactly
+CONSISTENCY_TOLERANCES = {
+    "Azumuth": 5.0,
+    "height(Meter)": 1.0,
+    "Electrical Tilt": 0.5,
+    "Digital Tilt": 0.5,
+    "Power": 0.5
+}
+# Compared as angles, so 359 and 1 are 2 degrees apart
+CIRCULAR_FIELDS = {"Azumuth"}
+
+
+def is_atoll_column(col):
+    """True for Atoll planning columns (Atoll_PCI, ATOLL_AZIMUTH, ...)"""
+    return str(col).strip().lower().startswith("atoll")
+
+
+def column_pairs(columns, tech, mappings=MAPPINGS):
+    """{logical field: (OSS columns, Atoll columns)} for fields present from both sources"""
+    pairs = {}
+    for key, names in mappings[tech].items():
+        resolved = resolve_columns(columns, names, tech)
+        atoll = [col for col in resolved if is_atoll_column(col)]
+        oss = [col for col in resolved if not is_atoll_column(col)]
+        if atoll and oss:
+            pairs[key] = (oss, atoll)
+    return pairs
+
+
+def coalesce(df, columns, cache):
+    """First non-empty cleaned value across columns, per row, and the column it came from"""
+    values = pd.Series("", index=df.index, dtype=object)
+    sources = pd.Series("", index=df.index, dtype=object)
+    for col in reversed(columns):
+        if col not in cache:
+            cache[col] = clean_series(df[col])
+        present = cache[col] != ""
+        values = cache[col].where(present, values)
+        sources = sources.mask(present, str(col))
+    return values.to_numpy(), sources.to_numpy()
+
+
+def compare_values(field, oss, atoll):
+    """(mismatch mask, numeric difference or NaN) for rows where both sides have a value"""
+    oss_num = pd.to_numeric(pd.Series(oss), errors="coerce").to_numpy(dtype=float)
+    atoll_num = pd.to_numeric(pd.Series(atoll), errors="coerce").to_numpy(dtype=float)
+    numeric = np.isfinite(oss_num) & np.isfinite(atoll_num)
+    if field in CIRCULAR_FIELDS:
+        diff = angle_diff_deg(oss_num, atoll_num)
+    else:
+        diff = np.abs(oss_num - atoll_num)
+    mismatch = numeric & (diff > CONSISTENCY_TOLERANCES.get(field, 0.0))
+    # Only text values need the (slower) case-insensitive string comparison
+    text = np.flatnonzero(~numeric)
+    if len(text):
+        mismatch[text] = pd.Series(oss[text]).str.lower().to_numpy() != pd.Series(atoll[text]).str.lower().to_numpy()
+    return mismatch, np.where(numeric, diff, np.nan)
+
+
+def audit_tech_consistency(df, tech, mappings=MAPPINGS):
+    """Mismatch rows and per-market summary rows for one technology's dump"""
+    pairs = column_pairs(df.columns, tech, mappings)
+    if not pairs:
+        return pd.DataFrame(columns=CONSISTENCY_COLUMNS), pd.DataFrame(columns=CONSISTENCY_SUMMARY_COLUMNS)
+    cache = {}
+    market, _ = coalesce(df, resolve_columns(df.columns, mappings[tech]["ED_Market"], tech), cache)
+    site, _ = coalesce(df, resolve_columns(df.columns, mappings[tech]["Site"], tech), cache)
+    cell, _ = coalesce(df, resolve_columns(df.columns, mappings[tech]["cell"], tech), cache)
+
+    mismatches, summaries = [], []
+    for field, (oss_columns, atoll_columns) in pairs.items():
+        oss, oss_source = coalesce(df, oss_columns, cache)
+        atoll, atoll_source = coalesce(df, atoll_columns, cache)
+        has_oss = oss != ""
+        has_atoll = atoll != ""
+        both = has_oss & has_atoll
+        mismatch = np.zeros(len(df), dtype=bool)
+        difference = np.full(len(df), np.nan)
+        mismatch[both], difference[both] = compare_values(field, oss[both], atoll[both])
+
+        counts = pd.DataFrame({
+            "Market": market,
+            "Compared": both,
+            "Mismatches": mismatch,
+            "Missing in Atoll": has_oss & ~has_atoll,
+            "Missing in OSS": has_atoll & ~has_oss
+        }).groupby("Market", sort=True).sum().reset_index()
+        counts.insert(0, "Tech", tech)
+        counts.insert(2, "Field", field)
+        summaries.append(counts)
+
+        rows = np.flatnonzero(mismatch)
+        mismatches.append(pd.DataFrame({
+            "Tech": tech,
+            "Market": market[rows],
+            "Site": site[rows],
+            "Cell": cell[rows],
+            "Field": field,
+            "OSS Column": oss_source[rows],
+            "OSS Value": oss[rows],
+            "Atoll Column": atoll_source[rows],
+            "Atoll Value": atoll[rows],
+            "Difference": np.round(difference[rows], 3)
+        }, columns=CONSISTENCY_COLUMNS))
+    summary = pd.concat(summaries, ignore_index=True)
+    summary["Mismatch %"] = np.round(100 * summary["Mismatches"] / summary["Compared"].where(summary["Compared"] > 0), 2)
+    return pd.concat(mismatches, ignore_index=True), summary[CONSISTENCY_SUMMARY_COLUMNS]
+
+
+def audit_consistency(dataset, techs=("LTE", "5GNR"), mappings=MAPPINGS):
+    """Compare every OSS / Atoll column pair of every cell
+
+    Returns (mismatch rows, per-market summary of compared, mismatched and
+    one-sided values per field).
+    """
+    mismatches, summaries = [], []
+    for tech in techs:
+        df = dataset.frame(tech)
+        if df.empty:
+            continue
+        tech_mismatches, tech_summary = audit_tech_consistency(df, tech, mappings)
+        mismatches.append(tech_mismatches)
+        summaries.append(tech_summary)
+    if not mismatches:
+        return pd.DataFrame(columns=CONSISTENCY_COLUMNS), pd.DataFrame(columns=CONSISTENCY_SUMMARY_COLUMNS)
+    mismatches = pd.concat(mismatches, ignore_index=True)
+    mismatches = mismatches.sort_values(["Tech", "Market", "Site", "Cell", "Field"], kind="stable").reset_index(drop=True)
+    return mismatches, pd.concat(summaries, ignore_index=True)
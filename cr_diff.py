@@ -0,0 +1,163 @@
+import os
+import logging
+
+import numpy as np
+import pandas as pd
+
+from network_data import CR_PARAMETERS, CR_COLUMNS, CR_SHEET_NAMES, clean_series
+from cr_rules import TECH_ALIASES, CR_GROUP_COLUMNS, values_differ
+from export_engine import write_xlsx_sheets
+
+# Cell key column of a plan sheet, per technology (matched case-insensitively)
+PLAN_KEY_COLUMNS = {
+    "LTE": ["EUTRAN_CELL_FDD_ID", "OSS_EUTRAN_CELL_FDD_ID", "CELL"],
+    "5GNR": ["NRCELLDUID", "CELL"]
+}
+DIFF_SUMMARY_COLUMNS = ["Tech", "Parameter", "Planned", "Not Found", "Unchanged", "Changes"]
+
+
+def read_plan(file_path):
+    """Planned-values sheets as string DataFrames (every sheet of a workbook)"""
+    if str(file_path).lower().endswith(".csv"):
+        return [pd.read_csv(file_path, dtype=str)]
+    return list(pd.read_excel(file_path, sheet_name=None, dtype=str).values())
+
+
+def find_column(columns, names):
+    """First column equal (case-insensitively) to one of the names, else None"""
+    lowered = {str(col).strip().lower(): col for col in columns}
+    for name in names:
+        if name.lower() in lowered:
+            return lowered[name.lower()]
+    return None
+
+
+def plan_parameters(columns, tech):
+    """Plan column -> CR type, for columns named by CR type or by logical field"""
+    names = {}
+    for cr_type, (field, _) in CR_PARAMETERS[tech].items():
+        names[cr_type.lower()] = cr_type
+        names.setdefault(field.lower(), cr_type)
+    return {col: names[str(col).strip().lower()] for col in columns if str(col).strip().lower() in names}
+
+
+def split_plan(df):
+    """(tech, sheet rows) parts of one plan sheet
+
+    A Tech column splits the sheet; otherwise the cell key column decides
+    (EUTRAN_CELL_FDD_ID for LTE, NRCELLDUID for 5GNR).
+    """
+    tech_column = find_column(df.columns, ["Tech", "Technology"])
+    if tech_column is not None:
+        techs = df[tech_column].fillna("").str.strip().str.upper().map(TECH_ALIASES)
+        return [(tech, df[(techs == tech).to_numpy()]) for tech in ("LTE", "5GNR") if (techs == tech).any()]
+    if find_column(df.columns, PLAN_KEY_COLUMNS["LTE"][:2]) is not None:
+        return [("LTE", df)]
+    if find_column(df.columns, PLAN_KEY_COLUMNS["5GNR"][:1]) is not None:
+        return [("5GNR", df)]
+    raise ValueError("Plan sheet needs a Tech column or an EUTRAN_CELL_FDD_ID / NRCELLDUID column")
+
+
+def plan_changes(dataset, tech, plan):
+    """CR rows and summary rows for one technology's part of a plan"""
+    key_column = find_column(plan.columns, PLAN_KEY_COLUMNS[tech])
+    if key_column is None:
+        raise ValueError(f"{tech} plan has no cell key column ({', '.join(PLAN_KEY_COLUMNS[tech])})")
+    parameters = plan_parameters(plan.columns, tech)
+    if not parameters:
+        logging.error(f"{tech} plan has no known CR parameter columns; skipped")
+        return [], []
+
+    plan = plan.assign(**{"_cell": clean_series(plan[key_column])})
+    plan = plan[plan["_cell"] != ""].drop_duplicates("_cell", keep="last")
+    dump_cells = dataset.field(tech, "cell")
+    # Row position of the first dump row of each cell
+    current_rows = np.flatnonzero(((dump_cells != "") & ~dump_cells.duplicated()).to_numpy())
+    # One hash lookup for every plan cell; -1 where the cell is not in the dump
+    rows = pd.Index(dump_cells.to_numpy()[current_rows]).get_indexer(plan["_cell"])
+    found = rows >= 0
+
+    # Long arrays over every planned (cell, parameter) pair, then one comparison
+    cells, types, planned, positions, missing = [], [], [], [], []
+    for column, cr_type in parameters.items():
+        values = clean_series(plan[column]).to_numpy()
+        has_value = values != ""
+        keep = has_value & found
+        missing.append((cr_type, int(has_value.sum()), int((has_value & ~found).sum())))
+        cells.append(plan["_cell"].to_numpy()[keep])
+        types.append(np.full(int(keep.sum()), cr_type, dtype=object))
+        planned.append(values[keep])
+        positions.append(current_rows[rows[keep]])
+    cells = np.concatenate(cells)
+    types = np.concatenate(types)
+    planned = np.concatenate(planned)
+    positions = np.concatenate(positions)
+
+    current_values = np.empty(len(positions), dtype=object)
+    for cr_type in parameters.values():
+        mask = types == cr_type
+        field = CR_PARAMETERS[tech][cr_type][0]
+        current_values[mask] = dataset.field(tech, field).to_numpy()[positions[mask]]
+    changed = values_differ(current_values, planned)
+
+    frame_rows = positions[changed]
+    mo_class = np.empty(int(changed.sum()), dtype=object)
+    for cr_type in parameters.values():
+        mask = types[changed] == cr_type
+        prefix, suffix = CR_PARAMETERS[tech][cr_type][1].split("{cell}")
+        mo_class[mask] = prefix + pd.Series(cells[changed][mask], dtype=object) + suffix
+    crs = pd.DataFrame({
+        "Tech": tech,
+        "Market": dataset.field(tech, "ED_Market").to_numpy()[frame_rows],
+        "Site": dataset.field(tech, "Site").to_numpy()[frame_rows],
+        "MO Class": mo_class,
+        "Parameter": types[changed],
+        "Value": planned[changed],
+        "CurrentValue": current_values[changed]
+    }, columns=CR_GROUP_COLUMNS)
+
+    summary = []
+    for cr_type, planned_count, not_found in missing:
+        mask = types == cr_type
+        changes = int((changed & mask).sum())
+        summary.append([tech, cr_type, planned_count, not_found, int(mask.sum()) - changes, changes])
+    return [crs], summary
+
+
+def build_plan_crs(dataset, plan_sheets):
+    """Compare planned values with the loaded dump
+
+    Returns (CR rows for changed parameters only, per-parameter summary).
+    """
+    crs = []
+    summary = []
+    for sheet in plan_sheets:
+        for tech, plan in split_plan(sheet):
+            if dataset.frame(tech).empty:
+                logging.error(f"Plan has {tech} cells but no {tech} dump is loaded; skipped")
+                continue
+            tech_crs, tech_summary = plan_changes(dataset, tech, plan)
+            crs.extend(tech_crs)
+            summary.extend(tech_summary)
+    if crs:
+        result = pd.concat(crs, ignore_index=True)
+        result = result.drop_duplicates(["Tech", "MO Class", "Parameter"], keep="last")
+        result = result.sort_values(["Market", "Site", "MO Class", "Parameter"], kind="stable").reset_index(drop=True)
+    else:
+        result = pd.DataFrame(columns=CR_GROUP_COLUMNS)
+    summary = pd.DataFrame(summary, columns=DIFF_SUMMARY_COLUMNS)
+    summary = summary.groupby(["Tech", "Parameter"], as_index=False, sort=False).sum()
+    return result, summary
+
+
+def write_diff_workbook(crs, summary, file_path):
+    """One workbook: a CR sheet per technology plus the Summary sheet"""
+    directory = os.path.dirname(file_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    sheets = [
+        (CR_SHEET_NAMES[tech], CR_COLUMNS, crs.loc[crs["Tech"] == tech, CR_COLUMNS].itertuples(index=False, name=None))
+        for tech in ("LTE", "5GNR") if (crs["Tech"] == tech).any()
+    ]
+    sheets.append(("Summary", DIFF_SUMMARY_COLUMNS, summary.itertuples(index=False, name=None)))
+    return write_xlsx_sheets(sheets, file_path)
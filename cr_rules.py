@@ -0,0 +1,159 @@
+import os
+import re
+import json
+import logging
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from network_data import CR_PARAMETERS, CR_COLUMNS, CR_SHEET_NAMES, clean_value, read_dump
+from query_planner import QueryPlanner, parse_query
+from export_engine import write_xlsx_sheets
+
+TECH_ALIASES = {"LTE": "LTE", "4G": "LTE", "5GNR": "5GNR", "5G": "5GNR", "NR": "5GNR"}
+# Columns write_cr_workbooks needs; other columns are ignored when writing
+CR_GROUP_COLUMNS = ["Tech", "Market"] + CR_COLUMNS
+RULE_CR_COLUMNS = ["Tech", "Market", "Rule"] + CR_COLUMNS
+RULE_SUMMARY_COLUMNS = ["Rule", "Tech", "Parameter", "Value", "Where", "Matched", "Changes"]
+
+
+class CRRule:
+    """Set one CR parameter to a value for every cell matching a query"""
+
+    def __init__(self, tech, parameter, value, where="", name=""):
+        if str(tech).strip().upper() not in TECH_ALIASES:
+            raise ValueError(f"Unknown technology in rule: {tech}")
+        tech = TECH_ALIASES[str(tech).strip().upper()]
+        if parameter not in CR_PARAMETERS[tech]:
+            raise ValueError(f"Unknown {tech} CR parameter '{parameter}' "
+                             f"(expected one of {', '.join(CR_PARAMETERS[tech])})")
+        self.tech = tech
+        self.parameter = parameter
+        self.value = clean_value(str(value).strip())
+        self.where = str(where or "").strip()
+        self.name = str(name or "").strip() or f"{parameter}={self.value}"
+        # Fail on a bad where-clause when the rules are loaded, not halfway through a run
+        self.tree = parse_query(self.where) if self.where else None
+
+
+def load_rules(file_path):
+    """Read rules from .json (list of objects) or a .csv/.xlsx sheet
+
+    Columns/keys: Tech, Parameter, Value, Where and optional Name; matched
+    case-insensitively.
+    """
+    if str(file_path).lower().endswith(".json"):
+        with open(file_path, encoding="utf-8") as f:
+            records = json.load(f)
+    else:
+        records = read_dump(file_path).fillna("").to_dict("records")
+    rules = []
+    for i, record in enumerate(records, start=1):
+        record = {str(k).strip().lower(): v for k, v in record.items()}
+        if not any(str(v).strip() for v in record.values()):
+            continue
+        try:
+            rules.append(CRRule(record.get("tech", ""), str(record.get("parameter", "")).strip(),
+                                record.get("value", ""), record.get("where", ""), record.get("name", "")))
+        except ValueError as e:
+            raise ValueError(f"Rule {i}: {str(e)}")
+    return rules
+
+
+def values_differ(current, target):
+    """True where current differs from target (numerically where both are numbers)
+
+    target is a scalar or an array aligned with current.
+    """
+    current = np.asarray(current, dtype=object)
+    target = np.broadcast_to(np.asarray(target, dtype=object), current.shape)
+    current_num = pd.to_numeric(pd.Series(current), errors="coerce").to_numpy(dtype=float)
+    target_num = pd.to_numeric(pd.Series(target), errors="coerce").to_numpy(dtype=float)
+    both_numeric = ~np.isnan(current_num) & ~np.isnan(target_num)
+    with np.errstate(invalid="ignore"):
+        return np.where(both_numeric, ~np.isclose(current_num, target_num), current != target)
+
+
+def build_rule_crs(dataset, rules):
+    """Evaluate rules over the whole dataset
+
+    Returns (CR rows, per-rule summary). Only cells whose current value
+    differs from the rule's value produce a CR; when several rules touch the
+    same cell parameter, the later rule wins.
+    """
+    planner = QueryPlanner(dataset)
+    crs = []
+    summary = []
+    for rule in rules:
+        df = dataset.frame(rule.tech)
+        matched = 0
+        changes = 0
+        if not df.empty:
+            if rule.tree is None:
+                positions = np.arange(len(df))
+            else:
+                positions = planner.match_positions(rule.tree, rule.tech)[0]
+            field, mo_template = CR_PARAMETERS[rule.tech][rule.parameter]
+            fields = dataset.fields(rule.tech, ["Site", "cell", field, "ED_Market"]).iloc[positions]
+            fields = fields[fields["cell"] != ""].drop_duplicates("cell")
+            matched = len(fields)
+            fields = fields[values_differ(fields[field], rule.value)]
+            changes = len(fields)
+            if changes:
+                prefix, suffix = mo_template.split("{cell}")
+                crs.append(pd.DataFrame({
+                    "Tech": rule.tech,
+                    "Market": fields["ED_Market"],
+                    "Rule": rule.name,
+                    "Site": fields["Site"],
+                    "MO Class": prefix + fields["cell"] + suffix,
+                    "Parameter": rule.parameter,
+                    "Value": rule.value,
+                    "CurrentValue": fields[field]
+                }, columns=RULE_CR_COLUMNS))
+        summary.append([rule.name, rule.tech, rule.parameter, rule.value, rule.where, matched, changes])
+    if crs:
+        result = pd.concat(crs, ignore_index=True)
+        result = result.drop_duplicates(["Tech", "Site", "MO Class", "Parameter"], keep="last")
+        result = result.sort_values(["Market", "Site", "MO Class", "Parameter"], kind="stable").reset_index(drop=True)
+    else:
+        result = pd.DataFrame(columns=RULE_CR_COLUMNS)
+    return result, pd.DataFrame(summary, columns=RULE_SUMMARY_COLUMNS)
+
+
+def safe_filename(name):
+    """File-system safe version of a site or market name"""
+    return re.sub(r"[^\w.-]+", "_", str(name)).strip("_") or "UNKNOWN"
+
+
+def write_cr_group(file_path, sheets):
+    """Write one CR workbook; sheets are (sheet name, rows) pairs"""
+    write_xlsx_sheets([(name, CR_COLUMNS, rows) for name, rows in sheets], file_path)
+    return file_path
+
+
+def write_cr_workbooks(crs, out_dir, split="site", workers=None):
+    """Write one CR workbook per site or per market, in parallel; returns the paths"""
+    if split not in ("site", "market"):
+        raise ValueError("split must be 'site' or 'market'")
+    os.makedirs(out_dir, exist_ok=True)
+    group_column = "Site" if split == "site" else "Market"
+    jobs = []
+    for group, rows in crs.groupby(crs[group_column].replace("", "UNKNOWN"), sort=True):
+        sheets = [
+            (CR_SHEET_NAMES[tech], rows.loc[rows["Tech"] == tech, CR_COLUMNS].values.tolist())
+            for tech in ("LTE", "5GNR") if (rows["Tech"] == tech).any()
+        ]
+        jobs.append((os.path.join(out_dir, f"{safe_filename(group)}_CR.xlsx"), sheets))
+    if not jobs:
+        return []
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(jobs) == 1:
+        paths = [write_cr_group(path, sheets) for path, sheets in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunksize = max(1, len(jobs) // (workers * 4))
+            paths = list(executor.map(write_cr_group, *zip(*jobs), chunksize=chunksize))
+    logging.info(f"Wrote {len(paths)} CR workbooks to {out_dir}")
+    return paths
@@ -0,0 +1,98 @@
+import numpy as np
+import pandas as pd
+
+DSS_COLUMNS = [
+    "Market", "NR Site", "NR Cell", "DSS_LTECELL", "LTE Site", "NR USID", "LTE USID",
+    "NR Admin State", "LTE Admin State", "NR Op State", "LTE Op State", "Issue"
+]
+DSS_SUMMARY_COLUMNS = ["Market", "References", "Dangling", "Site Mismatch", "State Conflict"]
+# Problems a DSS reference can have, in report order
+DSS_ISSUES = ["Dangling", "Site Mismatch", "State Conflict"]
+
+
+def lte_cell_table(dataset):
+    """LTE site, USID and states per cell name (first row of each cell wins)"""
+    lte = dataset.fields("LTE", ["cell", "Site", "USID", "ADMINISTRATIVESTATE", "OPERATIONALSTATE"])
+    lte = lte[lte["cell"] != ""].drop_duplicates("cell")
+    return lte.set_index("cell")
+
+
+def differs(a, b):
+    """Rows where both values are present and differ ignoring case"""
+    a = a.to_numpy(dtype=object)
+    b = b.to_numpy(dtype=object)
+    result = (a != "") & (b != "") & (a != b)
+    # Only exact mismatches need the (slower) case-insensitive comparison
+    rows = np.flatnonzero(result)
+    if len(rows):
+        result[rows] = pd.Series(a[rows]).str.upper().to_numpy() != pd.Series(b[rows]).str.upper().to_numpy()
+    return result
+
+
+def validate_dss(dataset):
+    """Check every 5GNR DSS_LTECELL reference against the LTE cells
+
+    One left join resolves all references. A reference is Dangling when no
+    LTE cell has that name, a Site Mismatch when the LTE cell shares neither
+    the site name nor the USID of the NR cell, and a State Conflict when the
+    administrative or operational states of the two cells differ. Returns
+    (one row per reference with at least one issue, per-market counts).
+    """
+    if dataset.frame("5GNR").empty:
+        return pd.DataFrame(columns=DSS_COLUMNS), pd.DataFrame(columns=DSS_SUMMARY_COLUMNS)
+    nr = dataset.fields("5GNR", ["ED_Market", "Site", "cell", "DSS_LTECELL", "USID",
+                                 "ADMINISTRATIVESTATE", "OPERATIONALSTATE"])
+    nr = nr[nr["DSS_LTECELL"] != ""].reset_index(drop=True)
+    if nr.empty:
+        return pd.DataFrame(columns=DSS_COLUMNS), pd.DataFrame(columns=DSS_SUMMARY_COLUMNS)
+    if dataset.frame("LTE").empty:
+        lte = pd.DataFrame(columns=["cell", "Site", "USID", "ADMINISTRATIVESTATE", "OPERATIONALSTATE"]).set_index("cell")
+    else:
+        lte = lte_cell_table(dataset)
+    joined = nr.join(lte, on="DSS_LTECELL", rsuffix=" LTE")
+
+    dangling = joined["Site LTE"].isna().to_numpy()
+    joined = joined.fillna("")
+    same_site = (joined["Site"] != "").to_numpy() & ~differs(joined["Site"], joined["Site LTE"])
+    same_usid = ((joined["USID"] != "") & (joined["USID"] == joined["USID LTE"])).to_numpy()
+    site_mismatch = ~dangling & ~(same_site | same_usid)
+    state_conflict = ~dangling & (differs(joined["ADMINISTRATIVESTATE"], joined["ADMINISTRATIVESTATE LTE"]) |
+                                  differs(joined["OPERATIONALSTATE"], joined["OPERATIONALSTATE LTE"]))
+
+    # Each issue is one bit, labelled the same way as co-location evidence
+    bits = dangling * 1 + site_mismatch * 2 + state_conflict * 4
+    labels = {b: ", ".join(name for k, name in enumerate(DSS_ISSUES) if b & (1 << k)) for b in range(8)}
+    rows = np.flatnonzero(bits)
+    issues = pd.DataFrame({
+        "Market": joined["ED_Market"].to_numpy()[rows],
+        "NR Site": joined["Site"].to_numpy()[rows],
+        "NR Cell": joined["cell"].to_numpy()[rows],
+        "DSS_LTECELL": joined["DSS_LTECELL"].to_numpy()[rows],
+        "LTE Site": joined["Site LTE"].to_numpy()[rows],
+        "NR USID": joined["USID"].to_numpy()[rows],
+        "LTE USID": joined["USID LTE"].to_numpy()[rows],
+        "NR Admin State": joined["ADMINISTRATIVESTATE"].to_numpy()[rows],
+        "LTE Admin State": joined["ADMINISTRATIVESTATE LTE"].to_numpy()[rows],
+        "NR Op State": joined["OPERATIONALSTATE"].to_numpy()[rows],
+        "LTE Op State": joined["OPERATIONALSTATE LTE"].to_numpy()[rows],
+        "Issue": pd.Series(bits[rows]).map(labels).to_numpy()
+    }, columns=DSS_COLUMNS)
+    issues = issues.sort_values(["Market", "NR Site", "NR Cell"], kind="stable").reset_index(drop=True)
+
+    summary = pd.DataFrame({
+        "Market": joined["ED_Market"].to_numpy(),
+        "References": 1,
+        "Dangling": dangling,
+        "Site Mismatch": site_mismatch,
+        "State Conflict": state_conflict
+    }).groupby("Market", sort=True).sum().reset_index()
+    return issues, summary[DSS_SUMMARY_COLUMNS]
+
+
+def describe_dss(summary):
+    """One-line totals of a validate_dss summary for status bars and logs"""
+    if summary.empty:
+        return "No DSS_LTECELL references"
+    totals = summary[["References"] + DSS_ISSUES].sum()
+    return (f"DSS references: {totals['References']}, dangling {totals['Dangling']}, "
+            f"site mismatch {totals['Site Mismatch']}, state conflict {totals['State Conflict']}")
@@ -0,0 +1,112 @@
+import numpy as np
+import pandas as pd
+
+DUMP_DIFF_COLUMNS = ["Tech", "Market", "Site", "Cell", "Change", "Parameter", "Old Value", "New Value"]
+DUMP_DIFF_SUMMARY_COLUMNS = ["Tech", "Old Cells", "New Cells", "Added", "Removed", "Modified", "Unchanged",
+                             "Changed Values"]
+
+
+def diff_columns(old_df, new_df, ignore=()):
+    """Raw columns compared between two dumps: the old dump's order, then columns new in the new one"""
+    ignored = {str(col).strip().lower() for col in ignore}
+    columns = list(old_df.columns) + [col for col in new_df.columns if col not in set(old_df.columns)]
+    return [col for col in columns if str(col).strip().lower() not in ignored]
+
+
+def keyed_content(dataset, tech, columns):
+    """(content keyed by cell name, market, site) for one load; the first row of a cell wins"""
+    df = dataset.frame(tech)
+    if df.empty:
+        empty = np.array([], dtype=object)
+        return pd.DataFrame(columns=columns, index=pd.Index([], dtype=object)), empty, empty
+    cells = dataset.field(tech, "cell").to_numpy(dtype=object)
+    rows = np.flatnonzero(cells != "")
+    rows = rows[~pd.Index(cells[rows]).duplicated()]
+    content = df.iloc[rows].reindex(columns=columns)
+    content.index = pd.Index(cells[rows], dtype=object)
+    market = dataset.field(tech, "ED_Market").to_numpy(dtype=object)[rows]
+    site = dataset.field(tech, "Site").to_numpy(dtype=object)[rows]
+    return content, market, site
+
+
+def display_values(content):
+    """Object array of a content frame with missing values as empty strings"""
+    values = content.to_numpy(dtype=object)
+    values[pd.isna(values)] = ""
+    return values.astype(str).astype(object)
+
+
+def row_hashes(content):
+    """One uint64 content hash per row"""
+    if content.empty:
+        return np.array([], dtype=np.uint64)
+    return pd.util.hash_pandas_object(content, index=False).to_numpy()
+
+
+def diff_tech(old, new, tech, ignore=()):
+    """(change rows, summary row) between two loads of one technology"""
+    columns = diff_columns(old.frame(tech), new.frame(tech), ignore)
+    old_content, old_market, old_site = keyed_content(old, tech, columns)
+    new_content, new_market, new_site = keyed_content(new, tech, columns)
+
+    # Position of each new cell in the old load and vice versa (-1 when absent)
+    in_old = old_content.index.get_indexer(new_content.index)
+    in_new = new_content.index.get_indexer(old_content.index)
+    added = np.flatnonzero(in_old < 0)
+    removed = np.flatnonzero(in_new < 0)
+    common = np.flatnonzero(in_old >= 0)
+    # Hashes rule out unchanged cells; only the rest are compared value by value
+    changed = common[row_hashes(new_content)[common] != row_hashes(old_content)[in_old[common]]]
+    # Missing and empty values hash differently but are the same value
+    old_values = display_values(old_content.iloc[in_old[changed]])
+    new_values = display_values(new_content.iloc[changed])
+    row, col = np.nonzero(old_values != new_values)
+    modified = changed[row]
+
+    cells = new_content.index.to_numpy(dtype=object)
+    parts = [
+        pd.DataFrame({"Market": new_market[added], "Site": new_site[added], "Cell": cells[added],
+                      "Change": "Added", "Parameter": "", "Old Value": "", "New Value": ""}),
+        pd.DataFrame({"Market": old_market[removed], "Site": old_site[removed],
+                      "Cell": old_content.index.to_numpy(dtype=object)[removed],
+                      "Change": "Removed", "Parameter": "", "Old Value": "", "New Value": ""}),
+        pd.DataFrame({"Market": new_market[modified], "Site": new_site[modified], "Cell": cells[modified],
+                      "Change": "Modified", "Parameter": np.asarray(columns, dtype=object)[col],
+                      "Old Value": old_values[row, col], "New Value": new_values[row, col]})
+    ]
+    changes = pd.concat(parts, ignore_index=True)
+    changes.insert(0, "Tech", tech)
+    summary = {
+        "Tech": tech,
+        "Old Cells": len(old_content),
+        "New Cells": len(new_content),
+        "Added": len(added),
+        "Removed": len(removed),
+        "Modified": len(np.unique(modified)),
+        "Unchanged": len(common) - len(np.unique(modified)),
+        "Changed Values": len(modified)
+    }
+    return changes[DUMP_DIFF_COLUMNS], summary
+
+
+def diff_dumps(old, new, techs=("LTE", "5GNR"), ignore=()):
+    """Added, removed and modified cells between two NetworkDataset loads
+
+    Cells are keyed by cell name. A content hash per row rules out the
+    unchanged cells, and only cells whose hash differs are compared
+    parameter by parameter. Columns named in ignore (timestamps and the
+    like) are left out of both. Returns (one row per added or removed cell
+    and per changed parameter of a modified cell, per-technology summary).
+    """
+    changes, summaries = [], []
+    for tech in techs:
+        if old.frame(tech).empty and new.frame(tech).empty:
+            continue
+        tech_changes, summary = diff_tech(old, new, tech, ignore)
+        changes.append(tech_changes)
+        summaries.append(summary)
+    if not changes:
+        return pd.DataFrame(columns=DUMP_DIFF_COLUMNS), pd.DataFrame(columns=DUMP_DIFF_SUMMARY_COLUMNS)
+    changes = pd.concat(changes, ignore_index=True)
+    changes = changes.sort_values(["Tech", "Market", "Site", "Cell", "Change"], kind="stable").reset_index(drop=True)
+    return changes, pd.DataFrame(summaries, columns=DUMP_DIFF_SUMMARY_COLUMNS)
@@ -0,0 +1,178 @@
+import csv
+import gzip
+import io
+import time
+import tracemalloc
+
+import openpyxl
+import pandas as pd
+
+# Excel's hard limit, header row included
+EXCEL_MAX_ROWS = 1048576
+
+EXPORT_FORMATS = ["xlsx", "csv", "csv.gz"]
+EXPORT_MIME_TYPES = {
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "csv": "text/csv",
+    "csv.gz": "application/gzip"
+}
+
+EXPORT_FILETYPES = [
+    ("Excel files", "*.xlsx"),
+    ("CSV files", "*.csv"),
+    ("Gzip CSV files", "*.csv.gz"),
+    ("All files", "*.*")
+]
+
+
+def export_format(destination):
+    """'xlsx', 'csv' or 'csv.gz' from a file name (defaults to xlsx)"""
+    name = str(destination).lower()
+    if name.endswith(".csv.gz") or name.endswith(".gz"):
+        return "csv.gz"
+    if name.endswith(".csv"):
+        return "csv"
+    return "xlsx"
+
+
+class ExportStats:
+    """Row count, throughput and peak memory of one export
+
+    peak_rows is how many leading rows the peak was measured over; None
+    means the whole export.
+    """
+
+    def __init__(self, rows, seconds, peak_bytes, sheets=1, peak_rows=None):
+        self.rows = rows
+        self.seconds = seconds
+        self.peak_bytes = peak_bytes
+        self.sheets = sheets
+        self.peak_rows = peak_rows
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.seconds if self.seconds > 0 else float(self.rows)
+
+    def summary(self):
+        peak = f", peak {self.peak_bytes / (1024 * 1024):.1f} MB" if self.peak_bytes is not None else ""
+        if peak and self.peak_rows is not None and self.peak_rows < self.rows:
+            peak += f" over first {self.peak_rows} rows"
+        sheets = f" across {self.sheets} sheets" if self.sheets > 1 else ""
+        return f"{self.rows} rows{sheets} in {self.seconds:.2f}s ({self.rows_per_second:,.0f} rows/s{peak})"
+
+
+def write_xlsx_sheets(sheets, destination, max_rows=EXCEL_MAX_ROWS):
+    """Stream (sheet name, columns, rows) triples into one write-only workbook
+
+    A sheet that reaches max_rows continues on '<name>_2', '<name>_3', ...
+    Returns (total rows, sheets written).
+    """
+    wb = openpyxl.Workbook(write_only=True)
+    count = 0
+    written = 0
+    for sheet_name, columns, rows in sheets:
+        part = 1
+        ws = wb.create_sheet(sheet_name)
+        ws.append(list(columns))
+        written += 1
+        used = 1
+        for row in rows:
+            if used >= max_rows:
+                part += 1
+                ws = wb.create_sheet(f"{sheet_name}_{part}")
+                ws.append(list(columns))
+                written += 1
+                used = 1
+            ws.append(list(row))
+            used += 1
+            count += 1
+    wb.save(destination)
+    return count, written
+
+
+def write_xlsx(rows, columns, destination, sheet_name="Sheet1", max_rows=EXCEL_MAX_ROWS):
+    """Stream rows into a write-only workbook, rolling over to a new sheet at max_rows"""
+    return write_xlsx_sheets([(sheet_name, columns, rows)], destination, max_rows)
+
+
+def write_csv(rows, columns, destination, compress=False):
+    """Stream rows as (optionally gzip-compressed) UTF-8 CSV"""
+    if isinstance(destination, (str, bytes)) or hasattr(destination, "__fspath__"):
+        raw = open(destination, "wb")
+        close_raw = True
+    else:
+        raw = destination
+        close_raw = False
+    try:
+        binary = gzip.GzipFile(fileobj=raw, mode="wb") if compress else raw
+        text = io.TextIOWrapper(binary, encoding="utf-8", newline="")
+        writer = csv.writer(text)
+        writer.writerow(columns)
+        count = 0
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+        text.flush()
+        # Detach so closing the wrapper never closes a caller's stream
+        text.detach()
+        if compress:
+            binary.close()
+    finally:
+        if close_raw:
+            raw.close()
+    return count, 1
+
+
+def export_rows(rows, columns, destination, fmt=None, sheet_name="Sheet1", measure_memory=True,
+                memory_sample_rows=2000):
+    """Write an iterable of rows to a path or binary stream without materializing it
+
+    Returns ExportStats. Peak memory is measured with tracemalloc over the
+    first memory_sample_rows rows only: the writers keep no per-row state, so
+    the peak is reached early, and tracing the whole export would slow it
+    several times over. The stats record the sample size, and summary()
+    labels the peak with it.
+    """
+    fmt = fmt or export_format(destination)
+    peak = {}
+    tracing = measure_memory and not tracemalloc.is_tracing()
+
+    def stop_tracing():
+        if tracemalloc.is_tracing() and "bytes" not in peak:
+            peak["bytes"] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+    def sampled(rows):
+        for i, row in enumerate(rows):
+            if i == memory_sample_rows:
+                stop_tracing()
+            yield row
+
+    if tracing:
+        tracemalloc.start()
+        rows = sampled(rows)
+    start = time.perf_counter()
+    try:
+        if fmt == "xlsx":
+            count, sheets = write_xlsx(rows, columns, destination, sheet_name)
+        elif fmt in ("csv", "csv.gz"):
+            count, sheets = write_csv(rows, columns, destination, compress=(fmt == "csv.gz"))
+        else:
+            raise ValueError(f"Unsupported export format: {fmt}")
+        seconds = time.perf_counter() - start
+    finally:
+        if tracing:
+            stop_tracing()
+    return ExportStats(count, seconds, peak.get("bytes"), sheets, min(count, memory_sample_rows) if tracing else None)
+
+
+def dataframe_rows(df):
+    """Rows of a DataFrame as tuples with empty strings for missing values"""
+    for row in df.itertuples(index=False, name=None):
+        yield tuple("" if pd.isna(value) else value for value in row)
+
+
+def export_dataframe(df, destination, fmt=None, sheet_name="Sheet1", measure_memory=True):
+    """export_rows for a DataFrame"""
+    return export_rows(dataframe_rows(df), [str(c) for c in df.columns], destination,
+                       fmt, sheet_name, measure_memory)
@@ -0,0 +1,185 @@
+import json
+
+import numpy as np
+
+from network_data import haversine_km
+
+MARKER_CLUSTERER_URL = "https://unpkg.com/@googlemaps/markerclusterer/dist/index.min.js"
+# Beyond these counts the side panel and leg labels are summarised instead of listed
+MAP_PANEL_LIMIT = 200
+MAP_LEG_LABEL_LIMIT = 500
+# Markers are only clustered once there are more than this many
+MAP_CLUSTER_MIN = 50
+
+
+def point_labels(count, style="number"):
+    """Marker labels: 1, 2, 3 ... or A, B, C ... (numbers once letters run out)"""
+    if style == "letter" and count <= 26:
+        return [chr(65 + i) for i in range(count)]
+    return [str(i + 1) for i in range(count)]
+
+
+def map_payload(points, master_point=None, label_style="number"):
+    """Everything the map page draws, with every distance computed here rather than in the browser
+
+    Points are [name, lat, lon, label] rows; legs are [mid lat, mid lon, km]
+    between consecutive points; master rows are [name, km] from the master.
+    """
+    names = [str(p[0]) for p in points]
+    lat = np.array([p[1] for p in points], dtype=float)
+    lon = np.array([p[2] for p in points], dtype=float)
+    payload = {
+        "points": [[name, round(float(a), 6), round(float(b), 6), label]
+                   for name, a, b, label in zip(names, lat, lon, point_labels(len(points), label_style))],
+        "legs": [],
+        "total_km": 0.0,
+        "master": None
+    }
+    if len(points) > 1:
+        legs = haversine_km(lat[:-1], lon[:-1], lat[1:], lon[1:])
+        mid_lat = (lat[:-1] + lat[1:]) / 2
+        mid_lon = (lon[:-1] + lon[1:]) / 2
+        payload["legs"] = [[round(float(a), 6), round(float(b), 6), round(float(km), 2)]
+                           for a, b, km in zip(mid_lat, mid_lon, legs)]
+        payload["total_km"] = round(float(legs.sum()), 3)
+    if master_point:
+        master_name, master_lat, master_lon = master_point
+        others = [i for i, p in enumerate(points) if tuple(p) != tuple(master_point)]
+        km = haversine_km(master_lat, master_lon, lat[others], lon[others])
+        payload["master"] = {
+            "name": str(master_name),
+            "lat": float(master_lat),
+            "lon": float(master_lon),
+            "distances": [[names[i], round(float(d), 3)] for i, d in zip(others, km)]
+        }
+    return payload
+
+
+def build_map_html(points, api_key, master_point=None, zoom=12, map_type="terrain", label_style="number",
+                   sectors=None):
+    """Google Maps page drawing the points from one embedded JSON payload
+
+    A single loop creates the markers (clustered when there are many), one
+    polyline joins them, and leg labels and the side panel use the
+    distances computed in map_payload. sectors is an optional GeoJSON
+    FeatureCollection of sector footprints drawn on the map's data layer.
+    """
+    payload = map_payload(points, master_point, label_style)
+    payload["sectors"] = sectors
+    center = payload["points"][0][1:3] if payload["points"] else [0, 0]
+    # "</" would end the script element early if it appeared in a site name
+    data = json.dumps(payload, separators=(",", ":")).replace("</", "<\\/")
+    return f"""<!DOCTYPE html>
+<html>
+<head>
+    <title>Network Points Map</title>
+    <style>
+        body {{ margin: 0; padding: 0; }}
+        #map {{ height: 100vh; width: 100%; }}
+        #info-panel {{ position: absolute; top: 10px; left: 10px; background: white; padding: 10px; z-index: 1000;
+                       max-height: 60vh; overflow-y: auto; font-family: sans-serif; font-size: 13px; }}
+    </style>
+</head>
+<body>
+    <div id="info-panel"></div>
+    <div id="map"></div>
+    <script>
+        const DATA = {data};
+        const PANEL_LIMIT = {MAP_PANEL_LIMIT};
+        const LEG_LABEL_LIMIT = {MAP_LEG_LABEL_LIMIT};
+        const CLUSTER_MIN = {MAP_CLUSTER_MIN};
+
+        function escapeHtml(text) {{
+            return String(text).replace(/[&<>"']/g, c => ({{"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&#39;"}})[c]);
+        }}
+
+        function listHtml(rows, render) {{
+            let html = "<ul>" + rows.slice(0, PANEL_LIMIT).map(render).join("") + "</ul>";
+            if (rows.length > PANEL_LIMIT) {{
+                html += "<p>... and " + (rows.length - PANEL_LIMIT) + " more</p>";
+            }}
+            return html;
+        }}
+
+        function initMap() {{
+            const map = new google.maps.Map(document.getElementById("map"), {{
+                zoom: {int(zoom)},
+                center: {{ lat: {center[0]}, lng: {center[1]} }},
+                mapTypeId: {json.dumps(str(map_type))}
+            }});
+            const infoWindow = new google.maps.InfoWindow();
+            const bounds = new google.maps.LatLngBounds();
+
+            const markers = DATA.points.map(([name, lat, lng, label]) => {{
+                const marker = new google.maps.Marker({{ position: {{ lat, lng }}, title: name, label }});
+                marker.addListener("click", () => {{
+                    infoWindow.setContent("<div><strong>" + escapeHtml(name) + "</strong><br>Lat: " +
+                                          lat.toFixed(6) + "<br>Lon: " + lng.toFixed(6) + "</div>");
+                    infoWindow.open(map, marker);
+                }});
+                bounds.extend(marker.getPosition());
+                return marker;
+            }});
+            if (markers.length > CLUSTER_MIN) {{
+                // Market-sized sets: cluster and show them all rather than keep the chosen zoom
+                if (window.markerClusterer) {{
+                    new markerClusterer.MarkerClusterer({{ map, markers }});
+                }} else {{
+                    markers.forEach(marker => marker.setMap(map));
+                }}
+                map.fitBounds(bounds);
+            }} else {{
+                markers.forEach(marker => marker.setMap(map));
+            }}
+
+            if (DATA.points.length > 1) {{
+                new google.maps.Polyline({{
+                    path: DATA.points.map(([, lat, lng]) => ({{ lat, lng }})),
+                    geodesic: true,
+                    strokeColor: "#FF0000",
+                    strokeOpacity: 1.0,
+                    strokeWeight: 2,
+                    map
+                }});
+            }}
+            if (DATA.legs.length <= LEG_LABEL_LIMIT) {{
+                DATA.legs.forEach(([lat, lng, km]) => new google.maps.Marker({{
+                    position: {{ lat, lng }},
+                    map,
+                    icon: {{ path: google.maps.SymbolPath.CIRCLE, scale: 0 }},
+                    label: {{ text: km.toFixed(2) + " km", color: "#0000FF", fontSize: "12px", fontWeight: "bold" }}
+                }}));
+            }}
+
+            if (DATA.sectors) {{
+                map.data.addGeoJson(DATA.sectors);
+                map.data.setStyle(feature => {{
+                    const color = feature.getProperty("Tech") === "5GNR" ? "#7834C8" : "#E6781E";
+                    return {{ fillColor: color, fillOpacity: 0.3, strokeColor: color, strokeWeight: 1 }};
+                }});
+            }}
+
+            let infoContent = "<h3>Points and Distances</h3>";
+            infoContent += "<p>" + DATA.points.length + " points, path " + DATA.total_km.toFixed(3) + " km</p>";
+            infoContent += listHtml(DATA.points, ([name, lat, lng]) =>
+                "<li><strong>" + escapeHtml(name) + "</strong> (Lat: " + lat.toFixed(6) + ", Lon: " + lng.toFixed(6) + ")</li>");
+            if (DATA.master) {{
+                new google.maps.Marker({{
+                    position: {{ lat: DATA.master.lat, lng: DATA.master.lon }},
+                    map,
+                    title: "Master: " + DATA.master.name,
+                    label: "M",
+                    icon: {{ url: "http://maps.google.com/mapfiles/ms/icons/blue-dot.png" }}
+                }});
+                infoContent += "<h4>Distances from Master Point:</h4>";
+                infoContent += listHtml(DATA.master.distances, ([name, km]) =>
+                    "<li>" + escapeHtml(DATA.master.name) + " to " + escapeHtml(name) + ": " + km.toFixed(3) + " km</li>");
+            }}
+            document.getElementById("info-panel").innerHTML = infoContent;
+        }}
+    </script>
+    <script src="{MARKER_CLUSTERER_URL}"></script>
+    <script async defer src="https://maps.googleapis.com/maps/api/js?key={api_key}&loading=async&callback=initMap"></script>
+</body>
+</html>
+"""
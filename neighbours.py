@@ -0,0 +1,123 @@
+import numpy as np
+import pandas as pd
+
+from network_data import MAPPINGS, logical_frame, bearing_deg, angle_diff_deg, valid_coordinates
+from spatial_index import SpatialIndex
+
+# Candidate search and pruning defaults
+NEIGHBOUR_MAX_KM = 15.0
+NEIGHBOUR_CANDIDATES = 16
+MAX_NEIGHBOURS = 8
+PRUNE_DEG = 30.0
+BEAMWIDTH_DEG = 65.0
+# Distance discount for each end of a pair whose sector points at the other site
+FACING_WEIGHT = 0.25
+
+
+def site_table(sites, lat, lon):
+    """Unique sites (sorted) with the mean position of their cells"""
+    cells = pd.DataFrame({"Site": np.asarray(sites, dtype=object), "lat": lat, "lon": lon})
+    cells = cells[(cells["Site"] != "") & cells["lat"].notna() & cells["lon"].notna()]
+    return cells.groupby("Site", sort=True)[["lat", "lon"]].mean()
+
+
+def facing(site_numbers, bearings, cell_sites, azimuths, half_width):
+    """True where any sector of the site points within half_width of the bearing"""
+    pairs = pd.DataFrame({"pair": np.arange(len(site_numbers)), "site": site_numbers, "bearing": bearings})
+    sectors = pd.DataFrame({"site": cell_sites, "azimuth": azimuths})
+    joined = pairs.merge(sectors, on="site")
+    hit = joined["pair"].to_numpy()[angle_diff_deg(joined["bearing"], joined["azimuth"]) <= half_width]
+    result = np.zeros(len(site_numbers), dtype=bool)
+    result[hit] = True
+    return result
+
+
+def first_tier_neighbours(sites, lat, lon, azimuth=None, max_km=NEIGHBOUR_MAX_KM,
+                          candidates=NEIGHBOUR_CANDIDATES, max_neighbours=MAX_NEIGHBOURS,
+                          prune_deg=PRUNE_DEG, beamwidth=BEAMWIDTH_DEG):
+    """Map each site to its first-tier neighbour sites, best first
+
+    Inputs are per cell. Each site takes its nearest candidate sites within
+    max_km from a spatial index, and they are ranked by distance. The
+    distance is discounted when a sector of either site faces the other. A
+    candidate is then dropped if a better-ranked neighbour already lies
+    within prune_deg of its bearing. That keeps the ring around the site
+    (roughly its Delaunay neighbours) rather than a second site hiding
+    behind the first.
+    """
+    lat, lon = valid_coordinates(lat, lon)
+    table = site_table(sites, lat, lon)
+    if table.empty:
+        return {}
+    names = table.index.to_numpy()
+    site_lat = table["lat"].to_numpy()
+    site_lon = table["lon"].to_numpy()
+    index = SpatialIndex(site_lat, site_lon, max_km)
+
+    src, dst, dist = [], [], []
+    for i in range(len(names)):
+        found, distances = index.query_radius(site_lat[i], site_lon[i], max_km)
+        keep = found != i
+        found, distances = found[keep][:candidates], distances[keep][:candidates]
+        src.append(np.full(len(found), i))
+        dst.append(found)
+        dist.append(distances)
+    src = np.concatenate(src)
+    dst = np.concatenate(dst)
+    dist = np.concatenate(dist)
+    if len(src) == 0:
+        return {name: [] for name in names}
+
+    bearings = bearing_deg(site_lat[src], site_lon[src], site_lat[dst], site_lon[dst])
+    score = dist.copy()
+    if azimuth is not None:
+        cell_sites = pd.Index(names).get_indexer(np.asarray(sites, dtype=object))
+        azimuth = pd.to_numeric(pd.Series(azimuth), errors="coerce").to_numpy(dtype=float)
+        has_sector = (cell_sites >= 0) & np.isfinite(azimuth)
+        cell_sites, azimuth = cell_sites[has_sector], azimuth[has_sector] % 360
+        faces_out = facing(src, bearings, cell_sites, azimuth, beamwidth / 2)
+        faces_back = facing(dst, (bearings + 180) % 360, cell_sites, azimuth, beamwidth / 2)
+        score = dist / (1 + FACING_WEIGHT * (faces_out.astype(float) + faces_back.astype(float)))
+
+    order = np.lexsort((score, src))
+    src, dst, bearings = src[order], dst[order], bearings[order]
+    bounds = np.flatnonzero(np.diff(src)) + 1
+    neighbours = {name: [] for name in names}
+    for start, end in zip(np.concatenate(([0], bounds)), np.concatenate((bounds, [len(src)]))):
+        accepted = []
+        accepted_bearings = []
+        for k in range(start, end):
+            if accepted_bearings and angle_diff_deg(bearings[k], accepted_bearings).min() < prune_deg:
+                continue
+            accepted.append(names[dst[k]])
+            accepted_bearings.append(bearings[k])
+            if len(accepted) == max_neighbours:
+                break
+        neighbours[names[src[start]]] = accepted
+    return neighbours
+
+
+def dataset_neighbours(dataset, tech, **options):
+    """First-tier neighbours of every site of one technology in a NetworkDataset"""
+    if dataset.frame(tech).empty:
+        return {}
+    lat, lon = dataset.coordinates(tech)
+    return first_tier_neighbours(dataset.field(tech, "Site"), lat, lon, dataset.field(tech, "Azumuth"), **options)
+
+
+def cached_neighbours(dataset):
+    """{tech: first-tier neighbours} of a NetworkDataset, built once per load"""
+    return dataset.cached("neighbours", lambda: {tech: dataset_neighbours(dataset, tech) for tech in ("LTE", "5GNR")})
+
+
+def network_neighbours(frames, mappings=MAPPINGS, **options):
+    """{tech: first-tier neighbours} for raw LTE / 5GNR dump frames"""
+    return {tech: frame_neighbours(frames.get(tech), tech, mappings, **options) for tech in ("LTE", "5GNR")}
+
+
+def frame_neighbours(df, tech, mappings=MAPPINGS, **options):
+    """First-tier neighbours of every site in a raw dump frame"""
+    if df is None or df.empty:
+        return {}
+    fields = logical_frame(df, tech, ["Site", "LATITUDE", "LONGITUDE", "Azumuth"], mappings=mappings)
+    return first_tier_neighbours(fields["Site"], fields["LATITUDE"], fields["LONGITUDE"], fields["Azumuth"], **options)
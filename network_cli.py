@@ -0,0 +1,478 @@
+import os
+import sys
+import time
+import logging
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+import pandas as pd
+
+from network_data import (
+    NetworkDataset, MARKET_MAPPING, MAPPINGS, GNB_ID_BITS, MAIN_COLUMNS, SEARCH_TYPES, CR_PARAMETERS, CR_SHEET_NAMES,
+    logical_series, merge_duplicate_cells, parameter_rows, main_rows, build_cr_rows, site_carriers,
+    build_vdt_workbook
+)
+from pci_audit import find_pci_conflicts
+from query_planner import QueryPlanner
+from export_engine import export_dataframe, write_xlsx_sheets
+from cr_rules import load_rules, build_rule_crs, write_cr_workbooks
+from cr_diff import read_plan, build_plan_crs, write_diff_workbook
+from vdt_batch import generate_vdt_batch
+from neighbours import cached_neighbours
+from sector_geometry import SECTOR_BEAMWIDTH_DEG, dataset_geometry, write_sector_geometry
+from range_audit import FACING_HALF_ANGLE_DEG, RANGE_SEARCH_MAX_KM, audit_cell_ranges
+from consistency_audit import audit_consistency
+from colocation import COLOCATION_KM, colocation_pairs
+from dss_audit import validate_dss, describe_dss
+from dump_diff import diff_dumps
+
+
+def write_table(df, file_path):
+    """Stream a result table to .xlsx, .csv or .csv.gz depending on the extension"""
+    directory = os.path.dirname(file_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    stats = export_dataframe(df, file_path)
+    logging.info(f"Wrote {file_path}: {stats.summary()}")
+
+
+def write_with_summary(file_path, results, summary):
+    """Write (sheet name, frame) results and summary as two sheets, or as two CSV files"""
+    if file_path.lower().endswith(".xlsx"):
+        directory = os.path.dirname(file_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        count, _ = write_xlsx_sheets([
+            (name, list(df.columns), df.itertuples(index=False, name=None)) for name, df in (results, summary)
+        ], file_path)
+        logging.info(f"Wrote {file_path}: {count} rows")
+    else:
+        # CSV output: the summary goes next to the results
+        stem, ext = os.path.splitext(file_path)
+        if ext.lower() == ".gz":
+            stem, inner = os.path.splitext(stem)
+            ext = inner + ext
+        write_table(results[1], file_path)
+        write_table(summary[1], f"{stem}_summary{ext}")
+
+
+def load_dataset(file_paths, gnb_id_bits=GNB_ID_BITS):
+    """Load dumps into a NetworkDataset, logging progress"""
+    dataset = NetworkDataset(gnb_id_bits=gnb_id_bits)
+    dataset.load(file_paths, progress=logging.info)
+    logging.info(f"Loaded {len(dataset.lte_data)} LTE, {len(dataset.nr_data)} 5GNR, "
+                 f"and {len(dataset.bbu_data)} BBU records")
+    return dataset
+
+
+def read_searches(file_path, default_type="USID"):
+    """Read batch searches: one 'type,value' or bare value per line, '#' starts a comment"""
+    searches = []
+    with open(file_path, encoding="utf-8") as f:
+        for line in f:
+            line = line.split("#", 1)[0].strip()
+            if not line:
+                continue
+            if "," in line:
+                search_type, value = (part.strip() for part in line.split(",", 1))
+                if search_type not in SEARCH_TYPES:
+                    logging.warning(f"Unknown search type '{search_type}', using {default_type}")
+                    search_type = default_type
+            else:
+                search_type, value = default_type, line
+            searches.append((search_type, value))
+    return searches
+
+
+def run_batch_searches(dataset, searches):
+    """Run searches against the dataset; returns (summary rows, {tech: matched raw rows})"""
+    summary = []
+    matched = {"LTE": [], "5GNR": []}
+    for search_type, value in searches:
+        results = dataset.search_frames(search_type, value, merge=False)
+        for tech in ("LTE", "5GNR"):
+            if tech in results:
+                matched[tech].append(results[tech])
+        summary.append({
+            "Search Type": search_type,
+            "Search Value": value,
+            "LTE Matches": len(results.get("LTE", [])),
+            "5GNR Matches": len(results.get("5GNR", []))
+        })
+    frames = {}
+    for tech, dfs in matched.items():
+        frames[tech] = pd.concat(dfs).drop_duplicates() if dfs else dataset.frame(tech).iloc[0:0]
+    return pd.DataFrame(summary), frames
+
+
+def write_market_outputs(project_name, out_dir, lte_df, nr_df, bbu_df, lte_cr_type, nr_cr_type, neighbours=None):
+    """Write parameter exports, CR workbooks and the VDT report for one market"""
+    start = time.perf_counter()
+    market_dir = os.path.join(out_dir, project_name)
+    os.makedirs(market_dir, exist_ok=True)
+
+    lte_df = merge_duplicate_cells(lte_df, "LTE")
+    nr_df = merge_duplicate_cells(nr_df, "5GNR")
+
+    # Every workbook is streamed through the export engine's write-only writer
+    export_dataframe(parameter_rows(lte_df, "LTE"), os.path.join(market_dir, "LTE_Parameters.xlsx"),
+                     measure_memory=False)
+    export_dataframe(parameter_rows(nr_df, "5GNR", bbu_df=bbu_df), os.path.join(market_dir, "5G_Parameters.xlsx"),
+                     measure_memory=False)
+
+    lte_cr = build_cr_rows(lte_df, "LTE", lte_cr_type)
+    export_dataframe(lte_cr, os.path.join(market_dir, f"LTE_CR_{lte_cr_type}.xlsx"),
+                     sheet_name=CR_SHEET_NAMES["LTE"], measure_memory=False)
+    nr_cr = build_cr_rows(nr_df, "5GNR", nr_cr_type, bbu_df)
+    export_dataframe(nr_cr, os.path.join(market_dir, f"5G_CR_{nr_cr_type}.xlsx"),
+                     sheet_name=CR_SHEET_NAMES["5GNR"], measure_memory=False)
+
+    lte_sites = site_carriers(lte_df, "LTE")
+    nr_sites = site_carriers(nr_df, "5GNR")
+    wb = build_vdt_workbook(project_name, lte_sites.items(), nr_sites.items(), neighbours=neighbours)
+    wb.save(os.path.join(market_dir, "VDT_Report.xlsx"))
+
+    return {
+        "project": project_name,
+        "lte_cells": len(lte_df),
+        "nr_cells": len(nr_df),
+        "lte_sites": len(lte_sites),
+        "nr_sites": len(nr_sites),
+        "seconds": time.perf_counter() - start
+    }
+
+
+def market_jobs(dataset, markets, market_mapping=MARKET_MAPPING):
+    """Per-market job arguments: (project name, LTE rows, 5GNR rows, BBU rows)"""
+    jobs = []
+    for market in markets:
+        project_name = market_mapping.get(market)
+        if not project_name:
+            logging.warning(f"No project mapping for market '{market}'; skipped")
+            continue
+        frames = dataset.market_frames(market)
+        bbu_df = dataset.bbu_data
+        if not bbu_df.empty and not frames["5GNR"].empty:
+            # Ship only the BBU rows this market can join against
+            usids = set(dataset.field("5GNR", "USID")[frames["5GNR"].index])
+            bbu_usids = logical_series(bbu_df, MAPPINGS["5GNR_BBU"]["USID"])
+            bbu_df = bbu_df[bbu_usids.isin(usids).values]
+        jobs.append((project_name, frames["LTE"], frames["5GNR"], bbu_df))
+    return jobs
+
+
+def cmd_report(args):
+    """Load dumps, optionally run batch searches, and write per-market outputs"""
+    start = time.perf_counter()
+    dataset = load_dataset(args.files, args.gnb_id_bits)
+    os.makedirs(args.out, exist_ok=True)
+    # Neighbours are found over the whole loaded network, before any search filtering
+    neighbours = cached_neighbours(dataset)
+
+    if args.searches:
+        searches = read_searches(args.searches, args.search_type)
+        summary, frames = run_batch_searches(dataset, searches)
+        write_table(summary, os.path.join(args.out, "Batch_Search_Results.xlsx"))
+        logging.info(f"Ran {len(searches)} searches: {len(frames['LTE'])} LTE and "
+                     f"{len(frames['5GNR'])} 5GNR rows matched")
+        # Reports only cover what the searches matched
+        bbu_data = dataset.bbu_data
+        dataset = NetworkDataset(gnb_id_bits=args.gnb_id_bits)
+        dataset.set_frames(frames["LTE"], frames["5GNR"], bbu_data)
+
+    markets = args.markets or [m for m in dataset.markets() if m in MARKET_MAPPING]
+    jobs = market_jobs(dataset, markets)
+    if not jobs:
+        logging.error("No markets with a project mapping found in the loaded data")
+        return 1
+
+    results = []
+    if args.workers == 1 or len(jobs) == 1:
+        for project_name, lte_df, nr_df, bbu_df in jobs:
+            results.append(write_market_outputs(project_name, args.out, lte_df, nr_df, bbu_df,
+                                                args.lte_cr, args.nr_cr, neighbours))
+    else:
+        with ProcessPoolExecutor(max_workers=args.workers) as executor:
+            futures = {
+                executor.submit(write_market_outputs, project_name, args.out, lte_df, nr_df, bbu_df,
+                                args.lte_cr, args.nr_cr, neighbours): project_name
+                for project_name, lte_df, nr_df, bbu_df in jobs
+            }
+            for future in as_completed(futures):
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    logging.error(f"Failed to write outputs for {futures[future]}: {str(e)}")
+
+    for result in sorted(results, key=lambda r: r["project"]):
+        logging.info(f"{result['project']}: {result['lte_cells']} LTE cells / {result['lte_sites']} sites, "
+                     f"{result['nr_cells']} 5GNR cells / {result['nr_sites']} sites in {result['seconds']:.2f}s")
+    logging.info(f"Wrote {len(results)} market reports to {args.out} in {time.perf_counter() - start:.2f}s")
+    return 0 if len(results) == len(jobs) else 1
+
+
+def cmd_pci(args):
+    """Whole-network co-channel PCI conflict audit"""
+    dataset = load_dataset(args.files, args.gnb_id_bits)
+    start = time.perf_counter()
+    conflicts = find_pci_conflicts(dataset, args.km, args.tech or ("LTE", "5GNR"))
+    logging.info(f"Found {len(conflicts)} PCI conflicts within {args.km} km in {time.perf_counter() - start:.2f}s")
+    write_table(conflicts, args.out)
+    return 0
+
+
+def cmd_query(args):
+    """Run a boolean query over the dumps, optionally printing the plan"""
+    dataset = load_dataset(args.files, args.gnb_id_bits)
+    result = QueryPlanner(dataset).execute(args.query)
+    if args.explain:
+        print(result.explain())
+    rows = [main_rows(df, tech, gnb_id_bits=dataset.gnb_id_bits) for tech, df in result.frames.items()]
+    matches = pd.concat(rows, ignore_index=True).fillna("") if rows else pd.DataFrame(columns=MAIN_COLUMNS)
+    matches = matches[[col for col in MAIN_COLUMNS if col in matches.columns]]
+    logging.info(f"{len(matches)} records matched")
+    if args.out:
+        write_table(matches, args.out)
+    elif not matches.empty:
+        print(matches.to_string(index=False))
+    return 0
+
+
+def cmd_cr_rules(args):
+    """Evaluate a CR rules file over the whole network and write CR workbooks"""
+    rules = load_rules(args.rules)
+    dataset = load_dataset(args.files, args.gnb_id_bits)
+    start = time.perf_counter()
+    crs, summary = build_rule_crs(dataset, rules)
+    logging.info(f"{len(crs)} CRs from {len(rules)} rules in {time.perf_counter() - start:.2f}s")
+    print(summary.to_string(index=False))
+    if crs.empty:
+        return 0
+    start = time.perf_counter()
+    paths = write_cr_workbooks(crs, args.out, args.split, args.workers)
+    logging.info(f"Wrote {len(paths)} workbooks in {time.perf_counter() - start:.2f}s")
+    write_table(crs, os.path.join(args.out, "CR_Rules_All.csv"))
+    return 0
+
+
+def cmd_cr_diff(args):
+    """Compare a planned-values file with the dumps and write CRs for the differences"""
+    dataset = load_dataset(args.files, args.gnb_id_bits)
+    plan = read_plan(args.plan)
+    start = time.perf_counter()
+    crs, summary = build_plan_crs(dataset, plan)
+    logging.info(f"{len(crs)} changed parameters in {time.perf_counter() - start:.2f}s")
+    print(summary.to_string(index=False))
+    start = time.perf_counter()
+    write_diff_workbook(crs, summary, args.out)
+    logging.info(f"Wrote {args.out} in {time.perf_counter() - start:.2f}s")
+    if args.split_dir and not crs.empty:
+        write_cr_workbooks(crs, args.split_dir, args.split, args.workers)
+    return 0
+
+
+def cmd_vdt_batch(args):
+    """Write one VDT report per market into a zip"""
+    dataset = load_dataset(args.files, args.gnb_id_bits)
+    start = time.perf_counter()
+
+    def progress(done, total, result):
+        logging.info(f"[{done}/{total}] {result['project']} done")
+
+    results = generate_vdt_batch(dataset, args.out, args.workers, progress=progress)
+    logging.info(f"Wrote {len(results)} VDT reports to {args.out} in {time.perf_counter() - start:.2f}s")
+    return 0
+
+
+def cmd_sectors(args):
+    """Write sector footprint polygons for GIS"""
+    dataset = load_dataset(args.files, args.gnb_id_bits)
+    start = time.perf_counter()
+    table = dataset_geometry(dataset, args.tech or ("LTE", "5GNR"))
+    count = write_sector_geometry(table, args.out, args.beamwidth)
+    logging.info(f"Wrote {count} sectors to {args.out} in {time.perf_counter() - start:.2f}s")
+    return 0
+
+
+def cmd_range_audit(args):
+    """Compare CELLRANGE with the distance to the nearest facing site"""
+    dataset = load_dataset(args.files, args.gnb_id_bits)
+    start = time.perf_counter()
+    audit, summary = audit_cell_ranges(dataset, args.tech or ("LTE", "5GNR"), args.all, args.half_angle, args.max_km)
+    logging.info(f"Audited cell ranges in {time.perf_counter() - start:.2f}s")
+    print(summary.to_string())
+    write_table(audit, args.out)
+    if args.cr_dir:
+        crs = audit[audit["Status"].isin(["Oversized", "Undersized"])]
+        if not crs.empty:
+            write_cr_workbooks(crs, args.cr_dir, args.split, args.workers)
+    return 0
+
+
+def cmd_consistency(args):
+    """Compare OSS and Atoll values of every cell"""
+    dataset = load_dataset(args.files, args.gnb_id_bits)
+    start = time.perf_counter()
+    mismatches, summary = audit_consistency(dataset, args.tech or ("LTE", "5GNR"))
+    logging.info(f"Compared OSS and Atoll columns in {time.perf_counter() - start:.2f}s")
+    print(summary.to_string(index=False))
+    write_with_summary(args.out, ("Mismatches", mismatches), ("Summary", summary))
+    return 0
+
+
+def cmd_colocation(args):
+    """Co-located LTE/5GNR site pairs from DSS references, USIDs and coordinates"""
+    dataset = load_dataset(args.files, args.gnb_id_bits)
+    start = time.perf_counter()
+    pairs = colocation_pairs(dataset, args.km)
+    logging.info(f"Paired {pairs['LTE Site'].nunique()} LTE and {pairs['NR Site'].nunique()} NR sites "
+                 f"in {time.perf_counter() - start:.2f}s")
+    write_table(pairs, args.out)
+    return 0
+
+
+def cmd_dss_audit(args):
+    """Check 5GNR DSS_LTECELL references against the LTE cells"""
+    dataset = load_dataset(args.files, args.gnb_id_bits)
+    start = time.perf_counter()
+    issues, summary = validate_dss(dataset)
+    logging.info(f"{describe_dss(summary)} ({time.perf_counter() - start:.2f}s)")
+    print(summary.to_string(index=False))
+    write_with_summary(args.out, ("Issues", issues), ("Summary", summary))
+    return 0
+
+
+def cmd_dump_diff(args):
+    """Added, removed and modified cells between yesterday's and today's dumps"""
+    old = load_dataset(args.old, args.gnb_id_bits)
+    new = load_dataset(args.new, args.gnb_id_bits)
+    start = time.perf_counter()
+    changes, summary = diff_dumps(old, new, args.tech or ("LTE", "5GNR"), args.ignore or ())
+    logging.info(f"Compared dumps in {time.perf_counter() - start:.2f}s")
+    print(summary.to_string(index=False))
+    write_with_summary(args.out, ("Changes", changes), ("Summary", summary))
+    return 0
+
+
+def build_parser():
+    """Command-line parser for the headless network tools"""
+    parser = argparse.ArgumentParser(description="Headless network data search and report tool")
+    parser.add_argument("--gnb-id-bits", type=int, default=GNB_ID_BITS, choices=range(22, 33), metavar="22-32",
+                        help="gNB ID length in bits of the NCI, for deriving gNB and cell IDs")
+    subparsers = parser.add_subparsers(dest="command")
+    subparsers.required = True
+
+    report = subparsers.add_parser("report", help="Write LTE/5G exports, CR workbooks and VDT reports per market")
+    report.add_argument("--files", nargs="+", required=True, help="LTE/5GNR/BBU dump files (CSV or Excel)")
+    report.add_argument("--out", default=f"reports_{datetime.now().strftime('%Y%m%d')}", help="Output directory")
+    report.add_argument("--searches", help="Batch search file; reports are limited to matched rows")
+    report.add_argument("--search-type", default="USID", choices=SEARCH_TYPES,
+                        help="Search type for lines without an explicit type")
+    report.add_argument("--markets", nargs="+", help="ED_Market values to report (default: all mapped markets)")
+    report.add_argument("--lte-cr", default="cellRange", choices=list(CR_PARAMETERS["LTE"]), help="LTE CR type")
+    report.add_argument("--nr-cr", default="digitalTilt", choices=list(CR_PARAMETERS["5GNR"]), help="5G CR type")
+    report.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Parallel market workers")
+    report.set_defaults(func=cmd_report)
+
+    pci = subparsers.add_parser("pci", help="Co-channel PCI collision / mod 3 / mod 30 audit")
+    pci.add_argument("--files", nargs="+", required=True, help="LTE/5GNR dump files (CSV or Excel)")
+    pci.add_argument("--km", type=float, default=5.0, help="Distance threshold in km")
+    pci.add_argument("--tech", nargs="+", choices=["LTE", "5GNR"], help="Technologies to audit (default: both)")
+    pci.add_argument("--out", default="PCI_Conflicts.xlsx", help="Output .xlsx, .csv or .csv.gz file")
+    pci.set_defaults(func=cmd_pci)
+
+    query = subparsers.add_parser("query", help="Boolean query, e.g. \"Site=XYZ AND EARFCNDL=5230\"")
+    query.add_argument("--files", nargs="+", required=True, help="LTE/5GNR/BBU dump files (CSV or Excel)")
+    query.add_argument("--query", required=True, help="Query text (=, !=, >, >=, <, <=, ~ with AND/OR/NOT)")
+    query.add_argument("--explain", action="store_true", help="Print the chosen plan and timings")
+    query.add_argument("--out", help="Write matches to .xlsx, .csv or .csv.gz instead of printing them")
+    query.set_defaults(func=cmd_query)
+
+    cr = subparsers.add_parser("cr-rules", help="Bulk CR generation from a rules file")
+    cr.add_argument("--files", nargs="+", required=True, help="LTE/5GNR/BBU dump files (CSV or Excel)")
+    cr.add_argument("--rules", required=True, help="Rules .csv/.xlsx/.json (Tech, Parameter, Value, Where, Name)")
+    cr.add_argument("--out", default="CR_Rules", help="Output directory")
+    cr.add_argument("--split", choices=["site", "market"], default="site", help="One workbook per site or market")
+    cr.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Parallel workbook writers")
+    cr.set_defaults(func=cmd_cr_rules)
+
+    diff = subparsers.add_parser("cr-diff", help="CRs for planned values that differ from the dumps")
+    diff.add_argument("--files", nargs="+", required=True, help="LTE/5GNR/BBU dump files (CSV or Excel)")
+    diff.add_argument("--plan", required=True, help="Planned values .csv/.xlsx keyed by EUTRAN_CELL_FDD_ID / NRCELLDUID")
+    diff.add_argument("--out", default="CR_Plan_Diff.xlsx", help="CR workbook with a Summary sheet")
+    diff.add_argument("--split-dir", help="Also write one CR workbook per site/market into this directory")
+    diff.add_argument("--split", choices=["site", "market"], default="site", help="Grouping for --split-dir")
+    diff.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Parallel workbook writers")
+    diff.set_defaults(func=cmd_cr_diff)
+
+    vdt = subparsers.add_parser("vdt-batch", help="One VDT report per market, bundled into a zip")
+    vdt.add_argument("--files", nargs="+", required=True, help="LTE/5GNR/BBU dump files (CSV or Excel)")
+    vdt.add_argument("--out", default=f"VDT_Reports_{datetime.now().strftime('%Y%m%d')}.zip", help="Zip file")
+    vdt.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Parallel report builders")
+    vdt.set_defaults(func=cmd_vdt_batch)
+
+    sectors = subparsers.add_parser("sectors", help="Sector footprint polygons as GeoJSON or KML")
+    sectors.add_argument("--files", nargs="+", required=True, help="LTE/5GNR/BBU dump files (CSV or Excel)")
+    sectors.add_argument("--out", default="sectors.geojson", help="Output .geojson/.json or .kml file")
+    sectors.add_argument("--tech", nargs="+", choices=["LTE", "5GNR"], help="Technologies (default: both)")
+    sectors.add_argument("--beamwidth", type=float, default=SECTOR_BEAMWIDTH_DEG, help="Horizontal beamwidth in degrees")
+    sectors.set_defaults(func=cmd_sectors)
+
+    ranges = subparsers.add_parser("range-audit", help="Oversized / undersized CELLRANGE vs the nearest facing site")
+    ranges.add_argument("--files", nargs="+", required=True, help="LTE/5GNR/BBU dump files (CSV or Excel)")
+    ranges.add_argument("--out", default="Cell_Range_Audit.xlsx", help="Output .xlsx, .csv or .csv.gz file")
+    ranges.add_argument("--tech", nargs="+", choices=["LTE", "5GNR"], help="Technologies to audit (default: both)")
+    ranges.add_argument("--all", action="store_true", help="List every cell, not only flagged ones")
+    ranges.add_argument("--half-angle", type=float, default=FACING_HALF_ANGLE_DEG,
+                        help="Degrees either side of the azimuth a facing site may lie")
+    ranges.add_argument("--max-km", type=float, default=RANGE_SEARCH_MAX_KM, help="Furthest facing-site search")
+    ranges.add_argument("--cr-dir", help="Also write cellRange CR workbooks for flagged cells into this directory")
+    ranges.add_argument("--split", choices=["site", "market"], default="site", help="Grouping for --cr-dir")
+    ranges.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Parallel workbook writers")
+    ranges.set_defaults(func=cmd_range_audit)
+
+    consistency = subparsers.add_parser("consistency-audit", help="OSS vs Atoll mismatches per cell, counted per market")
+    consistency.add_argument("--files", nargs="+", required=True, help="LTE/5GNR/BBU dump files (CSV or Excel)")
+    consistency.add_argument("--out", default="OSS_vs_Atoll.xlsx",
+                             help="Output .xlsx (Mismatches and Summary sheets), .csv or .csv.gz file")
+    consistency.add_argument("--tech", nargs="+", choices=["LTE", "5GNR"], help="Technologies to audit (default: both)")
+    consistency.set_defaults(func=cmd_consistency)
+
+    colocated = subparsers.add_parser("colocation", help="Co-located LTE/5GNR site pairs")
+    colocated.add_argument("--files", nargs="+", required=True, help="LTE/5GNR/BBU dump files (CSV or Excel)")
+    colocated.add_argument("--out", default="Colocation.xlsx", help="Output .xlsx, .csv or .csv.gz file")
+    colocated.add_argument("--km", type=float, default=COLOCATION_KM, help="Site position tolerance in km")
+    colocated.set_defaults(func=cmd_colocation)
+
+    dss = subparsers.add_parser("dss-audit", help="Dangling, site-mismatched and state-conflicting DSS_LTECELL references")
+    dss.add_argument("--files", nargs="+", required=True, help="LTE/5GNR/BBU dump files (CSV or Excel)")
+    dss.add_argument("--out", default="DSS_Audit.xlsx",
+                     help="Output .xlsx (Issues and Summary sheets), .csv or .csv.gz file")
+    dss.set_defaults(func=cmd_dss_audit)
+
+    dump_diff = subparsers.add_parser("dump-diff", help="Cells added, removed or changed between two dump loads")
+    dump_diff.add_argument("--old", nargs="+", required=True, help="Previous LTE/5GNR dump files (CSV or Excel)")
+    dump_diff.add_argument("--new", nargs="+", required=True, help="Current LTE/5GNR dump files (CSV or Excel)")
+    dump_diff.add_argument("--out", default=f"Dump_Diff_{datetime.now().strftime('%Y%m%d')}.xlsx",
+                           help="Output .xlsx (Changes and Summary sheets), .csv or .csv.gz file")
+    dump_diff.add_argument("--tech", nargs="+", choices=["LTE", "5GNR"], help="Technologies to compare (default: both)")
+    dump_diff.add_argument("--ignore", nargs="+", help="Columns left out of the comparison (e.g. export timestamps)")
+    dump_diff.set_defaults(func=cmd_dump_diff)
+
+    return parser
+
+
+def main(argv=None):
+    """Entry point for the headless tools"""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except Exception as e:
+        logging.error(f"{args.command} failed: {str(e)}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
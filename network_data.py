@@ -0,0 +1,827 @@
+import io
+import os
+import logging
+import difflib
+from functools import lru_cache
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import openpyxl
+
+# Market (ED_Market value) to VDT project name
+MARKET_MAPPING = {
+    "ATT_ARK1": "ATT_ARK_253",
+    "ATT_NoCAL1": "ATT_NoCAL_253",
+    "ATT_SoCAL1": "ATT_SoCAL_253",
+    "ATT_STX": "ATT_STX_253"
+}
+DEFAULT_PROJECT_NAME = "ATT_STX_253"
+
+# Logical field -> candidate source columns, in priority order
+MAPPINGS = {
+    "LTE": {
+        "USID": ["REMOTE_USID", "CSS_USID", "USID"],
+        "ENBID": ["ENBID"],
+        "cell ID": ["CELLID"],
+        "Site": ["MECONTEXT_ID", "SITE", "OSS_ENodeB"],
+        "Azumuth": ["ATOLL_AZIMUTH", "AZIMUTH", "Atoll_AZIMUT", "Atoll_Az"],
+        "Digital Tilt": ["DIGITALTILT", "DIGITAL_TILT", "TILT"],
+        "cell": ["EUTRAN_CELL_FDD_ID", "CELL", "OSS_EUTRAN_CELL_FDD_ID", "CELL_NAME"],
+        "height(Meter)": ["Atoll_HEIGHT_m", "HEIGHT", "ANTENNA_HEIGHT", "HEIGHT_M"],
+        "PCI": ["PHYSICALLAYERCELLID", "PCI", "OSS_PCI", "Atoll_PCI"],
+        "Power": ["CONFIGUREDMAXTXPOWER", "TX_POWER", "OSS_CONFIGUREDMAXTXPOWER"],
+        "LATITUDE": ["LATITUDE", "LAT"],
+        "LONGITUDE": ["LONGITUDE", "LON", "LONG"],
+        "ADMINISTRATIVESTATE": ["ADMINISTRATIVE_STATE", "ADMIN_STATE"],
+        "OPERATIONALSTATE": ["OPERATIONALSTATE", "OP_STATE"],
+        "CELLRANGE": ["CELLRANGE"],
+        "CRSGAIN": ["CRSGAIN"],
+        "QRXLEVMIN": ["QRXLEVMIN"],
+        "EARFCNDL": ["EARFCNDL"],
+        "Electrical Tilt": ["ELECTRICAL_TILT", "Atoll_ET", "E_TILT"],
+        "ED_Market": ["ED_MARKET", "ED_Market", "EDMARKET"],
+        "ECI": []  # Derived from ENBID and cell ID
+    },
+    "5GNR": {
+        "USID": ["CSS_USID", "REMOTE_USID", "USID", "BBU_USID"],
+        "NIC": ["NCI"],
+        "gnb ID": ["GNBID", "GNB_ID"],
+        "Site": ["CTS_COMMON_ID", "GNB_NAME", "GNODEB"],
+        "Azumuth": ["Atoll_AZIMUT", "AZIMUTH", "ATOLL_AZIMUTH"],
+        "Digital Tilt": ["DIGITALTILT", "DIGITAL_TILT", "USEDDIGITALTILT"],
+        "cell": ["NRCELLDUID", "CELL", "NRCELL_NAME"],
+        "height(Meter)": ["Atoll_HEIGHT_m", "HEIGHT", "ANTENNA_HEIGHT", "ATOLL_ANTENNA_HEIGHT"],
+        "PCI": ["NRPCI", "PCI"],
+        "Power": ["CONFIGUREDMAXTXPOWER", "TX_POWER", "POWER"],
+        "LATITUDE": ["LAT", "LATITUDE"],
+        "LONGITUDE": ["LONG", "LONGITUDE"],
+        "ADMINISTRATIVESTATE": ["ADMINISTRATIVESTATE", "ADMIN_STATE"],
+        "OPERATIONALSTATE": ["OPERATIONALSTATE", "OP_STATE"],
+        "CELLBARRED": ["CELLBARRED"],
+        "CELLRESERVEDFOROPERATOR": ["CELLRESERVEDFOROPERATOR"],
+        "CELLRANGE": ["CELLRANGE"],
+        "SSBFREQUENCY": ["SSBFREQUENCY"],
+        "ARFCNDL": ["ARFCNDL", "ARFCN_DL", "DL_ARFCN", "NR_ARFCNDL"],
+        "CONFIGURATION": ["CONFIGURATION"],
+        "Electrical Tilt": ["ELECTRICAL_TILT", "Atoll_ET", "E_TILT"],
+        "ED_Market": ["ED_MARKET", "ED_Market", "EDMARKET"],
+        "BBU_TECH": ["BBU_TECH"],
+        "GNB_SA_STATE": ["GNB_SA_STATE"],
+        "CELL_SA_STATE": ["CELL_SA_STATE"],
+        "CELL_TYPE": ["CELL_TYPE"],
+        "ON_AIR": ["ON_AIR"],
+        "DSS_LTECELL": ["DSS_LTECELL"],
+        "NRTAC": ["NRTAC"],
+        "NR cell ID": []  # Derived from NIC
+    },
+    "5GNR_BBU": {
+        "USID": ["USID", "REMOTE_USID", "CSS_USID"],
+        "NRCELL_NAME": ["NRCELLDUID", "CELL", "NRCELL_NAME"],
+        "CONFIGURATION": ["CONFIGURATION"],
+        "ED_Market": ["ED_MARKET", "ED_Market", "EDMARKET"]
+    }
+}
+
+SEARCH_TYPES = ["USID", "NIC", "gnb ID", "ENBID", "cell ID", "ECI", "Site"]
+
+# NCI is 36 bits: the gNB ID in the top GNB_ID_BITS (22-32, operator setting), the cell ID below
+NCI_BITS = 36
+GNB_ID_BITS = 24
+# Identifier fields computed from other IDs; mapped fields here are only filled where the dump is empty
+DERIVED_ID_FIELDS = {"LTE": ("ECI",), "5GNR": ("gnb ID", "NR cell ID")}
+# Numeric identifiers parsed to int64 at load; their equality indexes are sorted integer arrays
+INTEGER_ID_FIELDS = {
+    "LTE": ("USID", "ENBID", "cell ID", "ECI", "PCI", "EARFCNDL"),
+    "5GNR": ("USID", "NIC", "gnb ID", "NR cell ID", "PCI", "ARFCNDL", "SSBFREQUENCY")
+}
+# float64 holds every integer below this exactly
+MAX_ID_BITS = 53
+
+# Default columns of the result tabs
+MAIN_COLUMNS = [
+    "Source", "NIC", "gnb ID", "NR cell ID", "ENBID", "cell ID", "ECI", "USID", "Site",
+    "Azumuth", "Digital Tilt", "cell", "height(Meter)", "PCI", "Power",
+    "LATITUDE", "LONGITUDE", "ADMINISTRATIVESTATE", "OPERATIONALSTATE"
+]
+LTE_COLUMNS = ["Source", "Site", "cell", "CELLRANGE", "CRSGAIN", "QRXLEVMIN", "EARFCNDL"]
+NR_COLUMNS = [
+    "Source", "USID", "SITE", "NRCELL_NAME", "Digital Tilt", "Power", "PCI",
+    "ADMINISTRATIVESTATE", "CELLBARRED", "CELLRESERVEDFOROPERATOR",
+    "OPERATIONALSTATE", "CELLRANGE", "SSBFREQUENCY", "CONFIGURATION"
+]
+
+# Tab column name -> logical field, where they differ
+COLUMN_TO_KEY = {
+    "LTE": {},
+    "5GNR": {"SITE": "Site", "NRCELL_NAME": "cell"}
+}
+
+# CR type -> (logical field holding the value, MO Class template)
+CR_PARAMETERS = {
+    "LTE": {
+        "cellRange": ("CELLRANGE", "EUtranCellFDD={cell}"),
+        "crsGain": ("CRSGAIN", "EUtranCellFDD={cell}"),
+        "Electrical Tilt": ("Electrical Tilt", "EUtranCellFDD={cell}")
+    },
+    "5GNR": {
+        "digitalTilt": ("Digital Tilt", "NRSectorCarrier={cell},CommonBeamforming=1"),
+        "cellRange": ("CELLRANGE", "NRCellDU={cell}")
+    }
+}
+CR_COLUMNS = ["Site", "MO Class", "Parameter", "Value", "CurrentValue"]
+CR_SHEET_NAMES = {"LTE": "Sheet1", "5GNR": "5g cr buttun"}
+
+# 5GNR fields filled from the BBU dump when missing
+BBU_FILL_FIELDS = ("CONFIGURATION",)
+
+# Numeric parameters that get sorted range indexes at load time
+RANGE_INDEX_FIELDS = ["CELLRANGE", "Digital Tilt", "Electrical Tilt", "Power", "QRXLEVMIN", "CRSGAIN", "height(Meter)"]
+
+# Carrier field listed per site in the VDT report
+VDT_CARRIER_FIELDS = {"LTE": "EARFCNDL", "5GNR": "SSBFREQUENCY"}
+
+
+def clean_value(value):
+    """Clean numeric values to remove .0 suffix"""
+    try:
+        if pd.isna(value) or value == "nan" or value is None:
+            return ""
+        # Remove decimal part if it's .0
+        if isinstance(value, float) and value.is_integer():
+            return str(int(value))
+        if isinstance(value, str) and '.' in value and value.split('.')[1] == '0':
+            return value.split('.')[0]
+        return str(value)
+    except:
+        return str(value)
+
+
+def clean_series(series):
+    """Vectorized clean_value for a whole column"""
+    if pd.api.types.is_float_dtype(series) or pd.api.types.is_datetime64_any_dtype(series):
+        return series.map(clean_value).astype(object)
+    values = series.astype(object)
+    missing = values.isna()
+    text = values.where(~missing, "").astype(str)
+    text = text.mask(text == "nan", "")
+    values = text.to_numpy(dtype=object)
+    # Only rows containing ".0" can need trimming; most columns have none
+    candidates = np.flatnonzero(text.str.contains(".0", regex=False).to_numpy())
+    if len(candidates):
+        subset = text.iloc[candidates]
+        has_zero = subset.str.match(r"^[^.]*\.0(?:\.|$)").to_numpy()
+        values[candidates[has_zero]] = subset[has_zero].str.split(".", n=1).str[0].to_numpy()
+    return pd.Series(values, index=series.index, dtype=object)
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Vectorized great-circle distance in kilometers (Haversine formula)"""
+    R = 6371.0  # Earth radius in kilometers
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(v, dtype=float)) for v in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return R * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+
+def bearing_deg(lat1, lon1, lat2, lon2):
+    """Vectorized initial bearing from point 1 to point 2, degrees clockwise from north"""
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(v, dtype=float)) for v in (lat1, lon1, lat2, lon2))
+    dlon = lon2 - lon1
+    y = np.sin(dlon) * np.cos(lat2)
+    x = np.cos(lat1) * np.sin(lat2) - np.sin(lat1) * np.cos(lat2) * np.cos(dlon)
+    return np.degrees(np.arctan2(y, x)) % 360
+
+
+def angle_diff_deg(a, b):
+    """Smallest absolute difference between two angles in degrees (0-180)"""
+    return np.abs((np.asarray(a, dtype=float) - np.asarray(b, dtype=float) + 180) % 360 - 180)
+
+
+def integer_ids(values, bits):
+    """int64 array of non-negative integers below 2**bits; -1 where missing or invalid"""
+    values = np.asarray(values, dtype=float)
+    with np.errstate(invalid="ignore"):
+        valid = np.isfinite(values) & (values >= 0) & (values < 2 ** bits) & (np.mod(values, 1) == 0)
+    return np.where(valid, values, -1).astype(np.int64)
+
+
+def split_nci(nci, gnb_id_bits=GNB_ID_BITS):
+    """(gNB ID, cell ID) int64 arrays from NCI values; -1 where the NCI is unusable"""
+    nci = integer_ids(nci, NCI_BITS)
+    valid = nci >= 0
+    cell_bits = NCI_BITS - gnb_id_bits
+    return np.where(valid, nci >> cell_bits, -1), np.where(valid, nci & ((1 << cell_bits) - 1), -1)
+
+
+def compose_eci(enbid, cellid):
+    """ECI (ENBID * 256 + cell ID) int64 array; -1 where either part is unusable"""
+    enbid = integer_ids(enbid, 20)
+    cellid = integer_ids(cellid, 8)
+    return np.where((enbid >= 0) & (cellid >= 0), enbid * 256 + cellid, -1)
+
+
+def parse_id(value):
+    """Integer form of one identifier as typed or stored ("0123", "123.0" -> 123), else None"""
+    try:
+        number = float(str(value).strip())
+    except ValueError:
+        return None
+    if not np.isfinite(number) or number < 0 or number >= 2 ** MAX_ID_BITS or not number.is_integer():
+        return None
+    return int(number)
+
+
+def parse_ids(values):
+    """int64 IDs of logical field strings; -1 where empty or not an integer"""
+    values = np.asarray(values, dtype=object)
+    ids = np.full(len(values), -1, dtype=np.int64)
+    present = np.flatnonzero(values != "")
+    if len(present):
+        numbers = pd.to_numeric(pd.Series(values[present]), errors="coerce").to_numpy(dtype=float)
+        ids[present] = integer_ids(numbers, MAX_ID_BITS)
+    return ids
+
+
+def id_strings(ids):
+    """Identifier strings as logical fields hold them; "" for -1"""
+    return np.where(ids >= 0, ids.astype(str), "").astype(object)
+
+
+def valid_coordinates(lat, lon):
+    """Float latitude/longitude arrays with NaN where the position is unusable"""
+    lat = pd.to_numeric(pd.Series(lat), errors="coerce").to_numpy(dtype=float)
+    lon = pd.to_numeric(pd.Series(lon), errors="coerce").to_numpy(dtype=float)
+    invalid = (np.abs(lat) > 90) | (np.abs(lon) > 180) | ((lat == 0) & (lon == 0))
+    return np.where(invalid, np.nan, lat), np.where(invalid, np.nan, lon)
+
+
+def resolve_columns(columns, possible_names, tech=None):
+    """Ordered source columns get_column_value would try for these names"""
+    return list(_resolve_columns(tuple(columns), tuple(possible_names), tech))
+
+
+@lru_cache(maxsize=4096)
+def _resolve_columns(columns, possible_names, tech):
+    columns = list(columns)
+    ordered = []
+
+    def add(col):
+        if col not in ordered:
+            ordered.append(col)
+
+    # Exact, case-insensitive, then substring matches
+    for name in possible_names:
+        if name in columns:
+            add(name)
+    for col in columns:
+        col_str = str(col).strip().lower()
+        for name in possible_names:
+            if col_str == name.lower():
+                add(col)
+    for col in columns:
+        col_str = str(col).strip().lower()
+        for name in possible_names:
+            if name.lower() in col_str:
+                add(col)
+    # Fuzzy matching using difflib
+    lowered = [str(c).lower() for c in columns]
+    for name in possible_names:
+        close_matches = difflib.get_close_matches(name.lower(), lowered, n=1, cutoff=0.8)
+        if close_matches:
+            add(columns[lowered.index(close_matches[0])])
+    # Special handling for 5GNR cell values
+    if tech == "5GNR" and "NRCELL_NAME" in possible_names:
+        for col in columns:
+            col_str = str(col).strip().lower()
+            if "nrcell" in col_str or "cell" in col_str or "name" in col_str:
+                add(col)
+    return tuple(ordered)
+
+
+def logical_series(df, possible_names, tech=None, cache=None):
+    """Resolve one logical field for every row: first non-empty candidate column wins"""
+    result = pd.Series("", index=df.index, dtype=object)
+    for col in reversed(resolve_columns(df.columns, possible_names, tech)):
+        if cache is not None:
+            if col not in cache:
+                cache[col] = clean_series(df[col])
+            cleaned = cache[col]
+        else:
+            cleaned = clean_series(df[col])
+        result = cleaned.where(cleaned != "", result)
+    return result
+
+
+def fill_from_bbu(nr_df, values, bbu_df, key="CONFIGURATION"):
+    """Fill empty 5GNR values from the BBU dump, joined on (USID, cell)"""
+    if bbu_df is None or bbu_df.empty or not (values == "").any():
+        return values
+    bbu_possible = MAPPINGS["5GNR_BBU"].get(key)
+    if not bbu_possible:
+        return values
+    bbu = pd.DataFrame({
+        "usid": logical_series(bbu_df, MAPPINGS["5GNR_BBU"]["USID"]),
+        "cell": logical_series(bbu_df, MAPPINGS["5GNR_BBU"]["NRCELL_NAME"]),
+        "value": logical_series(bbu_df, bbu_possible)
+    })
+    bbu = bbu[(bbu["usid"] != "") & (bbu["cell"] != "")].drop_duplicates(["usid", "cell"], keep="last")
+    keys = pd.DataFrame({
+        "usid": logical_series(nr_df, MAPPINGS["5GNR"]["USID"], "5GNR").values,
+        "cell": logical_series(nr_df, MAPPINGS["5GNR"]["cell"], "5GNR").values
+    })
+    joined = keys.merge(bbu, on=["usid", "cell"], how="left")["value"].fillna("").values
+    return values.where(values != "", pd.Series(joined, index=values.index))
+
+
+def logical_frame(df, tech, keys=None, bbu_df=None, mappings=MAPPINGS):
+    """DataFrame of resolved logical fields (columns named by mapping key)"""
+    keys = list(mappings[tech].keys()) if keys is None else list(keys)
+    cache = {}
+    out = {}
+    for key in keys:
+        values = logical_series(df, mappings[tech].get(key, [key]), tech, cache)
+        if tech == "5GNR" and key in BBU_FILL_FIELDS:
+            values = fill_from_bbu(df, values, bbu_df, key)
+        out[key] = values
+    return pd.DataFrame(out, index=df.index, columns=keys)
+
+
+def read_dump(file_path):
+    """Read one parameter dump as strings"""
+    if str(file_path).lower().endswith('.csv'):
+        return pd.read_csv(file_path, dtype=str)
+    return pd.read_excel(file_path, dtype=str)
+
+
+def classify_dump(file_path, df):
+    """Return 'LTE', '5GNR', '5GNR_BBU' or None for a loaded dump"""
+    filename = os.path.basename(str(file_path)).upper()
+    columns = df.columns.str.upper().tolist()
+
+    if 'LTE' in filename or any(col in columns for col in ['ENBID', 'CELLID', 'EUTRAN_CELL_FDD_ID']):
+        return "LTE"
+    if 'BBU' in filename or any(col in columns for col in ['BBU_TECH', 'GNB_SA_STATE']):
+        return "5GNR_BBU"
+    if '5G' in filename or 'NR' in filename or any(col in columns for col in ['NCI', 'GNBID', 'NRCELLDU', 'NRCELLDUID']):
+        return "5GNR"
+
+    # Fallback: check for key keywords
+    lte_keywords = ['ENBID', 'CELLID', 'EUTRAN']
+    nr_keywords = ['NCI', 'GNBID', 'NRCELL']
+    bbu_keywords = ['BBU_TECH', 'GNB_SA']
+    scores = {
+        'LTE': sum(1 for kw in lte_keywords if any(kw in col for col in columns)),
+        '5GNR': sum(1 for kw in nr_keywords if any(kw in col for col in columns)),
+        '5GNR_BBU': sum(1 for kw in bbu_keywords if any(kw in col for col in columns))
+    }
+    max_score_type = max(scores, key=scores.get)
+    if scores[max_score_type] > 0:
+        return max_score_type
+    return None
+
+
+def merge_duplicate_cells(df, tech):
+    """Collapse rows of the same cell, filling empty values from later rows"""
+    if df.empty:
+        return df
+    cells = logical_series(df, MAPPINGS[tech]["cell"], tech)
+    filled = df.astype(object).replace("", np.nan)
+    merged = filled.groupby(cells.values, sort=False).first()
+    return merged.reset_index(drop=True)
+
+
+def parameter_rows(df, tech, columns=None, bbu_df=None):
+    """Rows of the Main/LTE/5G result tabs for the given records"""
+    if columns is None:
+        columns = LTE_COLUMNS if tech == "LTE" else NR_COLUMNS
+    column_to_key = COLUMN_TO_KEY.get(tech, {})
+    keys = [column_to_key.get(col, col) for col in columns if col != "Source"]
+    fields = logical_frame(df, tech, [k for k in keys if k in MAPPINGS[tech]], bbu_df)
+    out = {}
+    for col in columns:
+        if col == "Source":
+            out[col] = tech
+            continue
+        key = column_to_key.get(col, col)
+        if key in fields.columns:
+            out[col] = fields[key]
+        else:
+            # Raw column added by the user
+            out[col] = logical_series(df, [col], tech)
+    return pd.DataFrame(out, index=df.index, columns=columns)
+
+
+def fill_derived_ids(fields, tech, gnb_id_bits=GNB_ID_BITS):
+    """Fill the empty derived identifiers of a logical frame, as NetworkDataset.field does
+
+    5GNR gnb ID / NR cell ID come from splitting the NIC column, LTE ECI from
+    the ENBID and cell ID columns. Values present in the dump are kept.
+    """
+    if tech == "5GNR":
+        gnb_id, cell_id = split_nci(pd.to_numeric(fields["NIC"], errors="coerce"), gnb_id_bits)
+        derived = {"gnb ID": gnb_id, "NR cell ID": cell_id}
+    else:
+        enbid = pd.to_numeric(fields["ENBID"], errors="coerce")
+        derived = {"ECI": compose_eci(enbid, pd.to_numeric(fields["cell ID"], errors="coerce"))}
+    for key, ids in derived.items():
+        if key in fields.columns:
+            fields[key] = fields[key].where(fields[key] != "", pd.Series(id_strings(ids), index=fields.index))
+    return fields
+
+
+def main_rows(df, tech, extra_keys=(), gnb_id_bits=GNB_ID_BITS):
+    """Main tab fields (Source first) for the given records, plus any extra logical fields"""
+    keys = [col for col in MAIN_COLUMNS if col in MAPPINGS[tech]] + [k for k in extra_keys if k in MAPPINGS[tech]]
+    fields = fill_derived_ids(logical_frame(df, tech, keys), tech, gnb_id_bits)
+    fields.insert(0, "Source", tech)
+    return fields
+
+
+def build_cr_rows(df, tech, cr_type, bbu_df=None):
+    """CR rows (Site / MO Class / Parameter / Value / CurrentValue) for the given records"""
+    field, mo_template = CR_PARAMETERS[tech][cr_type]
+    fields = logical_frame(df, tech, ["Site", "cell", field], bbu_df)
+    prefix, suffix = mo_template.split("{cell}")
+    return pd.DataFrame({
+        "Site": fields["Site"],
+        "MO Class": prefix + fields["cell"] + suffix,
+        "Parameter": cr_type,
+        "Value": fields[field],
+        "CurrentValue": ""  # Empty for engineer to fill
+    }, columns=CR_COLUMNS)
+
+
+def records_frame(records, tech):
+    """DataFrame of one technology's rows from a list of (tech, row) records"""
+    rows = [record for record_tech, record in records if record_tech == tech]
+    if not rows:
+        return pd.DataFrame()
+    if all(isinstance(row, pd.Series) for row in rows):
+        columns = rows[0].index
+        if all(row.index.equals(columns) for row in rows):
+            # Rows of the same dump share their index; stacking the values is much faster
+            return pd.DataFrame([row.values for row in rows], columns=columns)
+    # The Streamlit apps keep records as dicts
+    return pd.DataFrame.from_records([dict(row) for row in rows])
+
+
+def carriers_by_site(sites, carriers):
+    """Map each site to its comma separated, sorted unique carriers in one group-by"""
+    pairs = pd.DataFrame({"Site": np.asarray(sites, dtype=object), "Carrier": np.asarray(carriers, dtype=object)})
+    pairs = pairs[pairs["Site"] != ""]
+    with_carrier = pairs[pairs["Carrier"] != ""].drop_duplicates().sort_values(["Site", "Carrier"])
+    grouped = with_carrier.groupby("Site", sort=False)["Carrier"].agg(",".join)
+    return {site: grouped.get(site, "") for site in sorted(pairs["Site"].unique())}
+
+
+def site_carriers(df, tech, mappings=MAPPINGS):
+    """Map each site of the given records to its comma separated, sorted unique carriers"""
+    if df.empty:
+        return {}
+    fields = logical_frame(df, tech, ["Site", VDT_CARRIER_FIELDS[tech]], mappings=mappings)
+    return carriers_by_site(fields["Site"], fields[VDT_CARRIER_FIELDS[tech]])
+
+
+def build_vdt_workbook(project_name, lte_sites, nr_sites, current_time=None, carrier_notes=True, neighbours=None):
+    """Build the VDT report workbook from (site, carriers) pairs
+
+    The workbook is write-only: rows are streamed, so 10k-site reports stay
+    fast, and it can only be saved once. carrier_notes=False leaves the
+    data-source note columns blank, as the Streamlit apps' reports do.
+    neighbours ({tech: {site: [neighbour sites]}}) fills the neighbour list
+    column; sites without an entry keep it blank.
+    """
+    neighbours = neighbours or {}
+    lte_neighbours = neighbours.get("LTE", {})
+    nr_neighbours = neighbours.get("5GNR", {})
+    if current_time is None:
+        current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    wb = openpyxl.Workbook(write_only=True)
+
+    zoom_header = ("ZOOM (Default = 0 for automatic zoom, enter integer value for manual zoom\n"
+                   "Eg. value: 5 will fetch plots up to 5 km diagonally from site in both directions.")
+    neighbour_header = "Neighbour list (comma separated), if blank first tier neighbours will be considered"
+    time_remark = "Use exact format. Add \" ' \" before"
+    buffer_remark = "Default keep it 0.01. Can increase it to accommodate TA Plot"
+    lte_note = "EARFCN DL from lte parameter data source" if carrier_notes else ""
+    nr_notes = ["ARFCNDL", "from data source"] if carrier_notes else ["", ""]
+
+    lte_sheet = wb.create_sheet("LTE")
+    lte_sheet.append(["Type", "Value", "Remarks", "Buffer", ""])
+    lte_sheet.append(["projectName", project_name, "", "0.01", ""])
+    lte_sheet.append(["startTime", current_time, time_remark, buffer_remark, ""])
+    lte_sheet.append(["endTime", current_time, time_remark, "", ""])
+    lte_sheet.append(["Site Name List", zoom_header, neighbour_header, "Carrier List(comma separated)", lte_note])
+    for site, earfcn_str in lte_sites:
+        lte_sheet.append([site, "0", ",".join(lte_neighbours.get(site, [])), earfcn_str, ""])
+
+    nr_sheet = wb.create_sheet("NR")
+    nr_sheet.append(["Type", "Value", "Remarks", "Buffer", "", ""])
+    nr_sheet.append(["projectName", project_name, "", "0.01", "", ""])
+    nr_sheet.append(["startTime", current_time, time_remark, buffer_remark, "", ""])
+    nr_sheet.append(["endTime", current_time, time_remark, "", "", ""])
+    nr_sheet.append(["Site Name List", zoom_header, neighbour_header, "Carrier List(comma separated)"] + nr_notes)
+    for site, arfcn_str in nr_sites:
+        nr_sheet.append([site, "0", ",".join(nr_neighbours.get(site, [])), arfcn_str] + nr_notes)
+
+    return wb
+
+
+def vdt_report_bytes(project_name, records, mappings=MAPPINGS, carrier_notes=False, neighbours=None):
+    """VDT workbook bytes for (tech, row) records, or None when no sites matched
+
+    Returns (bytes, LTE site count, NR site count).
+    """
+    lte_sites = site_carriers(records_frame(records, "LTE"), "LTE", mappings)
+    nr_sites = site_carriers(records_frame(records, "5GNR"), "5GNR", mappings)
+    if not lte_sites and not nr_sites:
+        return None, 0, 0
+    wb = build_vdt_workbook(project_name, lte_sites.items(), nr_sites.items(),
+                            carrier_notes=carrier_notes, neighbours=neighbours)
+    output = io.BytesIO()
+    wb.save(output)
+    return output.getvalue(), len(lte_sites), len(nr_sites)
+
+
+class IntIndex:
+    """Equality index over an integer ID field
+
+    Valid IDs are kept as one sorted int64 array with the row position of
+    each, so a lookup is a binary search. Rows whose value is not an
+    integer keep a small string index. get() accepts anything a dict index
+    would and normalizes it with parse_id first.
+    """
+
+    def __init__(self, ids, valid, values):
+        positions = np.flatnonzero(valid)
+        # Stable sort keeps each key's positions ascending
+        order = np.argsort(ids[positions], kind="stable")
+        self.keys = ids[positions][order]
+        self.positions = positions[order]
+        other = np.flatnonzero(~valid & (values != ""))
+        groups = pd.Series(other).groupby(values[other], sort=False).indices if len(other) else {}
+        self.other = {value: other[idx] for value, idx in groups.items()}
+
+    def __len__(self):
+        return len(np.unique(self.keys)) + len(self.other)
+
+    def get(self, value, default=None):
+        key = parse_id(value)
+        if key is None:
+            return self.other.get(clean_value(str(value).strip()), default)
+        lo = np.searchsorted(self.keys, key, side="left")
+        hi = np.searchsorted(self.keys, key, side="right")
+        return self.positions[lo:hi] if hi > lo else default
+
+    def __contains__(self, value):
+        return self.get(value) is not None
+
+    def __getitem__(self, value):
+        positions = self.get(value)
+        if positions is None:
+            raise KeyError(value)
+        return positions
+
+
+def filter_rows(df, text):
+    """Rows where any column contains text (case-insensitive)"""
+    text = str(text).strip().lower()
+    if not text or df.empty:
+        return df
+    mask = np.zeros(len(df), dtype=bool)
+    for col in df.columns:
+        mask |= df[col].astype(str).str.lower().str.contains(text, regex=False).values
+    return df[mask]
+
+
+class NetworkDataset:
+    """Loaded LTE/5GNR/BBU dumps with lazily built logical-field indexes"""
+
+    def __init__(self, mappings=MAPPINGS, gnb_id_bits=GNB_ID_BITS):
+        self.mappings = mappings
+        self.gnb_id_bits = gnb_id_bits
+        self.lte_data = pd.DataFrame()
+        self.nr_data = pd.DataFrame()
+        self.bbu_data = pd.DataFrame()
+        self.version = 0
+        self._fields = {}
+        self._indexes = {}
+        self._ranges = {}
+        self._clean_cache = {}
+        self._results = {}
+
+    def frame(self, tech):
+        """Raw DataFrame for a technology"""
+        return {"LTE": self.lte_data, "5GNR": self.nr_data, "5GNR_BBU": self.bbu_data}[tech]
+
+    def load(self, file_paths, progress=None):
+        """Load and classify dump files, replacing any previously loaded data"""
+        frames = {"LTE": [], "5GNR": [], "5GNR_BBU": []}
+        for file_path in file_paths:
+            if progress:
+                progress(f"Loading data from {os.path.basename(str(file_path))}")
+            df = read_dump(file_path)
+            tech = classify_dump(file_path, df)
+            if tech is None:
+                logging.error(f"Could not classify {file_path}; skipped")
+                continue
+            # Remove duplicates before concatenating
+            frames[tech].append(df.drop_duplicates())
+
+        def combine(dfs):
+            if not dfs:
+                return pd.DataFrame()
+            return pd.concat(dfs, ignore_index=True).drop_duplicates().reset_index(drop=True)
+
+        self.set_frames(combine(frames["LTE"]), combine(frames["5GNR"]), combine(frames["5GNR_BBU"]))
+        self.build_id_indexes()
+        self.build_range_indexes()
+
+    def set_frames(self, lte_data, nr_data, bbu_data=None):
+        """Replace the loaded data and invalidate derived state"""
+        self.lte_data = lte_data
+        self.nr_data = nr_data
+        self.bbu_data = bbu_data if bbu_data is not None else pd.DataFrame()
+        self.version += 1
+        self._fields = {}
+        self._indexes = {}
+        self._ranges = {}
+        self._clean_cache = {}
+        self._results = {}
+
+    def cached(self, key, compute):
+        """Result of compute() kept until the next load, for analyses built from the whole dataset"""
+        if key not in self._results:
+            self._results[key] = compute()
+        return self._results[key]
+
+    def field(self, tech, key):
+        """Resolved logical field for every row of a technology (cached per load)"""
+        cache_key = (tech, key)
+        if cache_key not in self._fields:
+            df = self.frame(tech)
+            derived = key in DERIVED_ID_FIELDS.get(tech, ())
+            names = self.mappings[tech].get(key, [] if derived else [key])
+            values = logical_series(df, names, tech, self._clean_cache.setdefault(tech, {}))
+            if tech == "5GNR" and key in BBU_FILL_FIELDS:
+                values = fill_from_bbu(df, values, self.bbu_data, key)
+            if derived:
+                # Dump values win; int_ids needs them apart from the derived ones
+                self._fields[(tech, key, "dump")] = values
+                ids = pd.Series(id_strings(self.derived_ids(tech)[key]), index=df.index)
+                values = values.where(values != "", ids)
+            self._fields[cache_key] = values
+        return self._fields[cache_key]
+
+    def derived_ids(self, tech):
+        """{field: int64 array} of identifiers computed from the NCI or ENBID/cell ID; -1 where unknown"""
+        cache_key = (tech, "derived ids")
+        if cache_key not in self._fields:
+            if tech == "5GNR":
+                gnb_id, cell_id = split_nci(self.numeric(tech, "NIC"), self.gnb_id_bits)
+                self._fields[cache_key] = {"gnb ID": gnb_id, "NR cell ID": cell_id}
+            else:
+                eci = compose_eci(self.numeric(tech, "ENBID"), self.numeric(tech, "cell ID"))
+                self._fields[cache_key] = {"ECI": eci}
+        return self._fields[cache_key]
+
+    def fields(self, tech, keys):
+        """Several resolved logical fields as one DataFrame"""
+        return pd.DataFrame({key: self.field(tech, key) for key in keys}, index=self.frame(tech).index)
+
+    def numeric(self, tech, key):
+        """Logical field as a float array (NaN where missing or not numeric)"""
+        cache_key = (tech, key, float)
+        if cache_key not in self._fields:
+            self._fields[cache_key] = pd.to_numeric(self.field(tech, key), errors="coerce").to_numpy(dtype=float)
+        return self._fields[cache_key]
+
+    def coordinates(self, tech):
+        """(latitude, longitude) float arrays, NaN where the position is unusable"""
+        return valid_coordinates(self.numeric(tech, "LATITUDE"), self.numeric(tech, "LONGITUDE"))
+
+    def is_id_field(self, tech, key):
+        """True for numeric identifiers held as int64 (see INTEGER_ID_FIELDS)"""
+        return key in INTEGER_ID_FIELDS.get(tech, ()) and (key in self.mappings[tech] or key in DERIVED_ID_FIELDS[tech])
+
+    def int_ids(self, tech, key):
+        """(int64 IDs, validity mask) of an identifier field; IDs are -1 where not a valid integer"""
+        cache_key = (tech, key, int)
+        if cache_key not in self._fields:
+            if key in DERIVED_ID_FIELDS.get(tech, ()):
+                self.field(tech, key)
+                dump = self._fields[(tech, key, "dump")].to_numpy(dtype=object)
+                ids = np.where(dump != "", parse_ids(dump), self.derived_ids(tech)[key])
+            else:
+                ids = parse_ids(self.field(tech, key).to_numpy(dtype=object))
+            self._fields[cache_key] = (ids, ids >= 0)
+        return self._fields[cache_key]
+
+    def index(self, tech, key):
+        """Equality index: logical value -> row positions (an IntIndex for identifier fields)"""
+        cache_key = (tech, key)
+        if cache_key not in self._indexes and self.is_id_field(tech, key):
+            ids, valid = self.int_ids(tech, key)
+            self._indexes[cache_key] = IntIndex(ids, valid, self.field(tech, key).to_numpy(dtype=object))
+        if cache_key not in self._indexes:
+            values = self.field(tech, key)
+            mask = (values != "").values
+            positions = np.flatnonzero(mask)
+            groups = pd.Series(positions).groupby(values.values[mask], sort=False).indices
+            self._indexes[cache_key] = {value: positions[idx] for value, idx in groups.items()}
+        return self._indexes[cache_key]
+
+    def range_index(self, tech, key):
+        """Sorted numeric values of a field and the row position of each"""
+        cache_key = (tech, key)
+        if cache_key not in self._ranges:
+            values = self.numeric(tech, key)
+            positions = np.flatnonzero(~np.isnan(values))
+            order = np.argsort(values[positions], kind="stable")
+            self._ranges[cache_key] = (values[positions][order], positions[order])
+        return self._ranges[cache_key]
+
+    def build_id_indexes(self):
+        """Derive gNB/cell IDs and ECIs, parse identifiers to int64 and index them up front"""
+        for tech in ("LTE", "5GNR"):
+            if self.frame(tech).empty:
+                continue
+            for key in SEARCH_TYPES:
+                if key in self.mappings[tech]:
+                    self.index(tech, key)
+            for key in INTEGER_ID_FIELDS[tech]:
+                if self.is_id_field(tech, key):
+                    self.index(tech, key)
+
+    def build_range_indexes(self, keys=RANGE_INDEX_FIELDS):
+        """Parse numeric parameters and build their range indexes up front"""
+        for tech in ("LTE", "5GNR"):
+            if self.frame(tech).empty:
+                continue
+            for key in keys:
+                if key in self.mappings[tech]:
+                    self.range_index(tech, key)
+
+    def range_bounds(self, tech, key, op, value):
+        """(start, stop) slice of the range index where field <op> value, by binary search"""
+        sorted_values, positions = self.range_index(tech, key)
+        value = float(value)
+        if op == ">":
+            return np.searchsorted(sorted_values, value, side="right"), len(positions)
+        if op == ">=":
+            return np.searchsorted(sorted_values, value, side="left"), len(positions)
+        if op == "<":
+            return 0, np.searchsorted(sorted_values, value, side="left")
+        if op == "<=":
+            return 0, np.searchsorted(sorted_values, value, side="right")
+        raise ValueError(f"Unsupported range operator {op}")
+
+    def range_count(self, tech, key, op, value):
+        """Number of rows where field <op> value, without building their positions"""
+        start, stop = self.range_bounds(tech, key, op, value)
+        return int(stop - start)
+
+    def range_positions(self, tech, key, op, value):
+        """Row positions (ascending) where field <op> value, by binary search"""
+        start, stop = self.range_bounds(tech, key, op, value)
+        return np.sort(self.range_index(tech, key)[1][start:stop])
+
+    def search_frames(self, search_type, value, merge=True):
+        """Exact-match search; returns {tech: matching raw rows}"""
+        value = clean_value(str(value).strip())
+        results = {}
+        for tech in ("LTE", "5GNR"):
+            df = self.frame(tech)
+            if df.empty or search_type not in self.mappings[tech]:
+                continue
+            positions = self.index(tech, search_type).get(value)
+            if positions is None or len(positions) == 0:
+                continue
+            matched = df.iloc[positions]
+            results[tech] = merge_duplicate_cells(matched, tech) if merge else matched
+        return results
+
+    def search(self, search_type, value):
+        """Exact-match search returning (tech, row) records like the search UI"""
+        records = []
+        for tech, df in self.search_frames(search_type, value).items():
+            records.extend((tech, row) for _, row in df.iterrows())
+        return records
+
+    def markets(self):
+        """Sorted ED_Market values present in the loaded data"""
+        values = set()
+        for tech in ("LTE", "5GNR"):
+            if not self.frame(tech).empty:
+                values.update(self.field(tech, "ED_Market").unique())
+        values.discard("")
+        return sorted(values)
+
+    def market_frames(self, market):
+        """Raw LTE/5GNR rows for one ED_Market"""
+        out = {}
+        for tech in ("LTE", "5GNR"):
+            df = self.frame(tech)
+            out[tech] = df[(self.field(tech, "ED_Market") == market).values] if not df.empty else df
+        return out
@@ -0,0 +1,356 @@
+import io
+import sys
+import json
+import time
+import logging
+import argparse
+import threading
+from collections import deque
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+import numpy as np
+import pandas as pd
+
+from query_cache import QueryCache
+from neighbours import cached_neighbours
+from spatial_index import SpatialIndex
+from network_data import (
+    NetworkDataset, MAPPINGS, SEARCH_TYPES, VDT_CARRIER_FIELDS, DEFAULT_PROJECT_NAME, GNB_ID_BITS,
+    clean_value, main_rows, site_carriers, build_vdt_workbook
+)
+
+XLSX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+# Grid cube edge of the radius search index; radii past a few cubes scan all cells instead
+RADIUS_CELL_KM = 2.0
+# Largest radius a /radius request may ask for
+MAX_RADIUS_KM = 200.0
+
+
+class ServiceError(Exception):
+    """Request error reported to the client with an HTTP status"""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+class LatencyStats:
+    """Per-endpoint request counters and latency percentiles"""
+
+    def __init__(self, window=1000):
+        self.window = window
+        self._endpoints = {}
+        self._lock = threading.Lock()
+
+    def record(self, endpoint, seconds, ok=True):
+        """Record one request"""
+        with self._lock:
+            entry = self._endpoints.setdefault(endpoint, {
+                "count": 0, "errors": 0, "total": 0.0, "max": 0.0, "recent": deque(maxlen=self.window)
+            })
+            entry["count"] += 1
+            entry["errors"] += 0 if ok else 1
+            entry["total"] += seconds
+            entry["max"] = max(entry["max"], seconds)
+            entry["recent"].append(seconds)
+
+    def snapshot(self):
+        """Counters per endpoint, latencies in milliseconds"""
+        with self._lock:
+            out = {}
+            for endpoint, entry in self._endpoints.items():
+                recent = np.array(entry["recent"]) * 1000
+                out[endpoint] = {
+                    "count": entry["count"],
+                    "errors": entry["errors"],
+                    "avg_ms": round(entry["total"] * 1000 / entry["count"], 3),
+                    "p50_ms": round(float(np.percentile(recent, 50)), 3),
+                    "p95_ms": round(float(np.percentile(recent, 95)), 3),
+                    "max_ms": round(entry["max"] * 1000, 3)
+                }
+            return out
+
+
+def record_fields(df, tech, gnb_id_bits=GNB_ID_BITS):
+    """JSON-ready records of the Main tab fields (plus carrier) for the given rows"""
+    return main_rows(df, tech, [VDT_CARRIER_FIELDS[tech]], gnb_id_bits).to_dict("records")
+
+
+class NetworkService:
+    """Warm dataset, indexes and result cache behind the HTTP endpoints"""
+
+    def __init__(self, dataset=None, cache=None):
+        self.dataset = dataset or NetworkDataset()
+        self.cache = cache or QueryCache(max_entries=1024, max_bytes=256 * 1024 * 1024)
+        self.stats = LatencyStats()
+        self._reload_lock = threading.Lock()
+        self._spatial = {}
+
+    def load(self, file_paths):
+        """Load dumps into a fresh dataset and swap it in once its indexes are built"""
+        with self._reload_lock:
+            dataset = NetworkDataset(gnb_id_bits=self.dataset.gnb_id_bits)
+            dataset.version = self.dataset.version
+            dataset.load(file_paths, progress=logging.info)
+            self.warm(dataset)
+            self.dataset = dataset
+            self._spatial = {key: index for key, index in self._spatial.items() if key[1] == dataset.version}
+            self.cache.clear()
+        logging.info(f"Loaded {len(dataset.lte_data)} LTE, {len(dataset.nr_data)} 5GNR, "
+                     f"and {len(dataset.bbu_data)} BBU records")
+
+    def warm(self, dataset):
+        """Build search indexes and coordinates up front so requests never pay for them"""
+        for tech in ("LTE", "5GNR"):
+            if dataset.frame(tech).empty:
+                continue
+            for search_type in SEARCH_TYPES:
+                if search_type in MAPPINGS[tech]:
+                    dataset.index(tech, search_type)
+            self.spatial_index(dataset, tech)
+
+    def spatial_index(self, dataset, tech):
+        """Radius search index over one load's cell positions (built by warm)"""
+        key = (tech, dataset.version)
+        index = self._spatial.get(key)
+        if index is None:
+            index = SpatialIndex(*dataset.coordinates(tech), RADIUS_CELL_KM)
+            self._spatial[key] = index
+        return index
+
+    def search(self, search_type, value):
+        """Exact-match search records"""
+        if search_type not in SEARCH_TYPES:
+            raise ServiceError(f"Unknown search type '{search_type}'")
+        dataset = self.dataset
+        key = ("search", search_type, clean_value(str(value).strip()), dataset.version)
+
+        def compute():
+            records = []
+            for tech, df in dataset.search_frames(search_type, value).items():
+                records.extend(record_fields(df, tech, dataset.gnb_id_bits))
+            return records
+
+        records = self.cache.get_or_compute(key, compute)
+        return {"type": search_type, "value": value, "count": len(records), "records": records}
+
+    def batch(self, searches):
+        """Run several searches in one request"""
+        results = []
+        for search in searches:
+            if isinstance(search, str):
+                search = {"type": "USID", "value": search}
+            results.append(self.search(search.get("type", "USID"), search.get("value", "")))
+        return {"count": len(results), "results": results}
+
+    def radius(self, lat, lon, km, tech=None, limit=500):
+        """Cells within km of a point, nearest first"""
+        dataset = self.dataset
+        techs = [tech] if tech else ["LTE", "5GNR"]
+        matches = []
+        count = 0
+        for t in techs:
+            df = dataset.frame(t)
+            if df.empty:
+                continue
+            positions, distances = self.spatial_index(dataset, t).query_radius(lat, lon, km)
+            count += len(positions)
+            # Only each technology's nearest limit cells can make the merged nearest limit
+            positions, distances = positions[:limit], distances[:limit]
+            for record, distance in zip(record_fields(df.iloc[positions], t, dataset.gnb_id_bits), distances):
+                record["Distance (km)"] = round(float(distance), 4)
+                matches.append(record)
+        matches.sort(key=lambda r: r["Distance (km)"])
+        return {"lat": lat, "lon": lon, "km": km, "count": count, "records": matches[:limit]}
+
+    def vdt_report(self, search_type, values, project_name=DEFAULT_PROJECT_NAME):
+        """VDT report workbook bytes for the sites matched by the searches"""
+        if search_type not in SEARCH_TYPES:
+            raise ServiceError(f"Unknown search type '{search_type}'")
+        dataset = self.dataset
+        frames = {"LTE": [], "5GNR": []}
+        for value in values:
+            for tech, df in dataset.search_frames(search_type, value).items():
+                frames[tech].append(df)
+        sites = {}
+        for tech, dfs in frames.items():
+            sites[tech] = site_carriers(pd.concat(dfs), tech) if dfs else {}
+        if not sites["LTE"] and not sites["5GNR"]:
+            raise ServiceError("No sites matched", status=404)
+        neighbours = cached_neighbours(dataset)
+        wb = build_vdt_workbook(project_name, sites["LTE"].items(), sites["5GNR"].items(), neighbours=neighbours)
+        buffer = io.BytesIO()
+        wb.save(buffer)
+        return buffer.getvalue()
+
+    def status(self):
+        """Dataset size, cache and latency statistics"""
+        dataset = self.dataset
+        return {
+            "version": dataset.version,
+            "records": {"LTE": len(dataset.lte_data), "5GNR": len(dataset.nr_data), "BBU": len(dataset.bbu_data)},
+            "cache": self.cache.stats(),
+            "endpoints": self.stats.snapshot()
+        }
+
+
+class ServiceRequestHandler(BaseHTTPRequestHandler):
+    """Routes GET/POST requests to the NetworkService attached to the server"""
+
+    routes = {
+        ("GET", "/search"): "handle_search",
+        ("POST", "/batch"): "handle_batch",
+        ("GET", "/radius"): "handle_radius",
+        ("GET", "/vdt-report"): "handle_vdt_report",
+        ("POST", "/vdt-report"): "handle_vdt_report",
+        ("GET", "/stats"): "handle_stats",
+        ("POST", "/reload"): "handle_reload"
+    }
+
+    @property
+    def service(self):
+        return self.server.service
+
+    def do_GET(self):
+        self.dispatch("GET")
+
+    def do_POST(self):
+        self.dispatch("POST")
+
+    def dispatch(self, method):
+        """Run the matching handler and record its latency"""
+        start = time.perf_counter()
+        url = urlparse(self.path)
+        handler = self.routes.get((method, url.path))
+        ok = False
+        try:
+            if handler is None:
+                raise ServiceError(f"No endpoint {method} {url.path}", status=404)
+            self.query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+            getattr(self, handler)()
+            ok = True
+        except ServiceError as e:
+            self.send_json({"error": str(e)}, e.status)
+        except Exception as e:
+            logging.error(f"Error in {url.path}: {str(e)}")
+            self.send_json({"error": str(e)}, 500)
+        finally:
+            if handler is not None:
+                self.service.stats.record(url.path, time.perf_counter() - start, ok)
+
+    def read_json(self):
+        """Parsed JSON request body"""
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            return json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            raise ServiceError("Request body is not valid JSON")
+
+    def param(self, name, default=None, convert=str):
+        """Query-string parameter, converted, with a 400 on bad input"""
+        value = self.query.get(name, default)
+        if value is None:
+            raise ServiceError(f"Missing parameter '{name}'")
+        try:
+            return convert(value)
+        except ValueError:
+            raise ServiceError(f"Invalid value for '{name}': {value}")
+
+    def send_body(self, body, content_type, status=200, headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_json(self, payload, status=200):
+        self.send_body(json.dumps(payload, default=str).encode("utf-8"), "application/json", status)
+
+    def handle_search(self):
+        self.send_json(self.service.search(self.param("type", "USID"), self.param("value")))
+
+    def handle_batch(self):
+        body = self.read_json()
+        searches = body.get("searches") if isinstance(body, dict) else body
+        if not isinstance(searches, list):
+            raise ServiceError("Expected {\"searches\": [...]}")
+        self.send_json(self.service.batch(searches))
+
+    def handle_radius(self):
+        tech = self.query.get("tech")
+        if tech not in (None, "LTE", "5GNR"):
+            raise ServiceError("tech must be LTE or 5GNR")
+        km = self.param("km", "1", float)
+        if not 0 < km <= MAX_RADIUS_KM:
+            raise ServiceError(f"km must be greater than 0 and at most {MAX_RADIUS_KM:g}")
+        self.send_json(self.service.radius(
+            self.param("lat", convert=float), self.param("lon", convert=float),
+            km, tech, self.param("limit", "500", int)
+        ))
+
+    def handle_vdt_report(self):
+        if self.command == "POST":
+            body = self.read_json()
+            search_type = body.get("type", "USID")
+            values = body.get("values", [])
+            project_name = body.get("project", DEFAULT_PROJECT_NAME)
+        else:
+            search_type = self.param("type", "USID")
+            values = [v for v in self.param("values").split(",") if v.strip()]
+            project_name = self.param("project", DEFAULT_PROJECT_NAME)
+        content = self.service.vdt_report(search_type, values, project_name)
+        self.send_body(content, XLSX_CONTENT_TYPE,
+                       headers={"Content-Disposition": f'attachment; filename="VDT_{project_name}.xlsx"'})
+
+    def handle_stats(self):
+        self.send_json(self.service.status())
+
+    def handle_reload(self):
+        body = self.read_json()
+        files = body.get("files") if isinstance(body, dict) else None
+        if not files:
+            raise ServiceError("Expected {\"files\": [...]}")
+        self.service.load(files)
+        self.send_json(self.service.status())
+
+    def log_message(self, format, *args):
+        logging.debug(f"{self.address_string()} - {format % args}")
+
+
+def create_server(service, host="127.0.0.1", port=8765):
+    """Threaded HTTP server bound to a NetworkService"""
+    server = ThreadingHTTPServer((host, port), ServiceRequestHandler)
+    server.daemon_threads = True
+    server.service = service
+    return server
+
+
+def main(argv=None):
+    """Run the query service until interrupted"""
+    parser = argparse.ArgumentParser(description="Local HTTP JSON query service over network dumps")
+    parser.add_argument("--files", nargs="+", required=True, help="LTE/5GNR/BBU dump files (CSV or Excel)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--gnb-id-bits", type=int, default=GNB_ID_BITS, choices=range(22, 33), metavar="22-32",
+                        help="gNB ID length in bits of the NCI, for deriving gNB and cell IDs")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    service = NetworkService(NetworkDataset(gnb_id_bits=args.gnb_id_bits))
+    service.load(args.files)
+    server = create_server(service, args.host, args.port)
+    logging.info(f"Serving on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+
+from network_data import VDT_CARRIER_FIELDS
+from spatial_index import SpatialIndex
+
+PCI_CONFLICT_COLUMNS = [
+    "Tech", "Carrier", "Conflict", "Site", "Cell", "PCI",
+    "Neighbour Site", "Neighbour Cell", "Neighbour PCI", "Distance (km)"
+]
+
+# Most severe first; PCI mod 30 equality implies mod 3 equality
+CONFLICT_TYPES = ["PCI Collision", "PCI Mod 30", "PCI Mod 3"]
+
+
+def audit_cells(dataset, tech):
+    """One row per cell with a usable PCI, carrier and position"""
+    carrier_field = VDT_CARRIER_FIELDS[tech]
+    fields = dataset.fields(tech, ["Site", "cell", "PCI", carrier_field]).reset_index(drop=True)
+    lat, lon = dataset.coordinates(tech)
+    pci = dataset.numeric(tech, "PCI")
+    valid = ((fields["cell"] != "") & (fields[carrier_field] != "")).to_numpy()
+    valid = valid & np.isfinite(pci) & np.isfinite(lat) & np.isfinite(lon)
+    cells = fields[valid].assign(pci=pci[valid], lat=lat[valid], lon=lon[valid])
+    cells = cells.rename(columns={carrier_field: "carrier"})
+    # Dumps can list a cell more than once; keep its first row
+    return cells.drop_duplicates("cell").reset_index(drop=True)
+
+
+def find_pci_conflicts(dataset, max_km=5.0, techs=("LTE", "5GNR")):
+    """Co-channel cell pairs within max_km sharing a PCI, PCI mod 30 or PCI mod 3"""
+    results = []
+    for tech in techs:
+        if dataset.frame(tech).empty:
+            continue
+        cells = audit_cells(dataset, tech)
+        for carrier, group in cells.groupby("carrier", sort=True):
+            if len(group) < 2:
+                continue
+            index = SpatialIndex(group["lat"].values, group["lon"].values, max_km)
+            i, j, distances = index.pairs_within(max_km)
+            if len(i) == 0:
+                continue
+            pci_a = group["pci"].values[i].astype(np.int64)
+            pci_b = group["pci"].values[j].astype(np.int64)
+            conflict = np.select(
+                [pci_a == pci_b, pci_a % 30 == pci_b % 30, pci_a % 3 == pci_b % 3],
+                CONFLICT_TYPES, default=""
+            )
+            hit = conflict != ""
+            results.append(pd.DataFrame({
+                "Tech": tech,
+                "Carrier": carrier,
+                "Conflict": conflict[hit],
+                "Site": group["Site"].values[i[hit]],
+                "Cell": group["cell"].values[i[hit]],
+                "PCI": pci_a[hit].astype(str),
+                "Neighbour Site": group["Site"].values[j[hit]],
+                "Neighbour Cell": group["cell"].values[j[hit]],
+                "Neighbour PCI": pci_b[hit].astype(str),
+                "Distance (km)": np.round(distances[hit], 3)
+            }, columns=PCI_CONFLICT_COLUMNS))
+    if not results:
+        return pd.DataFrame(columns=PCI_CONFLICT_COLUMNS)
+    conflicts = pd.concat(results, ignore_index=True)
+    severity = conflicts["Conflict"].map({name: rank for rank, name in enumerate(CONFLICT_TYPES)})
+    order = np.lexsort((conflicts["Distance (km)"].values, severity.values))
+    return conflicts.iloc[order].reset_index(drop=True)
+
@@ -0,0 +1,106 @@
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import pandas as pd
+
+
+def estimate_size(value):
+    """Approximate memory footprint of a cached search result in bytes"""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_size(item) for item in value)
+    return sys.getsizeof(value)
+
+
+class QueryCache:
+    """LRU cache for search results, bounded by entry count and total bytes"""
+
+    def __init__(self, max_entries=256, max_bytes=256 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> (value, size, compute_seconds)
+        self._lock = threading.Lock()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.saved_seconds = 0.0
+
+    def get(self, key):
+        """Return (found, value) and refresh the entry's LRU position"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            self.saved_seconds += entry[2]
+            return True, entry[0]
+
+    def put(self, key, value, compute_seconds=0.0):
+        """Store a result, evicting least recently used entries as needed"""
+        size = estimate_size(value)
+        with self._lock:
+            if key in self._entries:
+                self.total_bytes -= self._entries.pop(key)[1]
+            # A single result larger than the whole budget is never cached
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (value, size, compute_seconds)
+            self.total_bytes += size
+            while self._entries and (len(self._entries) > self.max_entries or self.total_bytes > self.max_bytes):
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self.total_bytes -= evicted_size
+                self.evictions += 1
+
+    def get_or_compute(self, key, compute):
+        """Return the cached value for key, computing and storing it on a miss"""
+        found, value = self.get(key)
+        if found:
+            return value
+        start = time.perf_counter()
+        value = compute()
+        self.put(key, value, time.perf_counter() - start)
+        return value
+
+    def clear(self):
+        """Drop all cached entries (statistics are kept)"""
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def reset_stats(self):
+        """Reset hit/miss counters and saved time"""
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+            self.saved_seconds = 0.0
+
+    def stats(self):
+        """Return a snapshot of cache statistics"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self.total_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": (self.hits / lookups) if lookups else 0.0,
+                "saved_seconds": self.saved_seconds
+            }
+
+    def format_stats(self):
+        """One-line summary for status panels"""
+        s = self.stats()
+        return (f"Cache: {s['hits']} hits / {s['misses']} misses ({s['hit_rate'] * 100:.1f}% hit rate), "
+                f"saved {s['saved_seconds']:.2f}s, {s['entries']} entries, {s['bytes'] / (1024 * 1024):.1f} MB")
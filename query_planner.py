@@ -0,0 +1,319 @@
+import re
+import time
+
+import numpy as np
+import pandas as pd
+
+from network_data import MAPPINGS, clean_value, parse_id, merge_duplicate_cells
+
+OPERATORS = ["!=", ">=", "<=", "=", ">", "<", "~"]
+RANGE_OPERATORS = (">", ">=", "<", "<=")
+
+
+class QueryError(ValueError):
+    """Malformed query text"""
+
+
+def range_query(field, low=None, high=None, market=None):
+    """Query text for low <= field <= high, optionally within one ED_Market"""
+    parts = []
+    if low not in (None, ""):
+        parts.append(f"{field}>={float(low)!r}")
+    if high not in (None, ""):
+        parts.append(f"{field}<={float(high)!r}")
+    if not parts:
+        raise QueryError("Enter a minimum and/or maximum value")
+    if market:
+        parts.append(f'ED_Market="{market}"')
+    return " AND ".join(parts)
+
+
+def known_fields(mappings=MAPPINGS):
+    """Logical field names usable in queries, longest first for tokenizing"""
+    fields = {key for tech in ("LTE", "5GNR") for key in mappings[tech]}
+    return sorted(fields, key=len, reverse=True)
+
+
+def numeric_value(node):
+    """Float value of a range predicate"""
+    try:
+        return float(node.value)
+    except ValueError:
+        raise QueryError(f"{node.field}{node.op} needs a numeric value")
+
+
+class Predicate:
+    """field <op> value"""
+
+    def __init__(self, field, op, value):
+        self.field = field
+        self.op = op
+        self.value = value if op == "~" else clean_value(value)
+
+    def describe(self):
+        return f"{self.field}{self.op}'{self.value}'"
+
+
+class BoolOp:
+    """AND / OR over child nodes"""
+
+    def __init__(self, op, children):
+        self.op = op
+        self.children = children
+
+    def describe(self):
+        return "(" + f" {self.op} ".join(child.describe() for child in self.children) + ")"
+
+
+class Not:
+    """Negated child node"""
+
+    def __init__(self, child):
+        self.child = child
+
+    def describe(self):
+        return f"NOT {self.child.describe()}"
+
+
+def tokenize(text, fields=None):
+    """Split query text into ('PRED', Predicate) / ('AND'|'OR'|'NOT'|'('|')', None) tokens"""
+    fields = fields or known_fields()
+    field_pattern = "|".join(re.escape(f) for f in fields) + r"|[A-Za-z_][\w.]*"
+    op_pattern = "|".join(re.escape(op) for op in OPERATORS)
+    predicate = re.compile(
+        rf"\s*(?P<field>{field_pattern})\s*(?P<op>{op_pattern})\s*"
+        r"(?P<value>\"[^\"]*\"|'[^']*'|[^\s()]+)", re.IGNORECASE
+    )
+    keyword = re.compile(r"\s*(AND|OR|NOT)\b|\s*([()])", re.IGNORECASE)
+    canonical = {f.lower(): f for f in fields}
+
+    tokens = []
+    pos = 0
+    while pos < len(text):
+        if not text[pos:].strip():
+            break
+        match = keyword.match(text, pos)
+        if match:
+            tokens.append(((match.group(1) or match.group(2)).upper(), None))
+            pos = match.end()
+            continue
+        match = predicate.match(text, pos)
+        if not match:
+            raise QueryError(f"Cannot parse query near: {text[pos:].strip()[:30]}")
+        value = match.group("value")
+        if value[:1] in "\"'":
+            value = value[1:-1]
+        field = canonical.get(match.group("field").lower(), match.group("field"))
+        tokens.append(("PRED", Predicate(field, match.group("op"), value)))
+        pos = match.end()
+    return tokens
+
+
+def parse_query(text, fields=None):
+    """Parse query text into a predicate tree (NOT binds tighter than AND, AND tighter than OR)"""
+    tokens = tokenize(text, fields)
+    pos = 0
+
+    def peek():
+        return tokens[pos][0] if pos < len(tokens) else None
+
+    def take(kind):
+        nonlocal pos
+        if peek() != kind:
+            raise QueryError(f"Expected {kind} in query")
+        pos += 1
+        return tokens[pos - 1][1]
+
+    def parse_or():
+        children = [parse_and()]
+        while peek() == "OR":
+            take("OR")
+            children.append(parse_and())
+        return children[0] if len(children) == 1 else BoolOp("OR", children)
+
+    def parse_and():
+        children = [parse_not()]
+        while peek() == "AND":
+            take("AND")
+            children.append(parse_not())
+        return children[0] if len(children) == 1 else BoolOp("AND", children)
+
+    def parse_not():
+        if peek() == "NOT":
+            take("NOT")
+            return Not(parse_not())
+        if peek() == "(":
+            take("(")
+            node = parse_or()
+            take(")")
+            return node
+        return take("PRED")
+
+    if not tokens:
+        raise QueryError("Empty query")
+    tree = parse_or()
+    if pos != len(tokens):
+        raise QueryError("Unexpected text after end of query")
+    return tree
+
+
+class QueryResult:
+    """Matched rows per technology plus the explain trace"""
+
+    def __init__(self, query, frames, plan):
+        self.query = query
+        self.frames = frames
+        self.plan = plan
+
+    def records(self):
+        """(tech, row) pairs in the order the search UI shows them"""
+        out = []
+        for tech, df in self.frames.items():
+            out.extend((tech, row) for _, row in df.iterrows())
+        return out
+
+    def explain(self):
+        return "\n".join([f"Query: {self.query}"] + self.plan)
+
+
+class QueryPlanner:
+    """Plans queries against a NetworkDataset's indexes and evaluates the rest vectorized"""
+
+    def __init__(self, dataset):
+        self.dataset = dataset
+
+    def has_field(self, tech, field):
+        """True if the field is mapped for this tech, or is a raw column name"""
+        if field in self.dataset.mappings[tech]:
+            return True
+        return all(field not in self.dataset.mappings[t] for t in ("LTE", "5GNR"))
+
+    def estimate(self, node, tech):
+        """Estimated rows of an index-backed node without building its positions, else None"""
+        if isinstance(node, Predicate):
+            if not self.has_field(tech, node.field) and node.op != "!=":
+                return 0
+            if node.op == "=" and node.field in self.dataset.mappings[tech]:
+                positions = self.dataset.index(tech, node.field).get(node.value)
+                return 0 if positions is None else len(positions)
+            if node.op in RANGE_OPERATORS and node.field in self.dataset.mappings[tech]:
+                return self.dataset.range_count(tech, node.field, node.op, numeric_value(node))
+            return None
+        if isinstance(node, BoolOp):
+            estimates = [self.estimate(child, tech) for child in node.children]
+            if node.op == "AND":
+                known = [e for e in estimates if e is not None]
+                return min(known) if known else None
+            # A union is at most the sum of its parts
+            return None if any(e is None for e in estimates) else sum(estimates)
+        return None
+
+    def access_path(self, node, tech):
+        """(positions, description, estimated rows) for an index-backed node, else None"""
+        if isinstance(node, Predicate):
+            if not self.has_field(tech, node.field) and node.op != "!=":
+                # Field does not exist for this technology: nothing can match
+                return np.array([], dtype=np.int64), f"no {node.field} for {tech}", 0
+            if node.op == "=" and node.field in self.dataset.mappings[tech]:
+                positions = self.dataset.index(tech, node.field).get(node.value, np.array([], dtype=np.int64))
+                return positions, f"index lookup {node.describe()}", len(positions)
+            if node.op in RANGE_OPERATORS and node.field in self.dataset.mappings[tech]:
+                positions = self.dataset.range_positions(tech, node.field, node.op, numeric_value(node))
+                return positions, f"range index {node.describe()}", len(positions)
+            return None
+        if isinstance(node, BoolOp) and node.op == "AND":
+            # Most selective indexed conjunct drives the scan; only its positions are built
+            estimates = [(self.estimate(child, tech), child) for child in node.children]
+            estimates = [(e, child) for e, child in estimates if e is not None]
+            return self.access_path(min(estimates, key=lambda p: p[0])[1], tech) if estimates else None
+        if isinstance(node, BoolOp) and node.op == "OR":
+            paths = [self.access_path(child, tech) for child in node.children]
+            if any(p is None for p in paths):
+                return None
+            positions = np.unique(np.concatenate([p[0] for p in paths]))
+            return positions, "index union [" + ", ".join(p[1] for p in paths) + "]", len(positions)
+        return None
+
+    def evaluate(self, node, tech, positions):
+        """Boolean mask of node over the given row positions"""
+        if isinstance(node, Predicate):
+            return self.evaluate_predicate(node, tech, positions)
+        if isinstance(node, Not):
+            return ~self.evaluate(node.child, tech, positions)
+        mask = self.evaluate(node.children[0], tech, positions)
+        for child in node.children[1:]:
+            if node.op == "AND":
+                if not mask.any():
+                    break
+                # Only evaluate the rows still alive
+                alive = np.flatnonzero(mask)
+                mask[alive] = self.evaluate(child, tech, positions[alive])
+            else:
+                dead = np.flatnonzero(~mask)
+                if len(dead) == 0:
+                    break
+                mask[dead] = self.evaluate(child, tech, positions[dead])
+        return mask
+
+    def evaluate_predicate(self, node, tech, positions):
+        if not self.has_field(tech, node.field):
+            return np.full(len(positions), node.op == "!=")
+        if node.op in RANGE_OPERATORS:
+            target = numeric_value(node)
+            values = self.dataset.numeric(tech, node.field)[positions]
+            with np.errstate(invalid="ignore"):
+                return {">": values > target, ">=": values >= target,
+                        "<": values < target, "<=": values <= target}[node.op]
+        key = parse_id(node.value) if node.op in ("=", "!=") and self.dataset.is_id_field(tech, node.field) else None
+        if key is not None:
+            # Identifiers compare as integers, so 0123 and 123.0 both match 123
+            ids, valid = self.dataset.int_ids(tech, node.field)
+            equal = valid[positions] & (ids[positions] == key)
+            return equal if node.op == "=" else ~equal
+        values = self.dataset.field(tech, node.field).to_numpy()[positions]
+        if node.op == "=":
+            return values == node.value
+        if node.op == "!=":
+            return values != node.value
+        values = pd.Series(values, dtype=object)
+        return values.str.contains(node.value, case=False, regex=False, na=False).to_numpy(dtype=bool)
+
+    def match_positions(self, tree, tech):
+        """Row positions of one technology matching a parsed query, plus the plan line"""
+        df = self.dataset.frame(tech)
+        start = time.perf_counter()
+        path = self.access_path(tree, tech)
+        if path is None:
+            positions = np.arange(len(df))
+            access = f"full scan ({len(df)} rows)"
+        else:
+            positions = path[0]
+            access = f"{path[1]} -> {len(positions)} of {len(df)} rows"
+        plan_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        matched = positions[self.evaluate(tree, tech, positions)] if len(positions) else positions
+        filter_ms = (time.perf_counter() - start) * 1000
+
+        plan = (f"{tech}: {access}; filter -> {len(matched)} matches "
+                f"[plan {plan_ms:.2f} ms, filter {filter_ms:.2f} ms]")
+        return matched, plan
+
+    def execute(self, query, merge=True):
+        """Run a query (text or parsed tree) and return a QueryResult"""
+        tree = parse_query(query) if isinstance(query, str) else query
+        frames = {}
+        plan = [f"Parsed: {tree.describe()}"]
+        for tech in ("LTE", "5GNR"):
+            df = self.dataset.frame(tech)
+            if df.empty:
+                continue
+            matched, line = self.match_positions(tree, tech)
+            plan.append(line)
+            if len(matched):
+                rows = df.iloc[matched]
+                frames[tech] = merge_duplicate_cells(rows, tech) if merge else rows
+        return QueryResult(query if isinstance(query, str) else tree.describe(), frames, plan)
+
+    def explain(self, query):
+        return self.execute(query).explain()
@@ -0,0 +1,143 @@
+import numpy as np
+import pandas as pd
+
+from network_data import CR_PARAMETERS, bearing_deg, angle_diff_deg
+from cr_rules import CR_GROUP_COLUMNS
+from neighbours import site_table
+from sector_geometry import CELLRANGE_UNIT_KM, range_km
+from spatial_index import SpatialIndex
+
+RANGE_AUDIT_COLUMNS = CR_GROUP_COLUMNS + [
+    "Cell", "Azimuth", "Range (km)", "Facing Site", "Facing Distance (km)", "Suggested Range (km)", "Status"
+]
+RANGE_STATUSES = ["Oversized", "Undersized", "OK", "No Facing Neighbour"]
+# A site counts as facing a cell when it lies within this angle of the cell's azimuth
+FACING_HALF_ANGLE_DEG = 60.0
+# Facing sites are searched in doubling rounds; only cells still without one go to the next round
+RANGE_SEARCH_START_KM = 2.0
+RANGE_SEARCH_MAX_KM = 32.0
+# Suggested reach past the facing site, and how far above it a range counts as oversized
+REACH_FACTOR = 1.5
+OVERSIZE_RATIO = 2.0
+MIN_RANGE_KM = 1
+MAX_RANGE_KM = 100
+# Cell/neighbour rows expanded at once, to bound memory on national dumps
+PAIR_CHUNK = 4_000_000
+
+
+def range_cells(dataset, tech):
+    """One row per cell with a position and a CELLRANGE"""
+    fields = dataset.fields(tech, ["ED_Market", "Site", "cell", "Azumuth", "CELLRANGE"]).reset_index(drop=True)
+    lat, lon = dataset.coordinates(tech)
+    configured = range_km(fields["CELLRANGE"], tech)
+    valid = ((fields["cell"] != "") & (fields["Site"] != "")).to_numpy()
+    valid = valid & np.isfinite(lat) & np.isfinite(lon) & np.isfinite(configured) & (configured > 0)
+    cells = fields[valid].assign(lat=lat[valid], lon=lon[valid], range_km=configured[valid],
+                                 azimuth=pd.to_numeric(fields["Azumuth"][valid], errors="coerce").to_numpy(dtype=float))
+    # Dumps can list a cell more than once; keep its first row
+    return cells.drop_duplicates("cell").reset_index(drop=True)
+
+
+def chunk_bounds(counts, limit=PAIR_CHUNK):
+    """[start, end) row ranges whose summed counts stay near limit"""
+    ends = np.cumsum(counts)
+    cuts = np.searchsorted(ends, np.arange(limit, ends[-1] if len(ends) else 0, limit), side="left") + 1
+    bounds = np.unique(np.concatenate(([0], cuts, [len(counts)])))
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def facing_sites(cell_sites, azimuth, site_lat, site_lon, half_angle=FACING_HALF_ANGLE_DEG,
+                 start_km=RANGE_SEARCH_START_KM, max_km=RANGE_SEARCH_MAX_KM):
+    """Nearest other site inside each cell's beam: (site position or -1, distance km or NaN)
+
+    cell_sites are positions into site_lat/site_lon. Cells without an
+    azimuth take the nearest site in any direction.
+    """
+    facing = np.full(len(cell_sites), -1, dtype=np.int64)
+    distance = np.full(len(cell_sites), np.nan)
+    pending = np.arange(len(cell_sites))
+    km = start_km
+    while len(pending):
+        index = SpatialIndex(site_lat, site_lon, km)
+        i, j, d = index.pairs_from(np.unique(cell_sites[pending]), km)
+        order = np.argsort(i, kind="stable")
+        i, j, d = i[order], j[order], d[order]
+        lo = np.searchsorted(i, cell_sites[pending], side="left")
+        counts = np.searchsorted(i, cell_sites[pending], side="right") - lo
+        for start, end in chunk_bounds(counts):
+            chunk_counts = counts[start:end]
+            total = int(chunk_counts.sum())
+            if total == 0:
+                continue
+            cells = np.repeat(pending[start:end], chunk_counts)
+            offsets = np.repeat(lo[start:end] - np.concatenate(([0], np.cumsum(chunk_counts)[:-1])), chunk_counts)
+            pairs = offsets + np.arange(total)
+            src, dst = cell_sites[cells], j[pairs]
+            bearing = bearing_deg(site_lat[src], site_lon[src], site_lat[dst], site_lon[dst])
+            cell_azimuth = azimuth[cells]
+            in_beam = ~np.isfinite(cell_azimuth) | (angle_diff_deg(bearing, cell_azimuth) <= half_angle)
+            cells, dst, dist = cells[in_beam], dst[in_beam], d[pairs][in_beam]
+            # Closest in-beam site per cell: sort by (cell, distance) and keep each cell's first row
+            order = np.lexsort((dist, cells))
+            found, firsts = np.unique(cells[order], return_index=True)
+            facing[found] = dst[order][firsts]
+            distance[found] = dist[order][firsts]
+        pending = pending[facing[pending] < 0]
+        if km >= max_km:
+            break
+        km = min(km * 2, max_km)
+    return facing, distance
+
+
+def audit_tech_ranges(dataset, tech, half_angle=FACING_HALF_ANGLE_DEG, max_km=RANGE_SEARCH_MAX_KM):
+    """Range audit rows for every cell of one technology"""
+    cells = range_cells(dataset, tech)
+    sites = site_table(cells["Site"], cells["lat"], cells["lon"])
+    names = sites.index.to_numpy()
+    cell_sites = pd.Index(names).get_indexer(cells["Site"])
+    facing, facing_km = facing_sites(cell_sites, cells["azimuth"].to_numpy(), sites["lat"].to_numpy(),
+                                     sites["lon"].to_numpy(), half_angle, max_km=max_km)
+    configured = cells["range_km"].to_numpy()
+    has_facing = facing >= 0
+    suggested = np.clip(np.ceil(np.nan_to_num(facing_km) * REACH_FACTOR), MIN_RANGE_KM, MAX_RANGE_KM)
+    status = np.select(
+        [~has_facing, configured > suggested * OVERSIZE_RATIO, configured < np.nan_to_num(facing_km)],
+        ["No Facing Neighbour", "Oversized", "Undersized"], default="OK"
+    )
+    # Suggestions go back in the unit the dump uses (km for LTE, m for NR)
+    value = np.round(suggested / CELLRANGE_UNIT_KM[tech]).astype(np.int64).astype(str)
+    prefix, suffix = CR_PARAMETERS[tech]["cellRange"][1].split("{cell}")
+    return pd.DataFrame({
+        "Tech": tech,
+        "Market": cells["ED_Market"].to_numpy(),
+        "Site": cells["Site"].to_numpy(),
+        "MO Class": prefix + cells["cell"] + suffix,
+        "Parameter": "cellRange",
+        "Value": np.where(has_facing, value, ""),
+        "CurrentValue": cells["CELLRANGE"].to_numpy(),
+        "Cell": cells["cell"].to_numpy(),
+        "Azimuth": cells["Azumuth"].to_numpy(),
+        "Range (km)": np.round(configured, 3),
+        "Facing Site": np.where(has_facing, names[np.maximum(facing, 0)], ""),
+        "Facing Distance (km)": np.round(facing_km, 3),
+        "Suggested Range (km)": np.where(has_facing, suggested, np.nan),
+        "Status": status
+    }, columns=RANGE_AUDIT_COLUMNS)
+
+
+def audit_cell_ranges(dataset, techs=("LTE", "5GNR"), include_ok=False, half_angle=FACING_HALF_ANGLE_DEG,
+                      max_km=RANGE_SEARCH_MAX_KM):
+    """Compare CELLRANGE with the distance to the nearest facing site
+
+    Returns (rows, status counts per technology). Rows are the oversized and
+    undersized cells, or every cell with include_ok. They carry the CR
+    columns with the suggested cellRange as Value, so they can go straight
+    to write_cr_workbooks.
+    """
+    parts = [audit_tech_ranges(dataset, tech, half_angle, max_km) for tech in techs if not dataset.frame(tech).empty]
+    audit = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=RANGE_AUDIT_COLUMNS)
+    summary = audit.groupby(["Tech", "Status"]).size().unstack(fill_value=0).reindex(columns=RANGE_STATUSES, fill_value=0)
+    if not include_ok:
+        audit = audit[audit["Status"].isin(["Oversized", "Undersized"])]
+    audit = audit.sort_values(["Tech", "Market", "Site", "Cell"], kind="stable").reset_index(drop=True)
+    return audit, summary
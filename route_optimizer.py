@@ -0,0 +1,131 @@
+import numpy as np
+
+from network_data import haversine_km
+
+# Stop improving once a pass gains less than this (km)
+ROUTE_TOLERANCE_KM = 1e-9
+MAX_IMPROVEMENT_ROUNDS = 50
+OR_OPT_SEGMENTS = (1, 2, 3)
+
+
+def distance_matrix(lat, lon):
+    """Great-circle distance (km) between every pair of points"""
+    lat = np.asarray(lat, dtype=float)
+    lon = np.asarray(lon, dtype=float)
+    return haversine_km(lat[:, None], lon[:, None], lat[None, :], lon[None, :])
+
+
+def route_length(route, dist):
+    """Length (km) of an open path visiting route in order"""
+    route = np.asarray(route)
+    if len(route) < 2:
+        return 0.0
+    return float(dist[route[:-1], route[1:]].sum())
+
+
+def nearest_neighbour_route(dist, start=0):
+    """Greedy path from start, always driving to the closest unvisited point"""
+    n = len(dist)
+    route = [start]
+    visited = np.zeros(n, dtype=bool)
+    visited[start] = True
+    for _ in range(n - 1):
+        row = np.where(visited, np.inf, dist[route[-1]])
+        route.append(int(row.argmin()))
+        visited[route[-1]] = True
+    return np.array(route)
+
+
+def two_opt(route, dist):
+    """Reverse path segments while that shortens the route; route[0] and route[-1] stay put
+
+    For each segment start every segment end is scored in one array
+    operation, and the best reversal is applied.
+    """
+    route = route.copy()
+    n = len(route)
+    improved = True
+    rounds = 0
+    while improved and rounds < MAX_IMPROVEMENT_ROUNDS:
+        improved = False
+        rounds += 1
+        for i in range(1, n - 2):
+            j = np.arange(i + 1, n - 1)
+            a, b = route[i - 1], route[i]
+            c, d = route[j], route[j + 1]
+            delta = dist[a, c] + dist[b, d] - dist[a, b] - dist[c, d]
+            best = delta.argmin()
+            if delta[best] < -ROUTE_TOLERANCE_KM:
+                route[i:j[best] + 1] = route[i:j[best] + 1][::-1]
+                improved = True
+    return route
+
+
+def or_opt(route, dist, segments=OR_OPT_SEGMENTS):
+    """Move runs of 1-3 points (optionally reversed) to their best place elsewhere in the route
+
+    route[0] and route[-1] stay put. Every insertion edge is scored at once
+    for each run, and the best move is applied.
+    """
+    route = route.copy()
+    n = len(route)
+    improved = True
+    rounds = 0
+    while improved and rounds < MAX_IMPROVEMENT_ROUNDS:
+        improved = False
+        rounds += 1
+        for k in segments:
+            i = 1
+            while i + k < n:
+                run = route[i:i + k]
+                prev, after = route[i - 1], route[i + k]
+                first, last = run[0], run[-1]
+                removal = dist[prev, first] + dist[last, after] - dist[prev, after]
+                rest = np.concatenate((route[:i], route[i + k:]))
+                c, e = rest[:-1], rest[1:]
+                forward = dist[c, first] + dist[last, e] - dist[c, e]
+                backward = dist[c, last] + dist[first, e] - dist[c, e]
+                cost = np.minimum(forward, backward)
+                # Putting the run back where it came from is not a move
+                cost[i - 1] = np.inf
+                p = cost.argmin()
+                if cost[p] - removal < -ROUTE_TOLERANCE_KM:
+                    moved = run if forward[p] <= backward[p] else run[::-1]
+                    route = np.concatenate((rest[:p + 1], moved, rest[p + 1:]))
+                    improved = True
+                i += 1
+    return route
+
+
+def optimize_route(points, start=0):
+    """Drive-test order for (name, lat, lon) points, starting at points[start]
+
+    Nearest-neighbour construction followed by 2-opt and Or-opt passes on
+    an open path (the route does not return to the start). The original km
+    is the input order with points[start] moved to the front, so both
+    lengths start from the same point; the optimized route is never
+    longer. Returns (order as indexes into points, original km, optimized km).
+    """
+    n = len(points)
+    original = [start] + [i for i in range(n) if i != start]
+    real = distance_matrix([p[1] for p in points], [p[2] for p in points])
+    original_km = route_length(np.array(original), real)
+    if n < 3:
+        return original, original_km, original_km
+    # A free end point: a dummy node at zero distance from everyone is pinned last
+    dist = np.zeros((n + 1, n + 1))
+    dist[:n, :n] = real
+    route = np.append(nearest_neighbour_route(real, start), n)
+    best = route_length(route, dist)
+    while True:
+        route = or_opt(two_opt(route, dist), dist)
+        length = route_length(route, dist)
+        if length > best - ROUTE_TOLERANCE_KM:
+            break
+        best = length
+    order = [int(i) for i in route[:-1]]
+    optimized_km = route_length(np.array(order), real)
+    if optimized_km > original_km:
+        # The heuristics can miss an already good order; keep it then
+        return original, original_km, original_km
+    return order, original_km, optimized_km
@@ -0,0 +1,211 @@
+import json
+import os
+from xml.sax.saxutils import escape
+
+import numpy as np
+import pandas as pd
+
+from network_data import MAPPINGS, logical_frame, valid_coordinates
+
+GEOMETRY_FIELDS = ["Site", "cell", "LATITUDE", "LONGITUDE", "Azumuth", "height(Meter)",
+                   "Electrical Tilt", "Digital Tilt", "CELLRANGE"]
+GEOMETRY_COLUMNS = ["Tech", "Site", "cell", "lat", "lon", "azimuth", "height_m", "tilt_deg", "range_km", "footprint_km"]
+EARTH_RADIUS_KM = 6371.0
+SECTOR_BEAMWIDTH_DEG = 65.0
+SECTOR_ARC_STEPS = 8
+# Vertical half-power beamwidth; the footprint ends where the upper beam edge meets the ground
+VERTICAL_BEAMWIDTH_DEG = 10.0
+DEFAULT_FOOTPRINT_KM = 1.0
+MIN_FOOTPRINT_KM = 0.1
+# km per unit of each technology's CELLRANGE: Ericsson LTE cellRange is in km, NR cellRange in m
+CELLRANGE_UNIT_KM = {"LTE": 1.0, "5GNR": 0.001}
+# Digital tilt above this is taken as tenths of a degree
+TILT_DEG_MAX = 20
+
+
+def range_km(values, tech):
+    """CELLRANGE values of a technology in km (NaN where missing)"""
+    values = pd.to_numeric(pd.Series(values), errors="coerce").to_numpy(dtype=float)
+    return values * CELLRANGE_UNIT_KM[tech]
+
+
+def tilt_degrees(values):
+    """Tilt values in degrees (NaN where missing)"""
+    values = pd.to_numeric(pd.Series(values), errors="coerce").to_numpy(dtype=float)
+    return np.where(np.abs(values) > TILT_DEG_MAX, values / 10.0, values)
+
+
+def footprint_km(height_m, tilt_deg, cell_range_km, vertical_beamwidth=VERTICAL_BEAMWIDTH_DEG):
+    """Sector reach: where the upper beam edge meets the ground, capped by CELLRANGE
+
+    Cells tilted less than half the vertical beamwidth (or without height
+    and tilt) reach CELLRANGE; cells with neither get DEFAULT_FOOTPRINT_KM.
+    """
+    height_m = np.asarray(height_m, dtype=float)
+    edge = np.radians(np.asarray(tilt_deg, dtype=float) - vertical_beamwidth / 2)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ground = np.where((edge > 0) & (height_m > 0), height_m / 1000.0 / np.tan(edge), np.nan)
+    cap = np.where(np.isfinite(cell_range_km) & (cell_range_km > 0), cell_range_km, np.nan)
+    reach = np.fmin(ground, cap)
+    reach = np.where(np.isfinite(reach), reach, DEFAULT_FOOTPRINT_KM)
+    return np.maximum(reach, MIN_FOOTPRINT_KM)
+
+
+def geometry_table(tech, fields):
+    """Geometry inputs for one technology from a frame of resolved logical fields"""
+    lat, lon = valid_coordinates(pd.to_numeric(fields["LATITUDE"], errors="coerce"),
+                                 pd.to_numeric(fields["LONGITUDE"], errors="coerce"))
+    electrical = tilt_degrees(fields["Electrical Tilt"])
+    digital = tilt_degrees(fields["Digital Tilt"])
+    # Total downtilt: whichever parts are known
+    tilt = np.where(np.isnan(electrical) & np.isnan(digital), np.nan, np.nan_to_num(electrical) + np.nan_to_num(digital))
+    height = pd.to_numeric(fields["height(Meter)"], errors="coerce").to_numpy(dtype=float)
+    cell_range = range_km(fields["CELLRANGE"], tech)
+    table = pd.DataFrame({
+        "Tech": tech,
+        "Site": fields["Site"].to_numpy(dtype=object),
+        "cell": fields["cell"].to_numpy(dtype=object),
+        "lat": lat,
+        "lon": lon,
+        "azimuth": pd.to_numeric(fields["Azumuth"], errors="coerce").to_numpy(dtype=float),
+        "height_m": height,
+        "tilt_deg": tilt,
+        "range_km": cell_range,
+        "footprint_km": footprint_km(height, tilt, cell_range)
+    }, columns=GEOMETRY_COLUMNS)
+    return table[table["lat"].notna() & table["lon"].notna()].reset_index(drop=True)
+
+
+def dataset_geometry(dataset, techs=("LTE", "5GNR")):
+    """Geometry inputs for every cell of a NetworkDataset"""
+    parts = [geometry_table(tech, dataset.fields(tech, GEOMETRY_FIELDS))
+             for tech in techs if not dataset.frame(tech).empty]
+    return pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=GEOMETRY_COLUMNS)
+
+
+def frame_geometry(frames, mappings=MAPPINGS):
+    """Geometry inputs for raw {tech: dump frame} data"""
+    parts = [geometry_table(tech, logical_frame(df, tech, GEOMETRY_FIELDS, mappings=mappings))
+             for tech, df in frames.items() if tech in ("LTE", "5GNR") and df is not None and not df.empty]
+    return pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=GEOMETRY_COLUMNS)
+
+
+def destination(lat, lon, bearing_deg, distance_km):
+    """Vectorized great-circle destination point (degrees) from start, bearing and distance"""
+    lat1 = np.radians(lat)
+    lon1 = np.radians(lon)
+    bearing = np.radians(bearing_deg)
+    delta = np.asarray(distance_km, dtype=float) / EARTH_RADIUS_KM
+    lat2 = np.arcsin(np.sin(lat1) * np.cos(delta) + np.cos(lat1) * np.sin(delta) * np.cos(bearing))
+    lon2 = lon1 + np.arctan2(np.sin(bearing) * np.sin(delta) * np.cos(lat1),
+                             np.cos(delta) - np.sin(lat1) * np.sin(lat2))
+    return np.degrees(lat2), (np.degrees(lon2) + 540) % 360 - 180
+
+
+def sector_polygons(lat, lon, azimuth, radius_km, beamwidth=SECTOR_BEAMWIDTH_DEG, steps=SECTOR_ARC_STEPS):
+    """(n, steps + 3, 2) closed [lon, lat] rings: apex, arc of steps + 1 points, apex
+
+    Computed for all cells at once. Cells without an azimuth are omni:
+    their arc covers 360 degrees and the apex is replaced by the arc start,
+    so the ring is a plain circle.
+    """
+    lat = np.asarray(lat, dtype=float)
+    lon = np.asarray(lon, dtype=float)
+    azimuth = np.asarray(azimuth, dtype=float)
+    omni = ~np.isfinite(azimuth)
+    width = np.where(omni, 360.0, np.broadcast_to(np.asarray(beamwidth, dtype=float), lat.shape))
+    center = np.where(omni, 0.0, azimuth)
+    offsets = np.linspace(-0.5, 0.5, steps + 1)[None, :] * width[:, None]
+    arc_lat, arc_lon = destination(lat[:, None], lon[:, None], center[:, None] + offsets,
+                                   np.asarray(radius_km, dtype=float)[:, None] * np.ones_like(offsets))
+    apex_lat = np.where(omni, arc_lat[:, 0], lat)[:, None]
+    apex_lon = np.where(omni, arc_lon[:, 0], lon)[:, None]
+    ring_lat = np.concatenate((apex_lat, arc_lat, apex_lat), axis=1)
+    ring_lon = np.concatenate((apex_lon, arc_lon, apex_lon), axis=1)
+    return np.stack((ring_lon, ring_lat), axis=2)
+
+
+def geometry_polygons(table, beamwidth=SECTOR_BEAMWIDTH_DEG, steps=SECTOR_ARC_STEPS):
+    """Sector rings for a geometry table, out to each cell's footprint"""
+    return sector_polygons(table["lat"].to_numpy(dtype=float), table["lon"].to_numpy(dtype=float),
+                           table["azimuth"].to_numpy(dtype=float), table["footprint_km"].to_numpy(dtype=float),
+                           beamwidth, steps)
+
+
+def feature_properties(table):
+    """JSON-safe property dicts (NaN becomes null) for each geometry row"""
+    props = table[["Tech", "Site", "cell", "azimuth", "height_m", "tilt_deg", "range_km", "footprint_km"]]
+    props = props.astype(object).where(props.notna(), None)
+    return props.to_dict("records")
+
+
+def ring_text(polygons, point_format, separator):
+    """One coordinate string per ring, formatted from a single template per row"""
+    template = separator.join([point_format] * polygons.shape[1])
+    return [template.format(*row) for row in polygons.reshape(len(polygons), -1).tolist()]
+
+
+def sectors_geojson(table, polygons):
+    """GeoJSON FeatureCollection dict, for maps drawing a modest number of sectors"""
+    return {
+        "type": "FeatureCollection",
+        "features": [
+            {"type": "Feature", "properties": props, "geometry": {"type": "Polygon", "coordinates": [ring]}}
+            for props, ring in zip(feature_properties(table), np.round(polygons, 6).tolist())
+        ]
+    }
+
+
+def write_geojson(table, polygons, file_path):
+    """Write sectors as a GeoJSON FeatureCollection, one Polygon per sector
+
+    Features are written as text rather than through one huge dict, which
+    keeps 500k sectors to seconds.
+    """
+    rings = ring_text(polygons, "[{:.6f},{:.6f}]", ",")
+    with open(file_path, "w", encoding="utf-8") as f:
+        f.write('{"type":"FeatureCollection","features":[\n')
+        f.write(",\n".join(
+            f'{{"type":"Feature","properties":{json.dumps(props, separators=(",", ":"))},'
+            f'"geometry":{{"type":"Polygon","coordinates":[[{ring}]]}}}}'
+            for props, ring in zip(feature_properties(table), rings)
+        ))
+        f.write("\n]}\n")
+
+
+def write_kml(table, polygons, file_path):
+    """Write sectors as KML placemarks, one folder per technology"""
+    rings = ring_text(polygons, "{:.6f},{:.6f}", " ")
+    names = [escape(str(cell or site)) for cell, site in zip(table["cell"], table["Site"])]
+    techs = table["Tech"].to_numpy()
+    with open(file_path, "w", encoding="utf-8") as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n<kml xmlns="http://www.opengis.net/kml/2.2"><Document>\n')
+        f.write('<Style id="LTE"><LineStyle><color>ff1e78e6</color></LineStyle>'
+                '<PolyStyle><color>801e78e6</color></PolyStyle></Style>\n')
+        f.write('<Style id="5GNR"><LineStyle><color>ffc83c78</color></LineStyle>'
+                '<PolyStyle><color>80c83c78</color></PolyStyle></Style>\n')
+        for tech in ("LTE", "5GNR"):
+            rows = np.flatnonzero(techs == tech)
+            if not len(rows):
+                continue
+            f.write(f"<Folder><name>{tech}</name>\n")
+            f.writelines(
+                f"<Placemark><name>{names[i]}</name><styleUrl>#{tech}</styleUrl><Polygon><outerBoundaryIs>"
+                f"<LinearRing><coordinates>{rings[i]}</coordinates></LinearRing></outerBoundaryIs></Polygon></Placemark>\n"
+                for i in rows
+            )
+            f.write("</Folder>\n")
+        f.write("</Document></kml>\n")
+
+
+def write_sector_geometry(table, file_path, beamwidth=SECTOR_BEAMWIDTH_DEG, steps=SECTOR_ARC_STEPS):
+    """Write sector footprints as .kml or .geojson/.json depending on the extension; returns the sector count"""
+    directory = os.path.dirname(file_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    polygons = geometry_polygons(table, beamwidth, steps)
+    if str(file_path).lower().endswith(".kml"):
+        write_kml(table, polygons, file_path)
+    else:
+        write_geojson(table, polygons, file_path)
+    return len(table)
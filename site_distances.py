@@ -0,0 +1,105 @@
+import numpy as np
+import pandas as pd
+
+from network_data import valid_coordinates
+from neighbours import site_table
+from spatial_index import SpatialIndex
+
+NEAREST_SITE_COLUMNS = ["Site", "LATITUDE", "LONGITUDE", "Nearest Site", "Distance (km)"]
+SITE_PAIR_COLUMNS = ["Site", "Other Site", "Distance (km)"]
+# First pair search radius; sites with nobody this close are searched again further out
+NEAREST_START_KM = 5.0
+NEAREST_MAX_KM = 1000.0
+
+
+def site_points(sites, lat, lon):
+    """(site, lat, lon) tuples, one per site at the mean position of its cells"""
+    lat, lon = valid_coordinates(lat, lon)
+    table = site_table(sites, lat, lon)
+    return list(zip(table.index, table["lat"], table["lon"]))
+
+
+def nearest_sites(lat, lon, start_km=NEAREST_START_KM, max_km=NEAREST_MAX_KM):
+    """Index of and distance to the nearest other point for every point
+
+    All pairs within start_km come from one spatial-index pass; only points
+    left without a neighbour are searched again with a growing radius.
+    Points with nobody within max_km get -1 and NaN.
+    """
+    lat = np.asarray(lat, dtype=float)
+    lon = np.asarray(lon, dtype=float)
+    nearest = np.full(len(lat), -1, dtype=np.int64)
+    distance = np.full(len(lat), np.inf)
+    if len(lat) < 2:
+        return nearest, np.full(len(lat), np.nan)
+
+    index = SpatialIndex(lat, lon, start_km)
+    i, j, d = index.pairs_within(start_km)
+    first = np.concatenate((i, j))
+    second = np.concatenate((j, i))
+    dist = np.concatenate((d, d))
+    # Closest pair per point: sort by (point, distance) and keep each point's first row
+    order = np.lexsort((dist, first))
+    points, firsts = np.unique(first[order], return_index=True)
+    nearest[points] = second[order][firsts]
+    distance[points] = dist[order][firsts]
+
+    km = start_km
+    remaining = np.flatnonzero(nearest < 0)
+    while len(remaining) and km < max_km:
+        # Grid cells as large as the radius keep each lookup to 27 cubes
+        km = min(km * 2, max_km)
+        wide = SpatialIndex(lat, lon, km)
+        for k in remaining:
+            found, distances = wide.query_radius(lat[k], lon[k], km)
+            keep = found != k
+            if keep.any():
+                nearest[k] = found[keep][0]
+                distance[k] = distances[keep][0]
+        remaining = np.flatnonzero(nearest < 0)
+    distance[nearest < 0] = np.nan
+    return nearest, distance
+
+
+def nearest_site_table(points):
+    """Nearest other site for each (site, lat, lon) point"""
+    names = np.array([p[0] for p in points], dtype=object)
+    lat = np.array([p[1] for p in points], dtype=float)
+    lon = np.array([p[2] for p in points], dtype=float)
+    nearest, distance = nearest_sites(lat, lon)
+    return pd.DataFrame({
+        "Site": names,
+        "LATITUDE": lat,
+        "LONGITUDE": lon,
+        "Nearest Site": np.where(nearest >= 0, names[np.maximum(nearest, 0)], ""),
+        "Distance (km)": np.round(distance, 4)
+    }, columns=NEAREST_SITE_COLUMNS)
+
+
+def distance_stats(distances):
+    """Count, min, mean, median, 90th percentile and max of inter-site distances (km)"""
+    distances = np.asarray(distances, dtype=float)
+    distances = distances[np.isfinite(distances)]
+    if len(distances) == 0:
+        return {"count": 0}
+    return {
+        "count": len(distances),
+        "min": float(distances.min()),
+        "mean": float(distances.mean()),
+        "median": float(np.median(distances)),
+        "p90": float(np.percentile(distances, 90)),
+        "max": float(distances.max())
+    }
+
+
+def site_pair_table(points, max_km=10.0):
+    """Every pair of sites within max_km, nearest first (both directions listed once)"""
+    names = np.array([p[0] for p in points], dtype=object)
+    lat = np.array([p[1] for p in points], dtype=float)
+    lon = np.array([p[2] for p in points], dtype=float)
+    if len(points) < 2:
+        return pd.DataFrame(columns=SITE_PAIR_COLUMNS)
+    i, j, d = SpatialIndex(lat, lon, max_km).pairs_within(max_km)
+    table = pd.DataFrame({"Site": names[i], "Other Site": names[j], "Distance (km)": np.round(d, 4)},
+                         columns=SITE_PAIR_COLUMNS)
+    return table.sort_values(["Distance (km)", "Site"], kind="stable").reset_index(drop=True)
@@ -0,0 +1,186 @@
+import io
+
+import numpy as np
+import pandas as pd
+from PIL import Image, ImageDraw
+
+from network_data import MAPPINGS, logical_frame, valid_coordinates
+from sector_geometry import range_km, geometry_polygons
+
+SECTOR_COLUMNS = ["Tech", "Site", "lat", "lon", "azimuth", "range_km"]
+PLOT_SIZE = (1200, 900)
+PLOT_MARGIN = 0.05
+PLOT_BEAMWIDTH_DEG = 65.0
+# Wedge length on screen: the cell range, clipped so dense areas stay readable
+WEDGE_MIN_PX = 6
+WEDGE_MAX_PX = 40
+WEDGE_STEPS = 6
+SITE_LABEL_LIMIT = 400
+TECH_COLORS = {"LTE": (230, 120, 30, 140), "5GNR": (120, 60, 200, 140)}
+PATH_COLOR = (220, 0, 0, 255)
+MASTER_COLOR = (0, 90, 220, 255)
+
+
+def sector_table(tech, sites, lat, lon, azimuth, cell_range):
+    """Plot rows for one technology's cells, dropping cells without a usable position"""
+    lat, lon = valid_coordinates(lat, lon)
+    sectors = pd.DataFrame({
+        "Tech": tech,
+        "Site": np.asarray(sites, dtype=object),
+        "lat": lat,
+        "lon": lon,
+        "azimuth": pd.to_numeric(pd.Series(azimuth), errors="coerce").to_numpy(dtype=float),
+        "range_km": range_km(cell_range, tech)
+    }, columns=SECTOR_COLUMNS)
+    return sectors[sectors["lat"].notna() & sectors["lon"].notna()].reset_index(drop=True)
+
+
+def dataset_sectors(dataset):
+    """Plot rows for every LTE and 5GNR cell of a NetworkDataset"""
+    parts = []
+    for tech in ("LTE", "5GNR"):
+        if dataset.frame(tech).empty:
+            continue
+        lat, lon = dataset.coordinates(tech)
+        parts.append(sector_table(tech, dataset.field(tech, "Site"), lat, lon,
+                                  dataset.field(tech, "Azumuth"), dataset.field(tech, "CELLRANGE")))
+    return pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=SECTOR_COLUMNS)
+
+
+def frame_sectors(frames, mappings=MAPPINGS):
+    """Plot rows for raw {tech: dump frame} data"""
+    parts = []
+    for tech in ("LTE", "5GNR"):
+        df = frames.get(tech)
+        if df is None or df.empty:
+            continue
+        fields = logical_frame(df, tech, ["Site", "LATITUDE", "LONGITUDE", "Azumuth", "CELLRANGE"], mappings=mappings)
+        parts.append(sector_table(tech, fields["Site"], fields["LATITUDE"], fields["LONGITUDE"],
+                                  fields["Azumuth"], fields["CELLRANGE"]))
+    return pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=SECTOR_COLUMNS)
+
+
+class Projection:
+    """Equirectangular lat/lon -> pixel mapping fitted to a bounding box"""
+
+    def __init__(self, min_lat, max_lat, min_lon, max_lon, size=PLOT_SIZE, margin=PLOT_MARGIN):
+        width, height = size
+        # Degenerate boxes (one point) still get a small visible area
+        lat_span = max(max_lat - min_lat, 0.01)
+        lon_span = max(max_lon - min_lon, 0.01)
+        self.center_lat = (min_lat + max_lat) / 2
+        self.center_lon = (min_lon + max_lon) / 2
+        self.x_scale = np.cos(np.radians(self.center_lat))
+        usable = 1 - 2 * margin
+        self.px_per_deg = min(width * usable / (lon_span * self.x_scale), height * usable / lat_span)
+        self.px_per_km = self.px_per_deg / 111.32
+        self.width, self.height = width, height
+
+    def __call__(self, lat, lon):
+        """(x, y) pixel arrays for latitude/longitude arrays"""
+        x = self.width / 2 + (np.asarray(lon, dtype=float) - self.center_lon) * self.x_scale * self.px_per_deg
+        y = self.height / 2 - (np.asarray(lat, dtype=float) - self.center_lat) * self.px_per_deg
+        return x, y
+
+    @classmethod
+    def fit(cls, lat, lon, size=PLOT_SIZE, margin=PLOT_MARGIN):
+        """Projection covering every finite position"""
+        lat = np.asarray(lat, dtype=float)
+        lon = np.asarray(lon, dtype=float)
+        ok = np.isfinite(lat) & np.isfinite(lon)
+        if not ok.any():
+            raise ValueError("No valid coordinates to plot")
+        return cls(lat[ok].min(), lat[ok].max(), lon[ok].min(), lon[ok].max(), size, margin)
+
+
+def wedge_polygons(x, y, azimuth, radius, beamwidth=PLOT_BEAMWIDTH_DEG, steps=WEDGE_STEPS):
+    """(n, steps + 2, 2) pixel polygons: apex then an arc of steps + 1 points around each azimuth"""
+    offsets = np.linspace(-beamwidth / 2, beamwidth / 2, steps + 1)
+    angles = np.radians(np.asarray(azimuth, dtype=float)[:, None] + offsets[None, :])
+    radius = np.asarray(radius, dtype=float)[:, None]
+    arc_x = np.asarray(x, dtype=float)[:, None] + radius * np.sin(angles)
+    # Pixel y grows downwards, so north is -y
+    arc_y = np.asarray(y, dtype=float)[:, None] - radius * np.cos(angles)
+    apex = np.stack((x, y), axis=1)[:, None, :]
+    return np.concatenate((apex, np.stack((arc_x, arc_y), axis=2)), axis=1)
+
+
+def render_site_plot(sectors, points=None, master_point=None, size=PLOT_SIZE, beamwidth=PLOT_BEAMWIDTH_DEG,
+                     label_sites=True, footprints=None):
+    """Offline PNG-ready image of sector wedges, site labels and the Distance tab's path
+
+    With points the view is fitted to them (sectors outside are dropped);
+    otherwise it covers every sector. The path joins the points in order and
+    thin lines run from the master point to every other point. footprints
+    (a sector_geometry table) adds true-scale footprint outlines.
+    """
+    points = list(points or [])
+    point_lat = np.array([p[1] for p in points], dtype=float)
+    point_lon = np.array([p[2] for p in points], dtype=float)
+    if len(points):
+        projection = Projection.fit(point_lat, point_lon, size)
+    else:
+        projection = Projection.fit(sectors["lat"], sectors["lon"], size)
+
+    image = Image.new("RGBA", size, (255, 255, 255, 255))
+    overlay = Image.new("RGBA", size, (0, 0, 0, 0))
+    draw = ImageDraw.Draw(overlay)
+
+    x, y = projection(sectors["lat"].to_numpy(dtype=float), sectors["lon"].to_numpy(dtype=float))
+    visible = (x >= -WEDGE_MAX_PX) & (x <= size[0] + WEDGE_MAX_PX) & (y >= -WEDGE_MAX_PX) & (y <= size[1] + WEDGE_MAX_PX)
+    shown = sectors[visible]
+    x, y = x[visible], y[visible]
+    radius = np.clip(shown["range_km"].to_numpy(dtype=float) * projection.px_per_km, WEDGE_MIN_PX, WEDGE_MAX_PX)
+    radius = np.where(np.isfinite(radius), radius, WEDGE_MIN_PX)
+    azimuth = shown["azimuth"].to_numpy(dtype=float)
+    has_azimuth = np.isfinite(azimuth)
+
+    polygons = wedge_polygons(x[has_azimuth], y[has_azimuth], azimuth[has_azimuth], radius[has_azimuth], beamwidth)
+    techs = shown["Tech"].to_numpy()[has_azimuth]
+    for tech, color in TECH_COLORS.items():
+        outline = color[:3] + (255,)
+        for polygon in polygons[techs == tech]:
+            draw.polygon([tuple(p) for p in polygon], fill=color, outline=outline)
+    # Cells without an azimuth (omni or unknown) are drawn as dots
+    for cx, cy in zip(x[~has_azimuth], y[~has_azimuth]):
+        draw.ellipse((cx - 3, cy - 3, cx + 3, cy + 3), fill=(90, 90, 90, 200))
+    if footprints is not None and len(footprints):
+        rings = geometry_polygons(footprints, beamwidth)
+        ring_x, ring_y = projection(rings[:, :, 1], rings[:, :, 0])
+        inside = ((ring_x.max(axis=1) >= 0) & (ring_x.min(axis=1) <= size[0]) &
+                  (ring_y.max(axis=1) >= 0) & (ring_y.min(axis=1) <= size[1]))
+        ring_techs = footprints["Tech"].to_numpy()
+        for ring in np.flatnonzero(inside):
+            color = TECH_COLORS.get(ring_techs[ring], (90, 90, 90, 140))[:3] + (255,)
+            draw.line(list(zip(ring_x[ring], ring_y[ring])), fill=color, width=1)
+    image = Image.alpha_composite(image, overlay)
+    draw = ImageDraw.Draw(image)
+
+    if label_sites and len(shown):
+        site_xy = pd.DataFrame({"Site": shown["Site"].to_numpy(), "x": x, "y": y})
+        site_xy = site_xy[site_xy["Site"] != ""].groupby("Site", sort=False)[["x", "y"]].mean()
+        if len(site_xy) <= SITE_LABEL_LIMIT:
+            for site, (sx, sy) in zip(site_xy.index, site_xy.to_numpy()):
+                draw.text((sx + 4, sy + 4), str(site), fill=(40, 40, 40))
+
+    if len(points):
+        px, py = projection(point_lat, point_lon)
+        if master_point:
+            mx, my = projection(master_point[1], master_point[2])
+            for tx, ty in zip(px, py):
+                draw.line((float(mx), float(my), tx, ty), fill=MASTER_COLOR, width=1)
+        if len(points) > 1:
+            draw.line(list(zip(px, py)), fill=PATH_COLOR, width=3)
+        for i, ((name, _, _), tx, ty) in enumerate(zip(points, px, py)):
+            is_master = master_point and tuple(points[i]) == tuple(master_point)
+            color = MASTER_COLOR if is_master else PATH_COLOR
+            draw.ellipse((tx - 5, ty - 5, tx + 5, ty + 5), fill=color, outline=(0, 0, 0))
+            draw.text((tx + 7, ty - 12), f"{i + 1}: {name}", fill=(0, 0, 0))
+    return image.convert("RGB")
+
+
+def plot_png_bytes(image):
+    """PNG bytes of a rendered plot"""
+    output = io.BytesIO()
+    image.save(output, format="PNG", optimize=False)
+    return output.getvalue()
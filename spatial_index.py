@@ -0,0 +1,146 @@
+import numpy as np
+
+from network_data import haversine_km
+
+EARTH_RADIUS_KM = 6371.0
+MIN_CELL_KM = 0.05
+# Radius queries reaching further than this many cubes scan every point instead
+MAX_QUERY_REACH = 2
+
+# The 27 neighbouring grid cells (including the cell itself)
+_OFFSETS = np.array([(dx, dy, dz) for dx in (-1, 0, 1) for dy in (-1, 0, 1) for dz in (-1, 0, 1)])
+
+
+def to_unit_vectors(lat, lon):
+    """Latitude/longitude in degrees to points on the unit sphere"""
+    lat = np.radians(np.asarray(lat, dtype=float))
+    lon = np.radians(np.asarray(lon, dtype=float))
+    cos_lat = np.cos(lat)
+    return np.column_stack((cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)))
+
+
+class SpatialIndex:
+    """Uniform 3D grid over the unit sphere for radius and pair queries
+
+    Points are hashed into cubes whose edge equals cell_km, so every point
+    within cell_km of another lies in one of the 27 surrounding cubes.
+    Cube keys are sorted once; lookups are a searchsorted per cube, which
+    keeps pair searches at O(n log n + matches) instead of O(n^2).
+    """
+
+    def __init__(self, lat, lon, cell_km=5.0):
+        self.lat = np.asarray(lat, dtype=float)
+        self.lon = np.asarray(lon, dtype=float)
+        self.cell_km = max(float(cell_km), MIN_CELL_KM)
+        self.cell = self.cell_km / EARTH_RADIUS_KM
+        self.span = int(np.ceil(2 / self.cell)) + 3
+
+        valid = np.isfinite(self.lat) & np.isfinite(self.lon)
+        self.positions = np.flatnonzero(valid)
+        coords = self._grid(to_unit_vectors(self.lat[valid], self.lon[valid]))
+        keys = self._keys(coords)
+        order = np.argsort(keys, kind="stable")
+        self.sorted_keys = keys[order]
+        self.sorted_positions = self.positions[order]
+        self.sorted_coords = coords[order]
+
+    def __len__(self):
+        return len(self.positions)
+
+    def _grid(self, xyz):
+        return np.floor(xyz / self.cell).astype(np.int64)
+
+    def _keys(self, coords):
+        shifted = coords + self.span // 2
+        return (shifted[:, 0] * self.span + shifted[:, 1]) * self.span + shifted[:, 2]
+
+    def query_radius(self, lat, lon, km):
+        """Positions within km of a point and their distances, nearest first
+
+        The cube lookups grow with (km / cell_km) cubed, so wide radii fall
+        back to one vectorized distance over every point.
+        """
+        reach = int(np.ceil(km / self.cell_km))
+        if reach > MAX_QUERY_REACH:
+            candidates = self.positions
+        else:
+            steps = np.arange(-reach, reach + 1)
+            offsets = np.array(np.meshgrid(steps, steps, steps, indexing="ij")).reshape(3, -1).T
+            keys = self._keys(self._grid(to_unit_vectors([lat], [lon])) + offsets)
+            lo = np.searchsorted(self.sorted_keys, keys, side="left")
+            hi = np.searchsorted(self.sorted_keys, keys, side="right")
+            candidates = np.concatenate([self.sorted_positions[a:b] for a, b in zip(lo, hi)])
+        candidates = np.asarray(candidates, dtype=np.int64)
+        distances = haversine_km(lat, lon, self.lat[candidates], self.lon[candidates])
+        keep = distances <= km
+        candidates, distances = candidates[keep], distances[keep]
+        order = np.argsort(distances, kind="stable")
+        return candidates[order], distances[order]
+
+    def pairs_within(self, km=None):
+        """All position pairs (i < j) within km of each other, with distances
+
+        km defaults to cell_km and may not exceed it.
+        """
+        km = self.cell_km if km is None else min(float(km), self.cell_km)
+        if len(self) < 2:
+            empty = np.array([], dtype=np.int64)
+            return empty, empty, np.array([], dtype=float)
+        n = len(self.sorted_keys)
+        rows = np.arange(n)
+        firsts, seconds = [], []
+        for offset in _OFFSETS:
+            keys = self._keys(self.sorted_coords + offset)
+            lo = np.searchsorted(self.sorted_keys, keys, side="left")
+            hi = np.searchsorted(self.sorted_keys, keys, side="right")
+            counts = hi - lo
+            total = counts.sum()
+            if total == 0:
+                continue
+            # Expand each row's [lo, hi) range without a Python loop
+            first = np.repeat(rows, counts)
+            starts = np.repeat(lo - np.concatenate(([0], np.cumsum(counts)[:-1])), counts)
+            second = starts + np.arange(total)
+            keep = first < second
+            firsts.append(first[keep])
+            seconds.append(second[keep])
+        first = np.concatenate(firsts)
+        second = np.concatenate(seconds)
+        i = self.sorted_positions[first]
+        j = self.sorted_positions[second]
+        distances = haversine_km(self.lat[i], self.lon[i], self.lat[j], self.lon[j])
+        keep = distances <= km
+        return i[keep], j[keep], distances[keep]
+
+    def pairs_from(self, positions, km=None):
+        """Pairs (i, j) with i from positions and j any other indexed point within km, with distances
+
+        Like pairs_within but one-sided: every neighbour of each given point
+        is listed, so a subset of points can be searched without pairing up
+        the whole index. km defaults to cell_km and may not exceed it.
+        """
+        km = self.cell_km if km is None else min(float(km), self.cell_km)
+        positions = np.asarray(positions, dtype=np.int64)
+        positions = positions[np.isfinite(self.lat[positions]) & np.isfinite(self.lon[positions])]
+        coords = self._grid(to_unit_vectors(self.lat[positions], self.lon[positions]))
+        rows = np.arange(len(positions))
+        firsts, seconds = [np.array([], dtype=np.int64)], [np.array([], dtype=np.int64)]
+        for offset in _OFFSETS:
+            keys = self._keys(coords + offset)
+            lo = np.searchsorted(self.sorted_keys, keys, side="left")
+            hi = np.searchsorted(self.sorted_keys, keys, side="right")
+            counts = hi - lo
+            total = counts.sum()
+            if total == 0:
+                continue
+            first = np.repeat(rows, counts)
+            starts = np.repeat(lo - np.concatenate(([0], np.cumsum(counts)[:-1])), counts)
+            firsts.append(positions[first])
+            seconds.append(self.sorted_positions[starts + np.arange(total)])
+        i = np.concatenate(firsts)
+        j = np.concatenate(seconds)
+        keep = i != j
+        i, j = i[keep], j[keep]
+        distances = haversine_km(self.lat[i], self.lon[i], self.lat[j], self.lon[j])
+        keep = distances <= km
+        return i[keep], j[keep], distances[keep]
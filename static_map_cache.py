@@ -0,0 +1,187 @@
+import os
+import json
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+STATIC_MAP_URL = "https://maps.googleapis.com/maps/api/staticmap"
+STATIC_MAP_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".network_search", "static_maps")
+STATIC_MAP_CACHE_BYTES = 200 * 1024 * 1024
+# (connect, read) seconds
+STATIC_MAP_TIMEOUT = (5, 30)
+STATIC_MAP_WORKERS = 4
+
+
+def static_map_params(points, master_point=None, zoom=12, maptype="roadmap", size="800x600", scale=2):
+    """Normalized static map request parameters (without the API key) as (name, value) pairs
+
+    Coordinates are rounded to 6 decimals so equal point sets always give
+    the same parameters, and hence the same cache key.
+    """
+    params = [("size", str(size)), ("maptype", str(maptype)), ("zoom", str(int(zoom))), ("scale", str(int(scale)))]
+    for i, (name, lat, lon) in enumerate(points):
+        color = "blue" if master_point and (name, lat, lon) == tuple(master_point) else "red"
+        label = f"|label:{chr(65 + i)}" if i < 26 else ""
+        params.append(("markers", f"color:{color}{label}|{float(lat):.6f},{float(lon):.6f}"))
+    if len(points) > 1:
+        path = "|".join(f"{float(lat):.6f},{float(lon):.6f}" for _, lat, lon in points)
+        params.append(("path", f"color:0xff0000|weight:5|{path}"))
+    return params
+
+
+def cache_key(params):
+    """sha256 hex digest of the normalized request parameters"""
+    return hashlib.sha256(json.dumps([list(p) for p in params]).encode("utf-8")).hexdigest()
+
+
+class StaticMapCache:
+    """Static map images cached on disk as an LRU bounded by total bytes
+
+    fetcher(url, params) returns the image bytes; the default uses one pooled
+    requests.Session, and a stand-in can be passed for offline use or tests.
+    """
+
+    def __init__(self, api_key=None, directory=STATIC_MAP_CACHE_DIR, max_bytes=STATIC_MAP_CACHE_BYTES,
+                 base_url=STATIC_MAP_URL, fetcher=None, timeout=STATIC_MAP_TIMEOUT, workers=STATIC_MAP_WORKERS):
+        self.api_key = api_key
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.base_url = base_url
+        self.fetcher = fetcher or self.http_fetch
+        self.timeout = timeout
+        self.workers = workers
+        self._session = None
+        self._executor = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def session(self):
+        """Shared requests.Session with a connection pool sized for the prefetch workers"""
+        with self._lock:
+            if self._session is None:
+                self._session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=self.workers, pool_maxsize=self.workers)
+                self._session.mount("https://", adapter)
+                self._session.mount("http://", adapter)
+            return self._session
+
+    def http_fetch(self, url, params):
+        """Download one image; raises with the service's message on a non-200 reply"""
+        query = list(params) + ([("key", self.api_key)] if self.api_key else [])
+        response = self.session().get(url, params=query, timeout=self.timeout)
+        if response.status_code != 200:
+            error_details = response.text
+            if len(error_details) > 200:
+                error_details = error_details[:200] + "..."
+            raise Exception(f"Google Maps API returned {response.status_code}: {error_details}")
+        return response.content
+
+    def path_for(self, key):
+        """File holding the image for a cache key"""
+        return os.path.join(self.directory, f"{key}.png")
+
+    def get(self, params):
+        """Image bytes for the parameters, from disk when cached, fetched and stored otherwise"""
+        path = self.path_for(cache_key(params))
+        try:
+            with open(path, "rb") as f:
+                content = f.read()
+            # The modification time is the LRU position
+            os.utime(path, None)
+            with self._lock:
+                self.hits += 1
+            return content
+        except FileNotFoundError:
+            pass
+        with self._lock:
+            self.misses += 1
+        content = self.fetcher(self.base_url, params)
+        # The directory is only created once there is something to keep
+        os.makedirs(self.directory, exist_ok=True)
+        # Write then rename so a concurrent reader never sees a partial image
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(content)
+        os.replace(temp_path, path)
+        self.evict()
+        return content
+
+    def prefetch(self, params_list):
+        """Fetch several images concurrently in the background; returns their futures"""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="static-map")
+        futures = [self._executor.submit(self.get, params) for params in params_list]
+        for future in futures:
+            future.add_done_callback(self._log_failure)
+        return futures
+
+    @staticmethod
+    def _log_failure(future):
+        """Prefetch errors are logged; the foreground request reports its own"""
+        if future.exception() is not None:
+            logging.error(f"Static map prefetch failed: {future.exception()}")
+
+    def entries(self):
+        """(mtime, size, path) for every cached image, oldest first"""
+        entries = []
+        if not os.path.isdir(self.directory):
+            return entries
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".png"):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return sorted(entries)
+
+    def evict(self):
+        """Delete least recently used images until the cache fits in max_bytes"""
+        with self._lock:
+            entries = self.entries()
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
+                self.evictions += 1
+
+    def clear(self):
+        """Delete every cached image (statistics are kept)"""
+        with self._lock:
+            for _, _, path in self.entries():
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+
+    def stats(self):
+        """Return a snapshot of cache statistics"""
+        entries = self.entries()
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(entries),
+                "bytes": sum(size for _, size, _ in entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": (self.hits / lookups) if lookups else 0.0
+            }
+
+    def format_stats(self):
+        """One-line summary for status panels"""
+        s = self.stats()
+        return (f"Map cache: {s['hits']} hits / {s['misses']} misses ({s['hit_rate'] * 100:.1f}% hit rate), "
+                f"{s['entries']} images, {s['bytes'] / (1024 * 1024):.1f} MB")
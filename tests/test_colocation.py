@@ -0,0 +1,52 @@
+import pandas as pd
+
+from colocation import dataset_colocation, counterpart_records
+from network_data import NetworkDataset
+
+
+def dataset():
+    lte = pd.DataFrame({
+        "MECONTEXT_ID": ["L1", "L1", "L2", "L3"],
+        "EUTRAN_CELL_FDD_ID": ["L1_1", "L1_2", "L2_1", "L3_1"],
+        "USID": ["100", "100", "0200", "X9"],
+        "LATITUDE": ["40.0", "40.0", "41.0", "42.0"],
+        "LONGITUDE": ["-75.0", "-75.0", "-75.0", "-75.0"]
+    })
+    nr = pd.DataFrame({
+        "GNB_NAME": ["N1", "N2", "N3", "N4"],
+        "NRCELLDUID": ["N1_1", "N2_1", "N3_1", "N4_1"],
+        "USID": ["", "200.0", "X9", ""],
+        "DSS_LTECELL": ["L1_2", "", "", ""],
+        "LATITUDE": ["40.0003", "43.0", "44.0", "45.0"],
+        "LONGITUDE": ["-75.0", "-75.0", "-75.0", "-75.0"]
+    })
+    data = NetworkDataset()
+    data.set_frames(lte, nr)
+    return data
+
+
+def test_pairs_carry_every_kind_of_evidence():
+    pairs = dataset_colocation(dataset()).pairs
+    assert pairs[["LTE Site", "NR Site", "Match"]].values.tolist() == [
+        ["L1", "N1", "DSS, Coordinates"],
+        ["L2", "N2", "USID"],
+        ["L3", "N3", "USID"]
+    ]
+    assert pairs["Distance (km)"].iloc[0] < 0.1
+
+
+def test_lookups_in_both_directions():
+    index = dataset_colocation(dataset())
+    assert len(index) == 3
+    assert index.partners("LTE", "L2") == ["N2"]
+    assert index.partners("5GNR", "N1") == ["L1"]
+    assert index.partners("LTE", "missing") == []
+    assert index.counterparts("5GNR", ["N1", "N3", "N4"]) == ["L1", "L3"]
+    assert index.vdt_pairs(["L1", "L2"], ["N1", "N4"]) == [("L1", "N1"), ("L2", ""), ("", "N4")]
+
+
+def test_counterpart_records_adds_the_other_technology():
+    data = dataset()
+    records = [("LTE", row) for _, row in data.frame("LTE").iloc[[2]].iterrows()]
+    added = counterpart_records(data, dataset_colocation(data), records)
+    assert [(tech, row["GNB_NAME"]) for tech, row in added] == [("5GNR", "N2")]
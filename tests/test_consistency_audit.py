@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+
+from consistency_audit import audit_consistency, column_pairs, compare_values
+from network_data import NetworkDataset
+
+
+def lte_frame():
+    return pd.DataFrame({
+        "MECONTEXT_ID": ["S1", "S1", "S2", "S3"],
+        "EUTRAN_CELL_FDD_ID": ["C1", "C2", "C3", "C4"],
+        "ED_MARKET": ["East", "East", "East", "West"],
+        "PHYSICALLAYERCELLID": ["10", "11", "12", ""],
+        "Atoll_PCI": ["10", "21", "12", "7"],
+        "AZIMUTH": ["359", "90", "180", "0"],
+        "ATOLL_AZIMUTH": ["2", "100", "", "0"]
+    })
+
+
+def test_only_fields_with_both_sources_are_paired():
+    assert column_pairs(lte_frame().columns, "LTE") == {
+        "Azumuth": (["AZIMUTH"], ["ATOLL_AZIMUTH"]),
+        "PCI": (["PHYSICALLAYERCELLID"], ["Atoll_PCI"])
+    }
+
+
+def test_numeric_tolerance_wraps_angles_and_text_ignores_case():
+    mismatch, diff = compare_values("Azumuth", np.array(["359", "90"]), np.array(["2", "100"]))
+    assert mismatch.tolist() == [False, True]
+    assert diff.tolist() == [3.0, 10.0]
+    mismatch, diff = compare_values("PCI", np.array(["Ab", "x"]), np.array(["aB", "y"]))
+    assert mismatch.tolist() == [False, True]
+    assert np.isnan(diff).all()
+
+
+def test_mismatches_and_market_summary():
+    data = NetworkDataset()
+    data.set_frames(lte_frame(), pd.DataFrame())
+    mismatches, summary = audit_consistency(data)
+    assert mismatches[["Cell", "Field", "OSS Value", "Atoll Value", "Difference"]].values.tolist() == [
+        ["C2", "Azumuth", "90", "100", 10.0],
+        ["C2", "PCI", "11", "21", 10.0]
+    ]
+    counts = summary.set_index(["Market", "Field"])
+    assert counts.loc[("East", "Azumuth"), ["Compared", "Mismatches", "Missing in Atoll"]].tolist() == [2, 1, 1]
+    assert counts.loc[("East", "PCI"), "Mismatch %"] == 33.33
+    assert counts.loc[("West", "PCI"), "Missing in OSS"] == 1
+    assert np.isnan(counts.loc[("West", "PCI"), "Mismatch %"])
+
+
+def test_dump_without_atoll_columns_has_nothing_to_compare():
+    data = NetworkDataset()
+    data.set_frames(lte_frame().drop(columns=["Atoll_PCI", "ATOLL_AZIMUTH"]), pd.DataFrame())
+    mismatches, summary = audit_consistency(data)
+    assert mismatches.empty and summary.empty
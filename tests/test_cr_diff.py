@@ -0,0 +1,55 @@
+import openpyxl
+import pandas as pd
+import pytest
+
+from network_data import NetworkDataset
+from cr_diff import build_plan_crs, split_plan, write_diff_workbook
+
+
+def dataset():
+    lte = pd.DataFrame({
+        "MECONTEXT_ID": ["S1", "S1", "S2"],
+        "EUTRAN_CELL_FDD_ID": ["A1", "A2", "B1"],
+        "ED_MARKET": ["East", "East", "West"],
+        "CRSGAIN": ["3", "0", "0"],
+        "CELLRANGE": ["15", "15", "30"]
+    })
+    nr = pd.DataFrame({
+        "GNB_NAME": ["N1"], "NRCELLDUID": ["N1_1"], "ED_MARKET": ["East"], "CELLRANGE": ["5000"]
+    })
+    data = NetworkDataset()
+    data.set_frames(lte, nr)
+    return data
+
+
+def test_split_plan_by_tech_column_or_key_column():
+    mixed = pd.DataFrame({"Tech": ["4G", "NR"], "CELL": ["A1", "N1_1"]})
+    assert [tech for tech, _ in split_plan(mixed)] == ["LTE", "5GNR"]
+    assert split_plan(pd.DataFrame({"NRCELLDUID": ["N1_1"]}))[0][0] == "5GNR"
+    with pytest.raises(ValueError):
+        split_plan(pd.DataFrame({"Name": ["A1"]}))
+
+
+def test_only_changed_parameters_become_crs():
+    plan = pd.DataFrame({
+        "EUTRAN_CELL_FDD_ID": ["A1", "A2", "B1", "ZZ"],
+        "crsGain": ["3.0", "3", "", "3"],
+        "CELLRANGE": ["15", "20", "30", "10"]
+    })
+    crs, summary = build_plan_crs(dataset(), [plan])
+    assert [tuple(row) for row in crs[["MO Class", "Parameter", "Value", "CurrentValue"]].values] == [
+        ("EUtranCellFDD=A2", "cellRange", "20", "15"),
+        ("EUtranCellFDD=A2", "crsGain", "3", "0")
+    ]
+    summary = summary.set_index("Parameter")
+    assert summary.loc["crsGain", ["Planned", "Not Found", "Unchanged", "Changes"]].tolist() == [3, 1, 1, 1]
+    assert summary.loc["cellRange", ["Planned", "Not Found", "Unchanged", "Changes"]].tolist() == [4, 1, 2, 1]
+
+
+def test_diff_workbook_has_a_sheet_per_tech_and_a_summary(tmp_path):
+    plan = pd.DataFrame({"Tech": ["LTE", "5GNR"], "CELL": ["A1", "N1_1"], "cellRange": ["20", "6000"]})
+    crs, summary = build_plan_crs(dataset(), [plan])
+    assert sorted(crs["Tech"]) == ["5GNR", "LTE"]
+    path = str(tmp_path / "diff.xlsx")
+    write_diff_workbook(crs, summary, path)
+    assert openpyxl.load_workbook(path).sheetnames == ["Sheet1", "5g cr buttun", "Summary"]
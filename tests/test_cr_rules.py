@@ -0,0 +1,68 @@
+import json
+import os
+
+import openpyxl
+import pandas as pd
+import pytest
+
+from network_data import NetworkDataset
+from cr_rules import CRRule, build_rule_crs, load_rules, values_differ, write_cr_workbooks
+
+
+def dataset():
+    lte = pd.DataFrame({
+        "MECONTEXT_ID": ["S1", "S1", "S2", "S3"],
+        "EUTRAN_CELL_FDD_ID": ["A1", "A2", "B1", "C1"],
+        "ED_MARKET": ["East", "East", "West", "West"],
+        "CRSGAIN": ["3", "0", "3.0", "0"],
+        "CELLRANGE": ["15", "15", "30", "15"]
+    })
+    data = NetworkDataset()
+    data.set_frames(lte, pd.DataFrame())
+    return data
+
+
+def test_values_differ_compares_numbers_numerically():
+    assert list(values_differ(["3", "3.0", "0", "abc", ""], "3")) == [False, False, True, True, True]
+
+
+def test_rule_aliases_and_validation():
+    rule = CRRule("4G", "crsGain", " 3 ", where="CELLRANGE>=20")
+    assert (rule.tech, rule.value, rule.name) == ("LTE", "3", "crsGain=3")
+    with pytest.raises(ValueError):
+        CRRule("LTE", "digitalTilt", "2")
+    with pytest.raises(ValueError):
+        CRRule("3G", "crsGain", "3")
+
+
+def test_only_changed_cells_produce_crs():
+    crs, summary = build_rule_crs(dataset(), [CRRule("LTE", "crsGain", "3")])
+    assert list(crs["MO Class"]) == ["EUtranCellFDD=A2", "EUtranCellFDD=C1"]
+    assert list(crs["CurrentValue"]) == ["0", "0"]
+    assert summary.loc[0, ["Matched", "Changes"]].tolist() == [4, 2]
+
+
+def test_where_clause_limits_the_cells_and_later_rules_win():
+    rules = [CRRule("LTE", "cellRange", "20", name="wide"),
+             CRRule("LTE", "cellRange", "25", where='ED_Market="West"', name="west")]
+    crs, summary = build_rule_crs(dataset(), rules)
+    assert dict(zip(crs["MO Class"], crs["Rule"])) == {
+        "EUtranCellFDD=A1": "wide", "EUtranCellFDD=A2": "wide",
+        "EUtranCellFDD=B1": "west", "EUtranCellFDD=C1": "west"
+    }
+    assert list(summary["Matched"]) == [4, 2]
+
+
+def test_load_rules_from_json(tmp_path):
+    path = tmp_path / "rules.json"
+    path.write_text(json.dumps([{"TECH": "LTE", "Parameter": "crsGain", "Value": 3, "Where": "CELLRANGE<20"}, {}]))
+    rules = load_rules(str(path))
+    assert len(rules) == 1 and rules[0].where == "CELLRANGE<20"
+
+
+def test_workbooks_are_split_by_market(tmp_path):
+    crs, _ = build_rule_crs(dataset(), [CRRule("LTE", "crsGain", "3")])
+    paths = write_cr_workbooks(crs, str(tmp_path), split="market", workers=1)
+    assert sorted(os.path.basename(p) for p in paths) == ["East_CR.xlsx", "West_CR.xlsx"]
+    sheet = openpyxl.load_workbook(sorted(paths)[0])["Sheet1"]
+    assert [cell.value for cell in sheet[2]][1:3] == ["EUtranCellFDD=A2", "crsGain"]
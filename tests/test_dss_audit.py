@@ -0,0 +1,51 @@
+import pandas as pd
+
+from dss_audit import describe_dss, validate_dss
+from network_data import NetworkDataset
+
+
+def dataset(with_lte=True):
+    lte = pd.DataFrame({
+        "MECONTEXT_ID": ["L1", "L2"],
+        "EUTRAN_CELL_FDD_ID": ["L1_1", "L2_1"],
+        "USID": ["100", "200"],
+        "ADMIN_STATE": ["UNLOCKED", "UNLOCKED"],
+        "OP_STATE": ["ENABLED", "ENABLED"]
+    })
+    nr = pd.DataFrame({
+        "ED_MARKET": ["East", "East", "East", "West", "West"],
+        "GNB_NAME": ["l1", "N2", "N3", "N4", "N5"],
+        "NRCELLDUID": ["N1_1", "N2_1", "N3_1", "N4_1", "N5_1"],
+        "DSS_LTECELL": ["L1_1", "L2_1", "L9_1", "L1_1", ""],
+        "USID": ["", "200", "300", "400", ""],
+        "ADMIN_STATE": ["unlocked", "LOCKED", "UNLOCKED", "UNLOCKED", "LOCKED"],
+        "OP_STATE": ["ENABLED", "ENABLED", "ENABLED", "DISABLED", "ENABLED"]
+    })
+    data = NetworkDataset()
+    data.set_frames(lte if with_lte else pd.DataFrame(), nr)
+    return data
+
+
+def test_each_reference_is_checked_against_its_lte_cell():
+    issues, summary = validate_dss(dataset())
+    assert issues[["NR Cell", "LTE Site", "Issue"]].values.tolist() == [
+        ["N2_1", "L2", "State Conflict"],
+        ["N3_1", "", "Dangling"],
+        ["N4_1", "L1", "Site Mismatch, State Conflict"]
+    ]
+    assert summary.values.tolist() == [["East", 3, 1, 0, 1], ["West", 1, 0, 1, 1]]
+    assert describe_dss(summary) == "DSS references: 4, dangling 1, site mismatch 1, state conflict 2"
+
+
+def test_without_lte_every_reference_dangles():
+    issues, summary = validate_dss(dataset(with_lte=False))
+    assert (issues["Issue"] == "Dangling").all() and len(issues) == 4
+    assert summary["Dangling"].sum() == 4
+
+
+def test_no_references():
+    data = NetworkDataset()
+    data.set_frames(pd.DataFrame(), pd.DataFrame({"GNB_NAME": ["N1"], "DSS_LTECELL": [""]}))
+    issues, summary = validate_dss(data)
+    assert issues.empty
+    assert describe_dss(summary) == "No DSS_LTECELL references"
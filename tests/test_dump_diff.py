@@ -0,0 +1,58 @@
+import pandas as pd
+
+from dump_diff import diff_columns, diff_dumps
+from network_data import NetworkDataset
+
+
+def load(lte):
+    data = NetworkDataset()
+    data.set_frames(pd.DataFrame(lte), pd.DataFrame())
+    return data
+
+
+OLD = {
+    "MECONTEXT_ID": ["S1", "S1", "S2"],
+    "EUTRAN_CELL_FDD_ID": ["C1", "C2", "C3"],
+    "CRSGAIN": ["0", "300", "0"],
+    "EARFCNDL": ["5230", "5230", "675"],
+    "DUMP_TIME": ["d1", "d1", "d1"]
+}
+NEW = {
+    "MECONTEXT_ID": ["S1", "S1", "S3"],
+    "EUTRAN_CELL_FDD_ID": ["C1", "C2", "C4"],
+    "CRSGAIN": ["0", "0", "0"],
+    "EARFCNDL": ["5230", "5230", "675"],
+    "DUMP_TIME": ["d2", "d2", "d2"],
+    "QRXLEVMIN": ["", "-124", ""]
+}
+
+
+def test_columns_keep_old_order_and_drop_ignored():
+    assert diff_columns(pd.DataFrame(OLD), pd.DataFrame(NEW), ignore=["dump_time"]) == [
+        "MECONTEXT_ID", "EUTRAN_CELL_FDD_ID", "CRSGAIN", "EARFCNDL", "QRXLEVMIN"
+    ]
+
+
+def test_added_removed_and_modified_cells():
+    changes, summary = diff_dumps(load(OLD), load(NEW), ignore=["DUMP_TIME"])
+    assert changes[["Cell", "Change", "Parameter", "Old Value", "New Value"]].values.tolist() == [
+        ["C2", "Modified", "CRSGAIN", "300", "0"],
+        ["C2", "Modified", "QRXLEVMIN", "", "-124"],
+        ["C3", "Removed", "", "", ""],
+        ["C4", "Added", "", "", ""]
+    ]
+    assert summary.iloc[0].tolist() == ["LTE", 3, 3, 1, 1, 1, 1, 2]
+
+
+def test_ignored_columns_are_not_changes():
+    # A new column that is empty everywhere matches the missing old one
+    _, summary = diff_dumps(load(OLD), load(OLD | {"DUMP_TIME": ["d2"] * 3, "QRXLEVMIN": [""] * 3}),
+                            ignore=["DUMP_TIME"])
+    assert summary[["Modified", "Unchanged", "Changed Values"]].iloc[0].tolist() == [0, 3, 0]
+    _, summary = diff_dumps(load(OLD), load(OLD | {"DUMP_TIME": ["d2"] * 3}))
+    assert summary["Changed Values"].iloc[0] == 3
+
+
+def test_no_data_gives_empty_frames():
+    changes, summary = diff_dumps(NetworkDataset(), NetworkDataset())
+    assert changes.empty and summary.empty
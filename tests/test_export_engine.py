@@ -0,0 +1,26 @@
+import csv
+import gzip
+
+from export_engine import export_rows
+
+
+def test_peak_is_labelled_with_its_sample(tmp_path):
+    rows = ((i, f"cell{i}") for i in range(50))
+    stats = export_rows(rows, ["id", "cell"], str(tmp_path / "out.csv"), memory_sample_rows=10)
+    assert stats.rows == 50
+    assert stats.peak_rows == 10
+    assert "over first 10 rows" in stats.summary()
+
+
+def test_whole_export_traced_has_a_plain_peak(tmp_path):
+    stats = export_rows([(1, "a"), (2, "b")], ["id", "cell"], str(tmp_path / "out.csv"))
+    assert stats.peak_bytes is not None
+    assert "peak" in stats.summary() and "over first" not in stats.summary()
+
+
+def test_gzip_csv_round_trip(tmp_path):
+    path = tmp_path / "out.csv.gz"
+    stats = export_rows([(1, "a"), (2, "b")], ["id", "cell"], str(path), measure_memory=False)
+    assert stats.peak_bytes is None and "peak" not in stats.summary()
+    with gzip.open(path, "rt", newline="") as f:
+        assert list(csv.reader(f)) == [["id", "cell"], ["1", "a"], ["2", "b"]]
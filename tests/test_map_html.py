@@ -0,0 +1,35 @@
+import json
+import re
+
+import pytest
+
+from map_html import build_map_html, map_payload, point_labels
+
+POINTS = [("A", 40.0, -75.0), ("B", 40.01, -75.0), ("C", 40.02, -75.0)]
+
+
+def test_point_labels():
+    assert point_labels(3, "letter") == ["A", "B", "C"]
+    assert point_labels(27, "letter")[-1] == "27"
+    assert point_labels(2) == ["1", "2"]
+
+
+def test_payload_legs_and_master_distances():
+    payload = map_payload(POINTS, master_point=POINTS[1], label_style="letter")
+    assert [p[3] for p in payload["points"]] == ["A", "B", "C"]
+    assert len(payload["legs"]) == 2
+    assert payload["legs"][0][2] == pytest.approx(1.11, abs=0.01)
+    assert payload["total_km"] == pytest.approx(2.224, abs=0.001)
+    assert [name for name, _ in payload["master"]["distances"]] == ["A", "C"]
+
+
+def test_single_point_has_no_legs():
+    payload = map_payload(POINTS[:1])
+    assert payload["legs"] == [] and payload["total_km"] == 0.0 and payload["master"] is None
+
+
+def test_page_embeds_the_payload_safely():
+    html = build_map_html([("</script>", 40.0, -75.0)], "KEY")
+    assert "</script>\"" not in html
+    data = json.loads(re.search(r"const DATA = (.*);", html).group(1))
+    assert data["points"][0][0] == "</script>"
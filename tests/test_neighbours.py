@@ -0,0 +1,28 @@
+import pandas as pd
+
+from network_data import NetworkDataset
+from neighbours import cached_neighbours
+
+
+def lte_sites(names):
+    return pd.DataFrame({
+        "MECONTEXT_ID": names,
+        "EUTRAN_CELL_FDD_ID": [f"{name}_1" for name in names],
+        "LATITUDE": [str(40 + 0.01 * i) for i in range(len(names))],
+        "LONGITUDE": ["-75.0"] * len(names),
+        "Azumuth": ["0"] * len(names)
+    })
+
+
+def test_neighbours_are_built_once_per_load():
+    dataset = NetworkDataset()
+    dataset.set_frames(lte_sites(["A", "B", "C"]), pd.DataFrame())
+    first = cached_neighbours(dataset)
+    assert cached_neighbours(dataset) is first
+    assert set(first["LTE"]) == {"A", "B", "C"}
+    assert first["5GNR"] == {}
+
+    dataset.set_frames(lte_sites(["A", "D"]), pd.DataFrame())
+    reloaded = cached_neighbours(dataset)
+    assert reloaded is not first
+    assert set(reloaded["LTE"]) == {"A", "D"}
@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+
+from network_data import MAX_ID_BITS, IntIndex, NetworkDataset, parse_id, parse_ids, records_frame, vdt_report_bytes
+
+
+def test_records_frame_accepts_dict_records():
+    records = [
+        ("LTE", {"MECONTEXT_ID": "S1", "EARFCNDL": "5230"}),
+        ("LTE", {"MECONTEXT_ID": "S2", "EARFCNDL": "675"}),
+        ("5GNR", {"GNB_NAME": "N1"})
+    ]
+    df = records_frame(records, "LTE")
+    assert list(df["MECONTEXT_ID"]) == ["S1", "S2"]
+    assert list(df["EARFCNDL"]) == ["5230", "675"]
+
+
+def test_records_frame_accepts_series_records():
+    row = pd.Series({"MECONTEXT_ID": "S1", "EARFCNDL": "5230"})
+    df = records_frame([("LTE", row), ("LTE", row)], "LTE")
+    assert list(df.columns) == ["MECONTEXT_ID", "EARFCNDL"]
+    assert len(df) == 2
+
+
+def test_vdt_report_bytes_from_dict_records():
+    records = [
+        ("LTE", {"MECONTEXT_ID": "S1", "EARFCNDL": "5230"}),
+        ("5GNR", {"GNB_NAME": "N1", "SSBFREQUENCY": "632628"})
+    ]
+    data, lte_count, nr_count = vdt_report_bytes("ATT_STX_253", records)
+    assert data
+    assert (lte_count, nr_count) == (1, 1)
+
+
+def test_parse_id_normalizes_typed_and_stored_forms():
+    assert parse_id("0123") == parse_id(" 123.0 ") == parse_id(123) == 123
+    for value in ("", "12.5", "-1", "X9", "nan", 2 ** MAX_ID_BITS):
+        assert parse_id(value) is None
+
+
+def test_parse_ids_marks_unusable_values():
+    ids = parse_ids(["0123", "", "12.5", "X9", "9007199254740991"])
+    assert ids.dtype == np.int64
+    assert ids.tolist() == [123, -1, -1, -1, 2 ** MAX_ID_BITS - 1]
+
+
+def test_int_index_keeps_rows_in_order_and_text_values_aside():
+    values = np.array(["200", "100", "X9", "", "0200"], dtype=object)
+    ids = parse_ids(values)
+    index = IntIndex(ids, ids >= 0, values)
+    assert index["200.0"].tolist() == [0, 4]
+    assert index.get("x9") is None and index["X9"].tolist() == [2]
+    assert "300" not in index
+    assert len(index) == 3
+
+
+def test_dataset_id_index_matches_any_spelling():
+    lte = pd.DataFrame({
+        "MECONTEXT_ID": ["S1", "S2", "S3"],
+        "EUTRAN_CELL_FDD_ID": ["C1", "C2", "C3"],
+        "USID": ["123", "0123", "AB-7"]
+    })
+    data = NetworkDataset()
+    data.set_frames(lte, pd.DataFrame())
+    ids, valid = data.int_ids("LTE", "USID")
+    assert ids.tolist() == [123, 123, -1]
+    assert valid.tolist() == [True, True, False]
+    index = data.index("LTE", "USID")
+    assert isinstance(index, IntIndex)
+    assert index["123.0"].tolist() == [0, 1]
+    assert index["AB-7"].tolist() == [2]
@@ -0,0 +1,74 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pandas as pd
+
+from network_data import NetworkDataset
+from network_service import NetworkService, create_server
+
+
+def service():
+    lte = pd.DataFrame({"MECONTEXT_ID": ["S1"], "EUTRAN_CELL_FDD_ID": ["L1"], "ENBID": ["1001"], "CELLID": ["2"],
+                        "LATITUDE": ["40.0"], "LONGITUDE": ["-75.0"]})
+    nr = pd.DataFrame({"GNB_NAME": ["N1"], "NRCELLDUID": ["C1"], "NCI": [str(2003 * 4096 + 7)]})
+    dataset = NetworkDataset()
+    dataset.set_frames(lte, nr)
+    return NetworkService(dataset)
+
+
+def test_search_fills_derived_gnb_and_cell_ids():
+    result = service().search("gnb ID", "2003")
+    assert result["count"] == 1
+    record = result["records"][0]
+    assert record["gnb ID"] == "2003"
+    assert record["NR cell ID"] == "7"
+
+
+def test_search_fills_derived_eci():
+    result = service().search("ECI", str(1001 * 256 + 2))
+    assert result["count"] == 1
+    assert result["records"][0]["ECI"] == str(1001 * 256 + 2)
+
+
+def test_radius_uses_the_spatial_index():
+    svc = service()
+    svc.warm(svc.dataset)
+    result = svc.radius(40.001, -75.0, 1, "LTE")
+    assert result["count"] == 1
+    assert 0.1 < result["records"][0]["Distance (km)"] < 0.12
+    assert svc.radius(40.1, -75.0, 1, "LTE")["count"] == 0
+
+
+def test_radius_wide_search_counts_all_but_returns_limit():
+    result = service().radius(40.5, -75.0, 150, "LTE", limit=0)
+    assert result["count"] == 1
+    assert result["records"] == []
+
+
+def request_status(path, body=None):
+    """HTTP status of one request against a served test service"""
+    server = create_server(service(), port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        data = None if body is None else json.dumps(body).encode()
+        request = urllib.request.Request(f"http://127.0.0.1:{server.server_port}{path}", data=data,
+                                         method="GET" if body is None else "POST")
+        try:
+            with urllib.request.urlopen(request):
+                return 200
+        except urllib.error.HTTPError as e:
+            return e.code
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_reload_rejects_a_list_body():
+    assert request_status("/reload", ["a.csv"]) == 400
+
+
+def test_radius_rejects_an_oversized_km():
+    assert request_status("/radius?lat=40&lon=-75&km=5000") == 400
+    assert request_status("/radius?lat=40&lon=-75&km=5") == 200
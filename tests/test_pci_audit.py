@@ -0,0 +1,41 @@
+import pandas as pd
+
+from network_data import NetworkDataset
+from pci_audit import find_pci_conflicts
+
+
+def dataset():
+    lte = pd.DataFrame({
+        "MECONTEXT_ID": ["S1", "S2", "S3", "S4", "S5"],
+        "EUTRAN_CELL_FDD_ID": ["C1", "C2", "C3", "C4", "C5"],
+        "PHYSICALLAYERCELLID": ["10", "10", "40", "13", "10"],
+        "EARFCNDL": ["5230", "5230", "5230", "5230", "675"],
+        "LATITUDE": ["40.000", "40.010", "40.020", "40.030", "40.000"],
+        "LONGITUDE": ["-75.0", "-75.0", "-75.0", "-75.0", "-75.0"]
+    })
+    data = NetworkDataset()
+    data.set_frames(lte, pd.DataFrame())
+    return data
+
+
+def test_conflicts_are_co_channel_and_most_severe_first():
+    conflicts = find_pci_conflicts(dataset(), max_km=5)
+    pairs = {frozenset((row["Cell"], row["Neighbour Cell"])): row["Conflict"] for _, row in conflicts.iterrows()}
+    assert len(pairs) == len(conflicts)
+    assert pairs == {
+        frozenset(("C1", "C2")): "PCI Collision",
+        frozenset(("C1", "C3")): "PCI Mod 30",
+        frozenset(("C2", "C3")): "PCI Mod 30",
+        frozenset(("C1", "C4")): "PCI Mod 3",
+        frozenset(("C2", "C4")): "PCI Mod 3",
+        frozenset(("C3", "C4")): "PCI Mod 3"
+    }
+    assert list(conflicts["Conflict"])[0] == "PCI Collision"
+    # C5 shares PCI 10 but is on another carrier
+    assert "C5" not in set(conflicts["Cell"]) | set(conflicts["Neighbour Cell"])
+
+
+def test_distance_limits_the_pairs():
+    conflicts = find_pci_conflicts(dataset(), max_km=1.5)
+    pairs = {frozenset(pair) for pair in zip(conflicts["Cell"], conflicts["Neighbour Cell"])}
+    assert pairs == {frozenset(("C1", "C2")), frozenset(("C2", "C3")), frozenset(("C3", "C4"))}
@@ -0,0 +1,44 @@
+import pandas as pd
+
+from network_data import NetworkDataset
+from query_planner import QueryPlanner, parse_query, range_query
+
+
+def planner():
+    lte = pd.DataFrame({
+        "MECONTEXT_ID": ["ALPHA1", "alpha2", "BETA3", "GAMMA4"],
+        "EUTRAN_CELL_FDD_ID": ["L1", "L2", "L3", "L4"],
+        "USID": ["100", "100", "200", "300"],
+        "CELLRANGE": ["5", "10", "15", "20"]
+    })
+    dataset = NetworkDataset()
+    dataset.set_frames(lte, pd.DataFrame())
+    return QueryPlanner(dataset)
+
+
+def test_contains_is_case_insensitive_and_literal():
+    result = planner().execute("Site~alpha", merge=False)
+    assert list(result.frames["LTE"]["MECONTEXT_ID"]) == ["ALPHA1", "alpha2"]
+    assert "LTE" not in planner().execute("Site~A.", merge=False).frames
+
+
+def test_and_builds_only_the_cheapest_conjunct(monkeypatch):
+    qp = planner()
+    built = []
+    range_positions = qp.dataset.range_positions
+    monkeypatch.setattr(qp.dataset, "range_positions", lambda *args: built.append(args) or range_positions(*args))
+    result = qp.execute("CELLRANGE>=10 AND USID=300", merge=False)
+    assert list(result.frames["LTE"]["MECONTEXT_ID"]) == ["GAMMA4"]
+    assert "index lookup" in result.plan[1]
+    assert built == []
+
+
+def test_range_query_keeps_the_typed_bounds():
+    tree = parse_query(range_query("CELLRANGE", "1234567", "15000.25"))
+    assert [(child.op, float(child.value)) for child in tree.children] == [(">=", 1234567.0), ("<=", 15000.25)]
+    qp = planner()
+    qp.dataset.set_frames(pd.DataFrame({"CELLRANGE": ["15000.25", "15000.26", "1234567", "1234566"]}), pd.DataFrame())
+    matched, _ = qp.match_positions(parse_query(range_query("CELLRANGE", high="15000.25")), "LTE")
+    assert list(matched) == [0]
+    matched, _ = qp.match_positions(parse_query(range_query("CELLRANGE", "1234567")), "LTE")
+    assert list(matched) == [2]
@@ -0,0 +1,44 @@
+import itertools
+
+import numpy as np
+
+from route_optimizer import distance_matrix, optimize_route, route_length
+
+
+def grid_points(n=12, seed=1):
+    rng = np.random.default_rng(seed)
+    return [(f"P{i}", 40 + rng.uniform(0, 0.2), -75 + rng.uniform(0, 0.2)) for i in range(n)]
+
+
+def test_route_starts_at_start_and_visits_every_point():
+    points = grid_points()
+    order, _, _ = optimize_route(points, start=5)
+    assert order[0] == 5
+    assert sorted(order) == list(range(len(points)))
+
+
+def test_original_km_starts_at_the_same_point():
+    points = grid_points()
+    dist = distance_matrix([p[1] for p in points], [p[2] for p in points])
+    for start in (0, 3, 11):
+        order, original_km, optimized_km = optimize_route(points, start)
+        expected = route_length(np.array([start] + [i for i in range(len(points)) if i != start]), dist)
+        assert np.isclose(original_km, expected)
+        assert np.isclose(optimized_km, route_length(np.array(order), dist))
+        assert optimized_km <= original_km + 1e-9
+
+
+def test_small_route_is_optimal():
+    points = grid_points(7, seed=3)
+    dist = distance_matrix([p[1] for p in points], [p[2] for p in points])
+    best = min(route_length(np.array((2,) + rest), dist)
+               for rest in itertools.permutations([i for i in range(7) if i != 2]))
+    _, _, optimized_km = optimize_route(points, start=2)
+    assert optimized_km <= best * 1.05
+
+
+def test_two_points_from_the_second():
+    points = [("A", 40.0, -75.0), ("B", 40.1, -75.0)]
+    order, original_km, optimized_km = optimize_route(points, start=1)
+    assert order == [1, 0]
+    assert original_km == optimized_km
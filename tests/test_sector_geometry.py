@@ -0,0 +1,75 @@
+import json
+import xml.etree.ElementTree as ET
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from network_data import haversine_km
+from sector_geometry import (DEFAULT_FOOTPRINT_KM, MIN_FOOTPRINT_KM, footprint_km, frame_geometry, range_km,
+                             sector_polygons, tilt_degrees, write_sector_geometry)
+
+
+def test_range_units_follow_the_technology():
+    # NR cellRange is in metres even when small, LTE cellRange is in km
+    assert np.allclose(range_km(["150", "15000"], "5GNR"), [0.15, 15.0])
+    assert np.allclose(range_km(["15", "100"], "LTE"), [15.0, 100.0])
+    assert np.isnan(range_km([""], "LTE")[0])
+
+
+def test_tilt_in_tenths_of_a_degree():
+    assert np.allclose(tilt_degrees(["4", "40", "-30"]), [4.0, 4.0, -3.0])
+
+
+def reach(height, tilt, cell_range):
+    return footprint_km(np.array([height]), np.array([tilt]), np.array([cell_range]))[0]
+
+
+def test_footprint_from_tilt_capped_by_range():
+    # Upper beam edge 5 degrees below horizontal from 30 m: about 0.343 km
+    assert reach(30.0, 10.0, np.nan) == pytest.approx(0.030 / np.tan(np.radians(5)))
+    assert reach(30.0, 10.0, 0.2) == pytest.approx(0.2)
+    # Tilted above the beam edge: the range alone limits the reach
+    assert reach(30.0, 2.0, 5.0) == pytest.approx(5.0)
+    assert reach(np.nan, np.nan, np.nan) == DEFAULT_FOOTPRINT_KM
+    assert reach(30.0, 10.0, 0.01) == MIN_FOOTPRINT_KM
+
+
+def test_sector_rings_reach_the_radius_along_the_azimuth():
+    rings = sector_polygons([40.0, 40.0], [-75.0, -75.0], [90.0, np.nan], [2.0, 1.0], beamwidth=60, steps=4)
+    assert rings.shape == (2, 7, 2)
+    sector, omni = rings
+    assert tuple(sector[0]) == tuple(sector[-1]) == (-75.0, 40.0)
+    middle = sector[3]
+    assert haversine_km(40.0, -75.0, middle[1], middle[0]) == pytest.approx(2.0)
+    assert middle[0] > -75.0 and middle[1] == pytest.approx(40.0, abs=1e-3)
+    # Omni cells are circles around the site
+    assert np.allclose(haversine_km(40.0, -75.0, omni[:, 1], omni[:, 0]), 1.0)
+
+
+def geometry():
+    frames = {
+        "LTE": pd.DataFrame({"MECONTEXT_ID": ["S1"], "EUTRAN_CELL_FDD_ID": ["S1_1"], "LATITUDE": ["40"],
+                             "LONGITUDE": ["-75"], "Azumuth": ["0"], "CELLRANGE": ["2"]}),
+        "5GNR": pd.DataFrame({"GNB_NAME": ["N&1"], "NRCELLDUID": ["N1_1"], "LATITUDE": ["40"],
+                              "LONGITUDE": ["-75"], "Azumuth": [""], "CELLRANGE": ["500"]})
+    }
+    return frame_geometry(frames)
+
+
+def test_frame_geometry_uses_each_techs_range_unit():
+    table = geometry()
+    assert table[["Tech", "range_km", "footprint_km"]].values.tolist() == [["LTE", 2.0, 2.0], ["5GNR", 0.5, 0.5]]
+
+
+def test_geojson_and_kml_exports(tmp_path):
+    table = geometry()
+    geojson = tmp_path / "sectors.geojson"
+    assert write_sector_geometry(table, str(geojson)) == 2
+    features = json.loads(geojson.read_text())["features"]
+    assert [f["properties"]["Tech"] for f in features] == ["LTE", "5GNR"]
+    assert features[1]["properties"]["azimuth"] is None
+    kml = tmp_path / "sectors.kml"
+    write_sector_geometry(table, str(kml))
+    folders = ET.parse(kml).getroot().findall(".//{http://www.opengis.net/kml/2.2}Folder")
+    assert [f.find("{http://www.opengis.net/kml/2.2}name").text for f in folders] == ["LTE", "5GNR"]
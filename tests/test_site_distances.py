@@ -0,0 +1,37 @@
+import numpy as np
+
+from network_data import haversine_km
+from site_distances import distance_stats, nearest_sites, site_pair_table, site_points, nearest_site_table
+
+
+def test_nearest_sites_match_brute_force_including_far_points():
+    rng = np.random.default_rng(5)
+    lat = np.concatenate((rng.uniform(40, 40.2, 300), [45.0, 36.0]))
+    lon = np.concatenate((rng.uniform(-75.2, -75, 300), [-75.0, -80.0]))
+    nearest, distance = nearest_sites(lat, lon, start_km=2)
+    d = haversine_km(lat[:, None], lon[:, None], lat[None, :], lon[None, :])
+    np.fill_diagonal(d, np.inf)
+    assert np.allclose(distance, d.min(axis=1))
+    assert np.allclose(d[np.arange(len(lat)), nearest], distance)
+
+
+def test_lonely_points_get_no_nearest_site():
+    nearest, distance = nearest_sites([40.0, -40.0], [-75.0, 100.0], max_km=100)
+    assert list(nearest) == [-1, -1]
+    assert np.isnan(distance).all()
+
+
+def test_site_points_average_cell_positions():
+    points = site_points(["A", "A", "B"], ["40.0", "40.2", "0"], ["-75.0", "-75.0", "0"])
+    assert [(name, round(lat, 6), lon) for name, lat, lon in points] == [("A", 40.1, -75.0)]
+
+
+def test_tables_and_stats():
+    points = [("A", 40.0, -75.0), ("B", 40.01, -75.0), ("C", 40.05, -75.0)]
+    table = nearest_site_table(points)
+    assert list(table["Nearest Site"]) == ["B", "A", "B"]
+    pairs = site_pair_table(points, max_km=2)
+    assert [set(pair) for pair in zip(pairs["Site"], pairs["Other Site"])] == [{"A", "B"}]
+    stats = distance_stats(table["Distance (km)"])
+    assert stats["count"] == 3 and stats["min"] <= stats["median"] <= stats["max"]
+    assert distance_stats([np.nan]) == {"count": 0}
@@ -0,0 +1,50 @@
+import io
+
+import numpy as np
+import pandas as pd
+from PIL import Image
+
+from site_plot import (PATH_COLOR, Projection, frame_sectors, plot_png_bytes, render_site_plot, sector_table,
+                       wedge_polygons)
+
+
+def test_sector_table_reads_cellrange_units_per_tech():
+    lte = sector_table("LTE", ["S1"], ["40.0"], ["-75.0"], ["90"], ["15"])
+    nr = sector_table("5GNR", ["N1"], ["40.0"], ["-75.0"], ["90"], ["150"])
+    assert lte["range_km"].tolist() == [15.0]
+    assert nr["range_km"].tolist() == [0.15]
+
+
+def test_sector_table_drops_unusable_positions():
+    sectors = sector_table("LTE", ["S1", "S2", "S3"], ["40.0", "", "0"], ["-75.0", "-75.0", "0"], ["0"] * 3, [""] * 3)
+    assert sectors["Site"].tolist() == ["S1"]
+
+
+def test_frame_sectors_resolves_mapped_columns():
+    frames = {"LTE": pd.DataFrame({"MECONTEXT_ID": ["S1"], "LATITUDE": ["40"], "LONGITUDE": ["-75"],
+                                   "Azumuth": ["0"], "CELLRANGE": ["10"]})}
+    assert frame_sectors(frames)[["Tech", "Site", "range_km"]].values.tolist() == [["LTE", "S1", 10.0]]
+
+
+def test_wedges_point_along_the_azimuth():
+    polygons = wedge_polygons(np.array([100.0]), np.array([100.0]), [90.0], [10.0], beamwidth=0, steps=1)
+    apex, tip = polygons[0][0], polygons[0][1]
+    assert tuple(apex) == (100.0, 100.0)
+    assert np.allclose(tip, (110.0, 100.0))
+
+
+def test_projection_keeps_points_inside_the_image():
+    projection = Projection.fit([40.0, 40.1], [-75.0, -74.9], size=(200, 100))
+    x, y = projection([40.0, 40.1], [-75.0, -74.9])
+    assert np.all((x >= 0) & (x <= 200) & (y >= 0) & (y <= 100))
+    # North is up
+    assert y[1] < y[0]
+
+
+def test_render_draws_the_path():
+    sectors = sector_table("LTE", ["S1", "S2"], [40.0, 40.05], [-75.0, -75.05], [0, 180], [2, 2])
+    points = [("A", 40.0, -75.0), ("B", 40.05, -75.05)]
+    image = render_site_plot(sectors, points, master_point=points[0], size=(300, 200))
+    assert image.size == (300, 200)
+    assert PATH_COLOR[:3] in {color for _, color in image.getcolors(300 * 200)}
+    assert Image.open(io.BytesIO(plot_png_bytes(image))).format == "PNG"
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from network_data import haversine_km
+from spatial_index import SpatialIndex
+
+
+def random_points(n=2000, seed=7):
+    rng = np.random.default_rng(seed)
+    lat = rng.uniform(39.5, 40.5, n)
+    lon = rng.uniform(-75.5, -74.5, n)
+    # Unusable positions are skipped by the index
+    lat[::97] = np.nan
+    return lat, lon
+
+
+def brute_force_pairs(lat, lon, km):
+    d = haversine_km(lat[:, None], lon[:, None], lat[None, :], lon[None, :])
+    i, j = np.nonzero(np.triu(d <= km, k=1))
+    return set(zip(i.tolist(), j.tolist()))
+
+
+@pytest.mark.parametrize("km", [0.5, 3, 5, 12, 60])
+def test_query_radius_matches_brute_force(km):
+    lat, lon = random_points()
+    index = SpatialIndex(lat, lon, 2.0)
+    positions, distances = index.query_radius(40.0, -75.0, km)
+    expected = haversine_km(40.0, -75.0, lat, lon)
+    assert set(positions.tolist()) == set(np.flatnonzero(expected <= km).tolist())
+    assert np.allclose(distances, expected[positions])
+    assert np.all(np.diff(distances) >= 0)
+
+
+def test_pairs_within_matches_brute_force():
+    lat, lon = random_points(800)
+    i, j, distances = SpatialIndex(lat, lon, 3.0).pairs_within(3.0)
+    # Each pair is listed once, in either order
+    found = [tuple(sorted(pair)) for pair in zip(i.tolist(), j.tolist())]
+    assert len(found) == len(set(found))
+    assert set(found) == brute_force_pairs(lat, lon, 3.0)
+    assert np.allclose(distances, haversine_km(lat[i], lon[i], lat[j], lon[j]))
+
+
+def test_pairs_from_lists_every_neighbour_of_the_given_points():
+    lat, lon = random_points(800)
+    pairs = brute_force_pairs(lat, lon, 2.0)
+    subset = np.arange(0, 800, 5)
+    i, j, _ = SpatialIndex(lat, lon, 2.0).pairs_from(subset, 2.0)
+    expected = {(a, b) for a, b in pairs if a in set(subset)} | {(b, a) for a, b in pairs if b in set(subset)}
+    assert set(zip(i.tolist(), j.tolist())) == expected
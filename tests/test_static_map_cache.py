@@ -0,0 +1,28 @@
+import os
+
+from static_map_cache import StaticMapCache, cache_key, static_map_params
+
+
+def test_directory_is_created_on_first_write(tmp_path):
+    directory = tmp_path / "static_maps"
+    cache = StaticMapCache(directory=str(directory), fetcher=lambda url, params: b"png")
+    assert not directory.exists()
+    assert cache.stats()["entries"] == 0
+
+    params = static_map_params([("A", 40.0, -75.0)])
+    assert cache.get(params) == b"png"
+    assert os.path.exists(cache.path_for(cache_key(params)))
+    assert cache.get(params) == b"png"
+    assert (cache.stats()["hits"], cache.stats()["misses"]) == (1, 1)
+
+
+def test_least_recently_used_images_are_evicted(tmp_path):
+    cache = StaticMapCache(directory=str(tmp_path), max_bytes=10, fetcher=lambda url, params: b"123456")
+    first = static_map_params([("A", 40.0, -75.0)])
+    second = static_map_params([("B", 41.0, -75.0)])
+    cache.get(first)
+    os.utime(cache.path_for(cache_key(first)), (1, 1))
+    cache.get(second)
+    assert not os.path.exists(cache.path_for(cache_key(first)))
+    assert os.path.exists(cache.path_for(cache_key(second)))
+    assert cache.evictions == 1
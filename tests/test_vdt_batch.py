@@ -0,0 +1,52 @@
+import io
+import zipfile
+
+import openpyxl
+import pandas as pd
+import pytest
+
+from network_data import NetworkDataset
+from vdt_batch import generate_vdt_batch, market_vdt_jobs
+
+MAPPING = {"East": "PROJ_EAST", "West": "PROJ_WEST"}
+
+
+def dataset():
+    lte = pd.DataFrame({
+        "MECONTEXT_ID": ["E1", "E1", "E2", "W1", "X1"],
+        "EUTRAN_CELL_FDD_ID": ["E1_1", "E1_2", "E2_1", "W1_1", "X1_1"],
+        "ED_MARKET": ["East", "East", "East", "West", "Unmapped"],
+        "EARFCNDL": ["5230", "675", "5230", "5230", "5230"],
+        "LATITUDE": ["40.00", "40.00", "40.01", "40.02", "41.00"],
+        "LONGITUDE": ["-75.0", "-75.0", "-75.0", "-75.0", "-75.0"],
+        "Azumuth": ["0", "120", "180", "180", "0"]
+    })
+    data = NetworkDataset()
+    data.set_frames(lte, pd.DataFrame())
+    return data
+
+
+def test_jobs_cover_mapped_markets_only():
+    jobs = market_vdt_jobs(dataset(), MAPPING)
+    assert [(project, market) for project, market, _, _ in jobs] == [("PROJ_EAST", "East"), ("PROJ_WEST", "West")]
+    _, _, columns, neighbours = jobs[0]
+    assert list(columns["LTE"][0]) == ["E1", "E1", "E2"]
+    assert set(neighbours["LTE"]) <= {"E1", "E2"}
+
+
+def test_batch_writes_one_report_per_market():
+    buffer = io.BytesIO()
+    results = generate_vdt_batch(dataset(), buffer, workers=1, market_mapping=MAPPING)
+    assert [(r["project"], r["lte_sites"], r["nr_sites"]) for r in results] == [("PROJ_EAST", 2, 0), ("PROJ_WEST", 1, 0)]
+    with zipfile.ZipFile(buffer) as bundle:
+        assert sorted(bundle.namelist()) == ["VDT_PROJ_EAST.xlsx", "VDT_PROJ_WEST.xlsx"]
+        sheet = openpyxl.load_workbook(io.BytesIO(bundle.read("VDT_PROJ_EAST.xlsx")))["LTE"]
+    rows = {row[0]: row for row in sheet.iter_rows(min_row=6, values_only=True)}
+    assert set(rows) == {"E1", "E2"}
+    assert set(rows["E1"][3].split(",")) == {"5230", "675"}
+    assert rows["E1"][1] == "0"
+
+
+def test_batch_without_mapped_markets_fails():
+    with pytest.raises(ValueError):
+        generate_vdt_batch(dataset(), io.BytesIO(), workers=1, market_mapping={})
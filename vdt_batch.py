@@ -0,0 +1,92 @@
+import io
+import os
+import time
+import logging
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from network_data import MARKET_MAPPING, VDT_CARRIER_FIELDS, carriers_by_site, build_vdt_workbook
+from neighbours import cached_neighbours
+
+
+def market_vdt_jobs(dataset, market_mapping=MARKET_MAPPING):
+    """(project name, market, {tech: (sites, carriers)}, neighbours) for every mapped ED_Market
+
+    Only the two resolved columns a report needs, and the neighbour lists of
+    the market's sites, are shipped to the workers. Neighbours are found
+    across the whole network so sites on a market border see both sides.
+    """
+    network = cached_neighbours(dataset)
+    jobs = []
+    for market in dataset.markets():
+        project_name = market_mapping.get(market)
+        if not project_name:
+            logging.warning(f"No project mapping for market '{market}'; skipped")
+            continue
+        columns = {}
+        neighbours = {}
+        for tech in ("LTE", "5GNR"):
+            if dataset.frame(tech).empty:
+                columns[tech] = ([], [])
+                continue
+            in_market = (dataset.field(tech, "ED_Market") == market).to_numpy()
+            sites = dataset.field(tech, "Site").to_numpy()[in_market]
+            columns[tech] = (sites, dataset.field(tech, VDT_CARRIER_FIELDS[tech]).to_numpy()[in_market])
+            neighbours[tech] = {site: network[tech][site] for site in set(sites) if site in network[tech]}
+        jobs.append((project_name, market, columns, neighbours))
+    return jobs
+
+
+def market_vdt_report(project_name, market, columns, neighbours=None):
+    """Build one market's VDT workbook; returns its result dict with the xlsx bytes"""
+    start = time.perf_counter()
+    lte_sites = carriers_by_site(*columns["LTE"])
+    nr_sites = carriers_by_site(*columns["5GNR"])
+    wb = build_vdt_workbook(project_name, lte_sites.items(), nr_sites.items(), neighbours=neighbours)
+    output = io.BytesIO()
+    wb.save(output)
+    return {
+        "project": project_name,
+        "market": market,
+        "lte_sites": len(lte_sites),
+        "nr_sites": len(nr_sites),
+        "seconds": time.perf_counter() - start,
+        "content": output.getvalue()
+    }
+
+
+def describe_result(result):
+    """One progress line for a finished market"""
+    return (f"{result['project']} ({result['market']}): {result['lte_sites']} LTE / "
+            f"{result['nr_sites']} NR sites in {result['seconds']:.2f}s")
+
+
+def generate_vdt_batch(dataset, destination, workers=None, market_mapping=MARKET_MAPPING, progress=None):
+    """Write one VDT report per market into a zip (path or binary stream)
+
+    progress(done, total, result) is called as each market finishes. Returns
+    the per-market results (without the workbook bytes), sorted by project.
+    """
+    jobs = market_vdt_jobs(dataset, market_mapping)
+    if not jobs:
+        raise ValueError("No mapped ED_Market values in the loaded data")
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    results = []
+    # xlsx files are already deflated; storing them keeps the zip step instant
+    with zipfile.ZipFile(destination, "w", zipfile.ZIP_STORED) as bundle:
+        def add(result):
+            bundle.writestr(f"VDT_{result['project']}.xlsx", result.pop("content"))
+            results.append(result)
+            logging.info(describe_result(result))
+            if progress:
+                progress(len(results), len(jobs), result)
+
+        if workers == 1:
+            for job in jobs:
+                add(market_vdt_report(*job))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(market_vdt_report, *job) for job in jobs]
+                for future in as_completed(futures):
+                    add(future.result())
+    return sorted(results, key=lambda r: r["project"])
@@ -5,17 +5,37 @@ import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext, simpledialog
 import traceback
 from datetime import datetime
-import openpyxl
 import math
 from math import radians, sin, cos, sqrt, atan2
 import webbrowser
 from PIL import Image, ImageTk
 import io
-import requests
 import urllib.parse
 import tempfile
 import logging
 import difflib
+from query_cache import QueryCache
+from network_data import (NetworkDataset, MAPPINGS, MARKET_MAPPING, DEFAULT_PROJECT_NAME, RANGE_INDEX_FIELDS,
+                          SEARCH_TYPES, DERIVED_ID_FIELDS, build_vdt_workbook, carriers_by_site, fill_derived_ids,
+                          filter_rows)
+from pci_audit import find_pci_conflicts
+from query_planner import QueryPlanner, QueryError, range_query
+from export_engine import export_rows, export_dataframe, write_xlsx_sheets, EXPORT_FILETYPES
+from cr_rules import load_rules, build_rule_crs, write_cr_workbooks, CR_GROUP_COLUMNS
+from cr_diff import read_plan, build_plan_crs
+from vdt_batch import generate_vdt_batch, describe_result
+from neighbours import cached_neighbours
+from site_distances import site_points, nearest_site_table, distance_stats, site_pair_table
+from route_optimizer import optimize_route
+from map_html import build_map_html
+from static_map_cache import StaticMapCache, static_map_params
+from site_plot import dataset_sectors, render_site_plot
+from sector_geometry import dataset_geometry, write_sector_geometry
+from range_audit import audit_cell_ranges
+from consistency_audit import audit_consistency
+from colocation import dataset_colocation, counterpart_records
+from dss_audit import validate_dss, describe_dss
+from dump_diff import diff_dumps
 
 # Configure logging
 logging.basicConfig(filename='network_search.log', level=logging.ERROR,
@@ -32,93 +52,53 @@ class NetworkSearchApp:
         self.lte_data = pd.DataFrame()
         self.nr_data = pd.DataFrame()
         self.bbu_data = pd.DataFrame()
-        self.usid_index = {}
         self.bbu_index = {}
         self.file_paths = {}
         self.matched_records = []
         self.points = []
         self.master_point = None
         
+        # Search result cache, invalidated by bumping data_version on every load
+        self.data_version = 0
+        self.query_cache = QueryCache(max_entries=256, max_bytes=256 * 1024 * 1024)
+        
         # VDT data
         self.vdt_data = pd.DataFrame(columns=["LTE Site", "NR Site"])
         self.lte_tree_record_map = {}  # For VDT data mapping
         self.nr_tree_record_map = {}   # For VDT data mapping
         self.auto_generate_var = tk.BooleanVar(value=True)  # Auto-generate VDT
+        self.include_colocated_var = tk.BooleanVar(value=True)  # Pull co-located LTE/NR sites into searches
         
         # Market mapping
-        self.market_mapping = {
-            "ATT_ARK1": "ATT_ARK_253",
-            "ATT_NoCAL1": "ATT_NoCAL_253",
-            "ATT_SoCAL1": "ATT_SoCAL_253",
-            "ATT_STX": "ATT_STX_253"
-        }
-        self.project_name_var = tk.StringVar(value="ATT_STX_253")
-        
-        # Enhanced mappings with better 5G support and additional mappings
-        self.mappings = {
-            "LTE": {
-                "USID": ["REMOTE_USID", "CSS_USID", "USID"],
-                "ENBID": ["ENBID"],
-                "cell ID": ["CELLID"],
-                "Site": ["MECONTEXT_ID", "SITE", "OSS_ENodeB"],
-                "Azumuth": ["ATOLL_AZIMUTH", "AZIMUTH", "Atoll_AZIMUT", "Atoll_Az"],
-                "Digital Tilt": ["DIGITALTILT", "DIGITAL_TILT", "TILT"],
-                "cell": ["EUTRAN_CELL_FDD_ID", "CELL", "OSS_EUTRAN_CELL_FDD_ID", "CELL_NAME"],
-                "height(Meter)": ["Atoll_HEIGHT_m", "HEIGHT", "ANTENNA_HEIGHT", "HEIGHT_M"],
-                "PCI": ["PHYSICALLAYERCELLID", "PCI", "OSS_PCI", "Atoll_PCI"],
-                "Power": ["CONFIGUREDMAXTXPOWER", "TX_POWER", "OSS_CONFIGUREDMAXTXPOWER"],
-                "LATITUDE": ["LATITUDE", "LAT"],
-                "LONGITUDE": ["LONGITUDE", "LON", "LONG"],
-                "ADMINISTRATIVESTATE": ["ADMINISTRATIVE_STATE", "ADMIN_STATE"],
-                "OPERATIONALSTATE": ["OPERATIONALSTATE", "OP_STATE"],
-                "CELLRANGE": ["CELLRANGE"],
-                "CRSGAIN": ["CRSGAIN"],
-                "QRXLEVMIN": ["QRXLEVMIN"],
-                "EARFCNDL": ["EARFCNDL"],
-                "Electrical Tilt": ["ELECTRICAL_TILT", "Atoll_ET", "E_TILT"],
-                "ED_Market": ["ED_MARKET", "ED_Market", "EDMARKET"]
-            },
-            "5GNR": {
-                "USID": ["CSS_USID", "REMOTE_USID", "USID", "BBU_USID"],
-                "NIC": ["NCI"],
-                "gnb ID": ["GNBID", "GNB_ID"],
-                "Site": [ "CTS_COMMON_ID", "GNB_NAME", "GNODEB"],
-                "Azumuth": ["Atoll_AZIMUT", "AZIMUTH", "ATOLL_AZIMUTH"],
-                "Digital Tilt": ["DIGITALTILT", "DIGITAL_TILT", "USEDDIGITALTILT"],
-                "cell": ["NRCELLDUID", "CELL", "NRCELL_NAME"],
-                "height(Meter)": ["Atoll_HEIGHT_m", "HEIGHT", "ANTENNA_HEIGHT", "ATOLL_ANTENNA_HEIGHT"],
-                "PCI": ["NRPCI", "PCI"],
-                "Power": ["CONFIGUREDMAXTXPOWER", "TX_POWER", "POWER"],
-                "LATITUDE": ["LAT", "LATITUDE"],
-                "LONGITUDE": ["LONG", "LONGITUDE"],
-                "ADMINISTRATIVESTATE": ["ADMINISTRATIVESTATE", "ADMIN_STATE"],
-                "OPERATIONALSTATE": ["OPERATIONALSTATE", "OP_STATE"],
-                "CELLBARRED": ["CELLBARRED"],
-                "CELLRESERVEDFOROPERATOR": ["CELLRESERVEDFOROPERATOR"],
-                "CELLRANGE": ["CELLRANGE"],
-                "SSBFREQUENCY": ["SSBFREQUENCY"],
-                "ARFCNDL": ["ARFCNDL", "ARFCN_DL", "DL_ARFCN", "NR_ARFCNDL"],
-                "CONFIGURATION": ["CONFIGURATION"],
-                "Electrical Tilt": ["ELECTRICAL_TILT", "Atoll_ET", "E_TILT"],
-                "ED_Market": ["ED_MARKET", "ED_Market", "EDMARKET"],
-                "BBU_TECH": ["BBU_TECH"],
-                "GNB_SA_STATE": ["GNB_SA_STATE"],
-                "CELL_SA_STATE": ["CELL_SA_STATE"],
-                "CELL_TYPE": ["CELL_TYPE"],
-                "ON_AIR": ["ON_AIR"],
-                "DSS_LTECELL": ["DSS_LTECELL"],
-                "NRTAC": ["NRTAC"]
-            },
-            "5GNR_BBU": {
-                "USID": ["USID", "REMOTE_USID", "CSS_USID"],
-                "NRCELL_NAME": ["NRCELLDUID", "CELL", "NRCELL_NAME"],
-                "CONFIGURATION": ["CONFIGURATION"],
-                "ED_Market": ["ED_MARKET", "ED_Market", "EDMARKET"]
-            }
+        self.market_mapping = dict(MARKET_MAPPING)
+        self.project_name_var = tk.StringVar(value=DEFAULT_PROJECT_NAME)
+        
+        # Enhanced mappings with better 5G support and additional mappings (shared with the CLI)
+        self.mappings = MAPPINGS
+        self.dataset = NetworkDataset(self.mappings)
+        # LTE <-> 5GNR site pairs, rebuilt on every load
+        self.colocation = dataset_colocation(self.dataset)
+        # DSS_LTECELL reference problems, rechecked on every load
+        self.dss_issues, self.dss_summary = validate_dss(self.dataset)
+        
+        # Analysis modes: name -> function returning a results DataFrame
+        self.analysis_modes = {
+            "PCI Conflicts": self.run_pci_analysis,
+            "CR Rules": self.run_cr_rules,
+            "Plan Diff": self.run_plan_diff,
+            "Cell Range Audit": self.run_range_audit,
+            "OSS vs Atoll": self.run_consistency_audit,
+            "LTE/NR Co-location": self.run_colocation,
+            "DSS Validation": self.run_dss_validation,
+            "Dump Diff": self.run_dump_diff
         }
+        self.analysis_results = pd.DataFrame()
+        self.analysis_max_rows = 5000  # Rows shown in the tree; exports are complete
         
         # Google Maps API Key
         self.api_key = os.environ.get("GOOGLE_MAPS_API_KEY", "")
+        # Static map images on disk, shared across sessions
+        self.static_map_cache = StaticMapCache(self.api_key)
         
         # Create UI
         self.create_widgets()
@@ -194,7 +174,7 @@ class NetworkSearchApp:
         
         ttk.Label(search_control_frame, text="Search By:").pack(side=tk.LEFT, padx=5)
         self.search_type = ttk.Combobox(search_control_frame, 
-                                      values=["USID", "NIC", "gnb ID", "ENBID", "cell ID", "Site"],
+                                      values=SEARCH_TYPES,
                                       width=10, state="readonly")
         self.search_type.current(0)
         self.search_type.pack(side=tk.LEFT, padx=5)
@@ -205,6 +185,43 @@ class NetworkSearchApp:
         
         search_btn = ttk.Button(search_control_frame, text="Search", command=self.perform_search)
         search_btn.pack(side=tk.LEFT, padx=10)
+        ttk.Checkbutton(search_control_frame, text="Include Co-located Sites",
+                        variable=self.include_colocated_var).pack(side=tk.LEFT, padx=5)
+        
+        # Structured query row, e.g. Site=XYZ AND EARFCNDL=5230
+        query_frame = ttk.Frame(search_frame)
+        query_frame.pack(fill=tk.X, pady=2)
+        ttk.Label(query_frame, text="Query:").pack(side=tk.LEFT, padx=5)
+        self.query_entry = ttk.Entry(query_frame, width=70)
+        self.query_entry.pack(side=tk.LEFT, padx=5)
+        self.query_entry.bind("<Return>", lambda event: self.perform_query())
+        ttk.Button(query_frame, text="Run Query", command=self.perform_query).pack(side=tk.LEFT, padx=5)
+        ttk.Button(query_frame, text="Explain", command=self.explain_query).pack(side=tk.LEFT, padx=5)
+        
+        # Numeric range filter, answered from the sorted range indexes
+        range_frame = ttk.Frame(search_frame)
+        range_frame.pack(fill=tk.X, pady=2)
+        ttk.Label(range_frame, text="Range:").pack(side=tk.LEFT, padx=5)
+        self.range_field = ttk.Combobox(range_frame, values=RANGE_INDEX_FIELDS, width=15, state="readonly")
+        self.range_field.current(0)
+        self.range_field.pack(side=tk.LEFT, padx=5)
+        ttk.Label(range_frame, text="Min:").pack(side=tk.LEFT, padx=2)
+        self.range_min_entry = ttk.Entry(range_frame, width=10)
+        self.range_min_entry.pack(side=tk.LEFT, padx=2)
+        ttk.Label(range_frame, text="Max:").pack(side=tk.LEFT, padx=2)
+        self.range_max_entry = ttk.Entry(range_frame, width=10)
+        self.range_max_entry.pack(side=tk.LEFT, padx=2)
+        ttk.Label(range_frame, text="Market:").pack(side=tk.LEFT, padx=5)
+        self.range_market = ttk.Combobox(range_frame, values=[""], width=15, state="readonly")
+        self.range_market.pack(side=tk.LEFT, padx=5)
+        ttk.Button(range_frame, text="Filter", command=self.perform_range_filter).pack(side=tk.LEFT, padx=5)
+        
+        # Query cache stats panel
+        cache_frame = ttk.Frame(search_frame)
+        cache_frame.pack(fill=tk.X)
+        self.cache_stats_var = tk.StringVar(value=self.query_cache.format_stats())
+        ttk.Label(cache_frame, textvariable=self.cache_stats_var, foreground="gray").pack(side=tk.LEFT, padx=5)
+        ttk.Button(cache_frame, text="Clear Cache", command=self.clear_query_cache).pack(side=tk.LEFT, padx=5)
         
         # Create notebook for results tabs
         self.results_notebook = ttk.Notebook(main_frame)
@@ -234,6 +251,11 @@ class NetworkSearchApp:
         dist_tab = ttk.Frame(self.results_notebook)
         self.results_notebook.add(dist_tab, text="Distance Calculator")
         self.create_distance_tab(dist_tab)
+        
+        # Create Analysis tab
+        analysis_tab = ttk.Frame(self.results_notebook)
+        self.results_notebook.add(analysis_tab, text="Analysis")
+        self.create_analysis_tab(analysis_tab)
     
     def create_main_tab(self, parent):
         """Create the main results tab"""
@@ -242,7 +264,7 @@ class NetworkSearchApp:
         
         # Create a Treeview with scrollbars
         columns = (
-            "Source", "NIC", "gnb ID", "ENBID", "cell ID", "USID", "Site", 
+            "Source", "NIC", "gnb ID", "NR cell ID", "ENBID", "cell ID", "ECI", "USID", "Site", 
             "Azumuth", "Digital Tilt", "cell", "height(Meter)", "PCI", "Power", 
             "LATITUDE", "LONGITUDE", "ADMINISTRATIVESTATE", "OPERATIONALSTATE"
         )
@@ -254,8 +276,8 @@ class NetworkSearchApp:
         
         # Configure columns with headings
         col_widths = {
-            "Source": 50, "NIC": 70, "gnb ID": 50, "ENBID": 50, 
-            "cell ID": 50, "USID": 70, "Site": 70, "Azumuth": 50,
+            "Source": 50, "NIC": 70, "gnb ID": 50, "NR cell ID": 60, "ENBID": 50, 
+            "cell ID": 50, "ECI": 70, "USID": 70, "Site": 70, "Azumuth": 50,
             "Digital Tilt": 70, "cell": 90, "height(Meter)": 70, "PCI": 40,
             "Power": 50, "LATITUDE": 70, "LONGITUDE": 70,
             "ADMINISTRATIVESTATE": 90, "OPERATIONALSTATE": 90
@@ -288,6 +310,7 @@ class NetworkSearchApp:
         self.context_menu.add_command(label="Copy with Headers", command=self.copy_with_headers)
         self.context_menu.add_command(label="Export Selected to Excel", command=self.export_selected_to_excel)
         self.context_menu.add_command(label="Use for Distance Calculation", command=self.use_for_distance)
+        self.context_menu.add_command(label="Send All Results to Distance", command=self.send_results_to_distance)
         self.context_menu.add_command(label="Clear Results", command=self.clear_results)
         self.tree.bind("<Button-3>", self.show_context_menu)
     
@@ -435,17 +458,13 @@ class NetworkSearchApp:
                 return
             file_path = filedialog.asksaveasfilename(
                 defaultextension=".xlsx",
-                filetypes=[("Excel files", "*.xlsx"), ("All files", "*.*")]
+                filetypes=EXPORT_FILETYPES
             )
             if not file_path:
                 return
-            headers = self.lte_tree['columns']
-            data = []
-            for item in selected:
-                data.append(self.lte_tree.item(item, 'values'))
-            df = pd.DataFrame(data, columns=headers)
-            df.to_excel(file_path, index=False)
-            self.update_status(f"Exported {len(data)} rows to {os.path.basename(file_path)}")
+            # Stream the selected rows straight from the tree to the file
+            stats = self.export_tree_items(self.lte_tree, selected, file_path)
+            self.update_status(f"Exported to {os.path.basename(file_path)}: {stats.summary()}")
             messagebox.showinfo("Success", "Data exported successfully!")
         except Exception as e:
             logging.error(f"Error in export_lte_selected_to_excel: {str(e)}")
@@ -862,6 +881,9 @@ class NetworkSearchApp:
         report_btn = ttk.Button(control_frame, text="Generate VDT Report", command=self.generate_vdt_report)
         report_btn.pack(side=tk.LEFT, padx=5)
         
+        batch_btn = ttk.Button(control_frame, text="Generate All Markets (Zip)", command=self.generate_vdt_batch)
+        batch_btn.pack(side=tk.LEFT, padx=5)
+        
         # Create a container frame for the treeview and scrollbars
         tree_container = ttk.Frame(vdt_frame)
         tree_container.pack(fill=tk.BOTH, expand=True, pady=5)
@@ -923,18 +945,12 @@ class NetworkSearchApp:
                         if site:
                             nr_sites.add(site)
             
-            # Convert to sorted lists
-            lte_sites = sorted(lte_sites)
-            nr_sites = sorted(nr_sites)
-            
-            # Create pairs (pad with empty if needed)
-            max_len = max(len(lte_sites), len(nr_sites))
-            for i in range(max_len):
-                lte_site = lte_sites[i] if i < len(lte_sites) else ""
-                nr_site = nr_sites[i] if i < len(nr_sites) else ""
+            # Each LTE anchor sits beside its co-located NR sites; unpaired sites get their own row
+            rows = self.colocation.vdt_pairs(lte_sites, nr_sites)
+            for lte_site, nr_site in rows:
                 self.vdt_tree.insert("", "end", values=(lte_site, nr_site))
             
-            self.update_status(f"Generated VDT data with {max_len} rows")
+            self.update_status(f"Generated VDT data with {len(rows)} rows")
             
         except Exception as e:
             logging.error(f"Error in generate_vdt_data: {str(e)}")
@@ -949,100 +965,35 @@ class NetworkSearchApp:
             
             for item in self.vdt_tree.get_children():
                 values = self.vdt_tree.item(item, 'values')
-                if values[0]:  # LTE Site
+                # A site paired with several counterparts appears on several rows
+                if values[0] and values[0] not in lte_sites:  # LTE Site
                     lte_sites.append(values[0])
-                if values[1]:  # NR Site
+                if values[1] and values[1] not in nr_sites:  # NR Site
                     nr_sites.append(values[1])
             
             if not lte_sites and not nr_sites:
                 messagebox.showinfo("Info", "No sites found in VDT tab. Please generate VDT data first.")
                 return
             
-            # Create Excel workbook
-            wb = openpyxl.Workbook()
-            
-            # Remove default sheet
-            if 'Sheet' in wb.sheetnames:
-                wb.remove(wb['Sheet'])
-            
-            # Create LTE sheet
-            lte_sheet = wb.create_sheet("LTE")
-            
-            # Add headers
-            lte_sheet.append(["Type", "Value", "Remarks", "Buffer", ""])
-            
-            # Add fixed content (light blue)
-            project_name = self.project_name_var.get()
-            lte_sheet.append(["projectName", project_name, "", "0.01", ""])
-            
-            # Add current time (gray)
-            current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            lte_sheet.append(["startTime", current_time, "Use exact format. Add \" ' \" before", "Default keep it 0.01. Can increase it to accommodate TA Plot", ""])
-            lte_sheet.append(["endTime", current_time, "Use exact format. Add \" ' \" before", "", ""])
-            
-            # Add site list header
-            lte_sheet.append(["Site Name List", "ZOOM (Default = 0 for automatic zoom, enter integer value for manual zoom\nEg. value: 5 will fetch plots up to 5 km diagonally from site in both directions.", 
-                             "Neighbour list (comma separated), if blank first tier neighbours will be considered", 
-                             "Carrier List(comma separated)", "EARFCN DL from lte parameter data source"])
-            
-            # Add sites (orange) and EARFCN values (yellow)
-            for site in lte_sites:
-                # Get EARFCN values for this site from LTE parameter tab
-                earfcn_values = set()
-                for item in self.lte_tree.get_children():
-                    values = self.lte_tree.item(item, 'values')
-                    if len(values) > 1 and values[1] == site:  # Site matches
-                        # Get EARFCNDL value if available
-                        earfcn_idx = self.lte_tree['columns'].index("EARFCNDL") if "EARFCNDL" in self.lte_tree['columns'] else -1
-                        if earfcn_idx != -1 and earfcn_idx < len(values):
-                            earfcn = values[earfcn_idx]
-                            if earfcn:
-                                earfcn_values.add(earfcn)
-                
-                # Join EARFCN values with commas
-                earfcn_str = ",".join(sorted(earfcn_values)) if earfcn_values else ""
-                
-                lte_sheet.append([site, "0", "", earfcn_str, ""])
-            
-            # Create NR sheet
-            nr_sheet = wb.create_sheet("NR")
-            
-            # Add headers
-            nr_sheet.append(["Type", "Value", "Remarks", "Buffer", "", ""])
-            
-            # Add fixed content (light blue)
-            nr_sheet.append(["projectName", project_name, "", "0.01", "", ""])
-            
-            # Add current time (gray)
-            nr_sheet.append(["startTime", current_time, "Use exact format. Add \" ' \" before", "Default keep it 0.01. Can increase it to accommodate TA Plot", "", ""])
-            nr_sheet.append(["endTime", current_time, "Use exact format. Add \" ' \" before", "", "", ""])
-            
-            # Add site list header
-            nr_sheet.append(["Site Name List", "ZOOM (Default = 0 for automatic zoom, enter integer value for manual zoom\nEg. value: 5 will fetch plots up to 5 km diagonally from site in both directions.", 
-                            "Neighbour list (comma separated), if blank first tier neighbours will be considered", 
-                            "Carrier List(comma separated)", "ARFCNDL", "from data source"])
-            
-            # Add sites (orange) and ARFCNDL values (yellow)
-            for site in nr_sites:
-                # Get ARFCNDL values for this site from 5G parameter tab
-                arfcn_values = set()
-                columns = self.nr_tree['columns']
-                site_idx = columns.index("SITE") if "SITE" in columns else -1
-                arfcn_idx = columns.index("SSBFREQUENCY") if "SSBFREQUENCY" in columns else -1
-                
-                if site_idx != -1 and arfcn_idx != -1:
-                    for item in self.nr_tree.get_children():
-                        values = self.nr_tree.item(item, 'values')
-                        if len(values) > site_idx and values[site_idx] == site:  # Site matches
-                            if arfcn_idx < len(values):
-                                arfcn = values[arfcn_idx]
-                                if arfcn:
-                                    arfcn_values.add(arfcn)
-                
-                # Join ARFCN values with commas
-                arfcn_str = ",".join(sorted(arfcn_values)) if arfcn_values else ""
-                
-                nr_sheet.append([site, "0", "", arfcn_str, "ARFCNDL", "from data source"])
+            # Carrier lists come from the parameter tabs
+            lte_columns = self.lte_tree['columns']
+            lte_site_idx = 1  # Site is at index 1
+            earfcn_idx = lte_columns.index("EARFCNDL") if "EARFCNDL" in lte_columns else -1
+            lte_carriers = self.tree_site_carriers(self.lte_tree, lte_site_idx, earfcn_idx)
+            
+            nr_columns = self.nr_tree['columns']
+            nr_site_idx = nr_columns.index("SITE") if "SITE" in nr_columns else -1
+            arfcn_idx = nr_columns.index("SSBFREQUENCY") if "SSBFREQUENCY" in nr_columns else -1
+            nr_carriers = self.tree_site_carriers(self.nr_tree, nr_site_idx, arfcn_idx)
+            
+            # First-tier neighbours come from every loaded site, not just the reported ones
+            neighbours = cached_neighbours(self.dataset)
+            wb = build_vdt_workbook(
+                self.project_name_var.get(),
+                [(site, lte_carriers.get(site, "")) for site in lte_sites],
+                [(site, nr_carriers.get(site, "")) for site in nr_sites],
+                neighbours=neighbours
+            )
             
             # Save file
             file_path = filedialog.asksaveasfilename(
@@ -1062,6 +1013,36 @@ class NetworkSearchApp:
             logging.error(f"Error in generate_vdt_report: {str(e)}")
             messagebox.showerror("Error", f"Failed to generate VDT report: {str(e)}")
             
+    def generate_vdt_batch(self):
+        """One VDT report per ED_Market of the loaded data, bundled into a zip"""
+        try:
+            if self.lte_data.empty and self.nr_data.empty:
+                messagebox.showwarning("No Data", "Please load data first")
+                return
+            
+            file_path = filedialog.asksaveasfilename(
+                defaultextension=".zip",
+                filetypes=[("Zip files", "*.zip"), ("All files", "*.*")],
+                title="Save VDT Reports",
+                initialfile=f"VDT_Reports_{datetime.now().strftime('%Y%m%d')}.zip"
+            )
+            if not file_path:
+                return
+            
+            def progress(done, total, result):
+                self.update_status(f"[{done}/{total}] {describe_result(result)}")
+                self.root.update_idletasks()
+            
+            start = datetime.now()
+            results = generate_vdt_batch(self.dataset, file_path, market_mapping=self.market_mapping, progress=progress)
+            elapsed = (datetime.now() - start).total_seconds()
+            self.update_status(f"Generated {len(results)} VDT reports in {elapsed:.2f}s")
+            messagebox.showinfo("Success", "\n".join(describe_result(r) for r in results) +
+                                f"\n\nTotal: {elapsed:.2f}s")
+        except Exception as e:
+            logging.error(f"Error in generate_vdt_batch: {str(e)}")
+            messagebox.showerror("Error", f"Failed to generate VDT reports: {str(e)}")
+    
     def create_distance_tab(self, parent):
         """Create the enhanced distance calculator tab"""
         dist_frame = ttk.Frame(parent)
@@ -1122,8 +1103,18 @@ class NetworkSearchApp:
         
         ttk.Button(calc_frame, text="Calculate Path", command=self.calculate_path_distances).pack(side=tk.LEFT, padx=5)
         ttk.Button(calc_frame, text="Calculate from Master", command=self.calculate_from_master).pack(side=tk.LEFT, padx=5)
+        ttk.Button(calc_frame, text="Optimize Route", command=self.optimize_point_route).pack(side=tk.LEFT, padx=5)
         ttk.Button(calc_frame, text="Show on Google Maps", command=self.open_google_maps).pack(side=tk.LEFT, padx=5)
         
+        site_stats_frame = ttk.Frame(control_frame)
+        site_stats_frame.pack(fill=tk.X, pady=5)
+        
+        ttk.Button(site_stats_frame, text="Nearest Site Stats", command=self.show_nearest_site_stats).pack(side=tk.LEFT, padx=5)
+        ttk.Label(site_stats_frame, text="Pairs within (km):").pack(side=tk.LEFT, padx=5)
+        self.site_pair_km_var = tk.StringVar(value="10")
+        ttk.Entry(site_stats_frame, textvariable=self.site_pair_km_var, width=6).pack(side=tk.LEFT, padx=5)
+        ttk.Button(site_stats_frame, text="Export Site Distances", command=self.export_site_distances).pack(side=tk.LEFT, padx=5)
+        
         # Points list
         list_frame = ttk.Frame(control_frame)
         list_frame.pack(fill=tk.BOTH, expand=True, pady=5)
@@ -1186,6 +1177,9 @@ class NetworkSearchApp:
         
         show_map_btn = ttk.Button(map_control_frame, text="Show Map", command=self.show_map)
         show_map_btn.pack(side=tk.RIGHT, padx=5)
+        ttk.Button(map_control_frame, text="Save Plot PNG", command=self.save_site_plot).pack(side=tk.RIGHT, padx=5)
+        ttk.Button(map_control_frame, text="Offline Plot", command=self.show_site_plot).pack(side=tk.RIGHT, padx=5)
+        ttk.Button(map_control_frame, text="Export Sectors", command=self.export_sector_geometry).pack(side=tk.RIGHT, padx=5)
         
         # Map image display
         self.map_label = ttk.Label(map_tab)
@@ -1194,6 +1188,247 @@ class NetworkSearchApp:
         # Add instructions
         ttk.Label(control_frame, text="Tip: Right-click on search results to add points").pack(anchor="w")
     
+    def create_analysis_tab(self, parent):
+        """Create the whole-network Analysis tab"""
+        analysis_frame = ttk.LabelFrame(parent, text="Network Analysis", padding=10)
+        analysis_frame.pack(fill=tk.BOTH, expand=True)
+        
+        control_frame = ttk.Frame(analysis_frame)
+        control_frame.pack(fill=tk.X, pady=5)
+        
+        ttk.Label(control_frame, text="Mode:").pack(side=tk.LEFT, padx=5)
+        self.analysis_mode = ttk.Combobox(control_frame, values=list(self.analysis_modes.keys()),
+                                          width=25, state="readonly")
+        self.analysis_mode.current(0)
+        self.analysis_mode.pack(side=tk.LEFT, padx=5)
+        
+        ttk.Label(control_frame, text="Distance (km):").pack(side=tk.LEFT, padx=5)
+        self.analysis_km_var = tk.StringVar(value="5")
+        ttk.Entry(control_frame, textvariable=self.analysis_km_var, width=8).pack(side=tk.LEFT, padx=5)
+        
+        ttk.Button(control_frame, text="Run", command=self.run_analysis).pack(side=tk.LEFT, padx=5)
+        ttk.Button(control_frame, text="Export to Excel", command=self.export_analysis_results).pack(side=tk.LEFT, padx=5)
+        ttk.Button(control_frame, text="Write CR Workbooks", command=self.write_rule_cr_workbooks).pack(side=tk.LEFT, padx=5)
+        
+        # Filter row searches every column of the results
+        filter_frame = ttk.Frame(analysis_frame)
+        filter_frame.pack(fill=tk.X, pady=5)
+        ttk.Label(filter_frame, text="Filter:").pack(side=tk.LEFT, padx=5)
+        self.analysis_filter_var = tk.StringVar()
+        self.analysis_filter_var.trace_add("write", lambda *args: self.show_analysis_results())
+        ttk.Entry(filter_frame, textvariable=self.analysis_filter_var, width=40).pack(side=tk.LEFT, padx=5)
+        self.analysis_count_var = tk.StringVar(value="No analysis run")
+        ttk.Label(filter_frame, textvariable=self.analysis_count_var, foreground="gray").pack(side=tk.LEFT, padx=10)
+        
+        tree_container = ttk.Frame(analysis_frame)
+        tree_container.pack(fill=tk.BOTH, expand=True, pady=5)
+        
+        self.analysis_tree = ttk.Treeview(tree_container, show="headings", selectmode="extended")
+        vsb = ttk.Scrollbar(tree_container, orient="vertical", command=self.analysis_tree.yview)
+        hsb = ttk.Scrollbar(tree_container, orient="horizontal", command=self.analysis_tree.xview)
+        self.analysis_tree.configure(yscrollcommand=vsb.set, xscrollcommand=hsb.set)
+        
+        self.analysis_tree.grid(row=0, column=0, sticky="nsew")
+        vsb.grid(row=0, column=1, sticky="ns")
+        hsb.grid(row=1, column=0, sticky="ew")
+        
+        tree_container.grid_rowconfigure(0, weight=1)
+        tree_container.grid_columnconfigure(0, weight=1)
+    
+    def analysis_distance(self):
+        """Distance threshold from the Analysis tab"""
+        km = float(self.analysis_km_var.get())
+        if km <= 0:
+            raise ValueError("Distance must be positive")
+        return km
+    
+    def run_analysis(self):
+        """Run the selected analysis mode over the whole loaded network"""
+        try:
+            if self.lte_data.empty and self.nr_data.empty:
+                messagebox.showwarning("No Data", "Please load data first")
+                return
+            
+            mode = self.analysis_mode.get()
+            self.update_status(f"Running {mode} analysis...")
+            self.root.update_idletasks()
+            start = datetime.now()
+            self.analysis_results = self.analysis_modes[mode]()
+            elapsed = (datetime.now() - start).total_seconds()
+            self.show_analysis_results()
+            self.update_status(f"{mode}: {len(self.analysis_results)} rows in {elapsed:.2f}s")
+        except ValueError as e:
+            messagebox.showerror("Input Error", str(e))
+        except Exception as e:
+            logging.error(f"Error in run_analysis: {str(e)}")
+            messagebox.showerror("Error", f"Analysis failed: {str(e)}")
+    
+    def run_pci_analysis(self):
+        """Co-channel PCI collision / mod 3 / mod 30 conflicts"""
+        return find_pci_conflicts(self.dataset, self.analysis_distance())
+    
+    def run_cr_rules(self):
+        """CR rows from a rules file, evaluated over the whole network"""
+        rules_path = filedialog.askopenfilename(
+            title="Select CR Rules File",
+            filetypes=[("Rules files", "*.csv *.xlsx *.json"), ("All files", "*.*")]
+        )
+        if not rules_path:
+            return self.analysis_results
+        rules = load_rules(rules_path)
+        crs, summary = build_rule_crs(self.dataset, rules)
+        logging.info("CR rules summary:\n" + summary.to_string(index=False))
+        messagebox.showinfo("CR Rules", "\n".join(
+            f"{row.Rule}: {row.Changes} changes of {row.Matched} matched cells" for row in summary.itertuples()
+        ))
+        return crs
+    
+    def run_plan_diff(self):
+        """CR rows for planned values that differ from the loaded dump"""
+        plan_path = filedialog.askopenfilename(
+            title="Select Planned Values File",
+            filetypes=[("Excel files", "*.xlsx *.xls"), ("CSV files", "*.csv"), ("All files", "*.*")]
+        )
+        if not plan_path:
+            return self.analysis_results
+        crs, summary = build_plan_crs(self.dataset, read_plan(plan_path))
+        logging.info("Plan diff summary:\n" + summary.to_string(index=False))
+        messagebox.showinfo("Plan Diff", "\n".join(
+            f"{row['Tech']} {row['Parameter']}: {row['Changes']} changes, {row['Unchanged']} unchanged, "
+            f"{row['Not Found']} planned cells not found" for row in summary.to_dict("records")
+        ) or "No planned parameters found")
+        return crs
+    
+    def run_range_audit(self):
+        """Oversized / undersized CELLRANGE against the nearest facing site, with cellRange CRs"""
+        audit, summary = audit_cell_ranges(self.dataset)
+        logging.info("Cell range audit summary:\n" + summary.to_string())
+        messagebox.showinfo("Cell Range Audit", "\n".join(
+            f"{tech}: " + ", ".join(f"{count} {status.lower()}" for status, count in counts.items())
+            for tech, counts in summary.iterrows()
+        ) or "No cells with CELLRANGE and coordinates")
+        return audit
+    
+    def run_consistency_audit(self):
+        """Cells whose OSS and Atoll values disagree, with mismatch counts per market"""
+        mismatches, summary = audit_consistency(self.dataset)
+        logging.info("OSS vs Atoll summary:\n" + summary.to_string(index=False))
+        per_market = summary.groupby(["Tech", "Market"], sort=True)[["Compared", "Mismatches"]].sum()
+        messagebox.showinfo("OSS vs Atoll", "\n".join(
+            f"{tech} {market}: {row.Mismatches} mismatches of {row.Compared} compared values"
+            for (tech, market), row in per_market.iterrows()
+        ) or "No field has both OSS and Atoll columns in the loaded dumps")
+        return mismatches
+    
+    def run_colocation(self):
+        """Co-located LTE/5GNR site pairs and the evidence for each (DSS, USID, coordinates)"""
+        pairs = self.colocation.pairs
+        logging.info("Co-location matches:\n" + pairs["Match"].value_counts().to_string())
+        return pairs
+    
+    def run_dss_validation(self):
+        """DSS_LTECELL references that are dangling, on another site or in a conflicting state"""
+        self.dss_issues, self.dss_summary = validate_dss(self.dataset)
+        logging.info("DSS validation:\n" + self.dss_summary.to_string(index=False))
+        return self.dss_issues
+    
+    def run_dump_diff(self):
+        """Cells added, removed or changed since a previous load of the dumps"""
+        file_paths = filedialog.askopenfilenames(
+            title="Select Previous Dump Files",
+            filetypes=[("Excel files", "*.xlsx *.xls"), ("CSV files", "*.csv"), ("All files", "*.*")]
+        )
+        if not file_paths:
+            return self.analysis_results
+        previous = NetworkDataset(self.mappings)
+        previous.load(file_paths, progress=self.update_status)
+        changes, summary = diff_dumps(previous, self.dataset)
+        logging.info("Dump diff summary:\n" + summary.to_string(index=False))
+        messagebox.showinfo("Dump Diff", "\n".join(
+            f"{row['Tech']}: {row['Added']} added, {row['Removed']} removed, {row['Modified']} modified cells "
+            f"({row['Changed Values']} changed values)" for row in summary.to_dict("records")
+        ) or "No LTE or 5GNR data to compare")
+        return changes
+    
+    def write_rule_cr_workbooks(self):
+        """Write CR Rules / Plan Diff / Cell Range Audit results as one workbook per site or per market"""
+        try:
+            crs = self.filtered_analysis_results()
+            if crs.empty or not set(CR_GROUP_COLUMNS).issubset(crs.columns):
+                messagebox.showinfo("Info", "Run the CR Rules, Plan Diff or Cell Range Audit analysis first")
+                return
+            
+            out_dir = filedialog.askdirectory(title="Select Output Folder for CR Workbooks")
+            if not out_dir:
+                return
+            
+            per_site = messagebox.askyesno("Split CRs", "Write one workbook per site?\n(No = one per market)")
+            self.update_status("Writing CR workbooks...")
+            self.root.update_idletasks()
+            paths = write_cr_workbooks(crs, out_dir, "site" if per_site else "market")
+            self.update_status(f"Wrote {len(crs)} CRs to {len(paths)} workbooks in {out_dir}")
+            messagebox.showinfo("Success", f"Wrote {len(paths)} CR workbooks")
+        except Exception as e:
+            logging.error(f"Error in write_rule_cr_workbooks: {str(e)}")
+            messagebox.showerror("Error", f"Failed to write CR workbooks: {str(e)}")
+    
+    def filtered_analysis_results(self):
+        """Analysis results matching the filter text"""
+        return filter_rows(self.analysis_results, self.analysis_filter_var.get())
+    
+    def show_analysis_results(self):
+        """Fill the Analysis tree with the filtered results"""
+        try:
+            df = self.filtered_analysis_results()
+            self.analysis_tree.delete(*self.analysis_tree.get_children())
+            columns = list(df.columns)
+            self.analysis_tree['columns'] = columns
+            for col in columns:
+                self.analysis_tree.heading(col, text=col)
+                self.analysis_tree.column(col, width=110, anchor=tk.CENTER)
+            
+            for row in df.head(self.analysis_max_rows).itertuples(index=False):
+                self.analysis_tree.insert("", "end", values=list(row))
+            
+            if len(df) > self.analysis_max_rows:
+                self.analysis_count_var.set(f"Showing {self.analysis_max_rows} of {len(df)} rows (export for all)")
+            else:
+                self.analysis_count_var.set(f"{len(df)} of {len(self.analysis_results)} rows")
+        except Exception as e:
+            logging.error(f"Error in show_analysis_results: {str(e)}")
+    
+    def export_analysis_results(self):
+        """Export the filtered analysis results to Excel"""
+        try:
+            df = self.filtered_analysis_results()
+            if df.empty:
+                messagebox.showinfo("Info", "No analysis results to export")
+                return
+            
+            file_path = filedialog.asksaveasfilename(
+                defaultextension=".xlsx",
+                filetypes=EXPORT_FILETYPES,
+                title="Save Analysis Results"
+            )
+            
+            if not file_path:
+                return
+            
+            stats = export_dataframe(df, file_path)
+            self.update_status(f"Exported analysis rows to {os.path.basename(file_path)}: {stats.summary()}")
+            messagebox.showinfo("Success", "Analysis results exported successfully!")
+        except Exception as e:
+            logging.error(f"Error in export_analysis_results: {str(e)}")
+            messagebox.showerror("Export Error", f"Failed to export analysis results: {str(e)}")
+    
+    def tree_site_carriers(self, tree, site_idx, carrier_idx):
+        """Map each site in a parameter tree to its comma separated, sorted carriers"""
+        if site_idx == -1 or carrier_idx == -1:
+            return {}
+        rows = [tree.item(item, 'values') for item in tree.get_children()]
+        rows = [values for values in rows if len(values) > max(site_idx, carrier_idx)]
+        return carriers_by_site([values[site_idx] for values in rows], [values[carrier_idx] for values in rows])
+    
     def browse_files(self):
         """Open file dialog to select multiple data files"""
         try:
@@ -1219,62 +1454,23 @@ class NetworkSearchApp:
                 messagebox.showwarning("Input Error", "Please select at least one data file")
                 return
             
-            self.lte_data = pd.DataFrame()
-            self.nr_data = pd.DataFrame()
-            self.bbu_data = pd.DataFrame()
-            self.usid_index = {}
             self.bbu_index = {}
             
-            for file_path in file_paths:
-                self.update_status(f"Loading data from {os.path.basename(file_path)}")
-                
-                # Read file
-                if file_path.endswith('.csv'):
-                    df = pd.read_csv(file_path, dtype=str)
-                else:
-                    df = pd.read_excel(file_path, dtype=str)
-                
-                # Determine file type with more robustness
-                filename = os.path.basename(file_path).upper()
-                columns = df.columns.str.upper().tolist()
-                
-                if 'LTE' in filename or any(col in columns for col in ['ENBID', 'CELLID', 'EUTRAN_CELL_FDD_ID']):
-                    # Remove duplicates before concatenating
-                    df = df.drop_duplicates()
-                    self.lte_data = pd.concat([self.lte_data, df], ignore_index=True)
-                elif 'BBU' in filename or any(col in columns for col in ['BBU_TECH', 'GNB_SA_STATE']):
-                    # Remove duplicates before concatenating
-                    df = df.drop_duplicates()
-                    self.bbu_data = pd.concat([self.bbu_data, df], ignore_index=True)
-                elif '5G' in filename or 'NR' in filename or any(col in columns for col in ['NCI', 'GNBID', 'NRCELLDU', 'NRCELLDUID']):
-                    # Remove duplicates before concatenating
-                    df = df.drop_duplicates()
-                    self.nr_data = pd.concat([self.nr_data, df], ignore_index=True)
-                else:
-                    # Fallback: check for key keywords
-                    lte_keywords = ['ENBID', 'CELLID', 'EUTRAN']
-                    nr_keywords = ['NCI', 'GNBID', 'NRCELL']
-                    bbu_keywords = ['BBU_TECH', 'GNB_SA']
-                    scores = {
-                        'LTE': sum(1 for kw in lte_keywords if any(kw in col for col in columns)),
-                        '5GNR': sum(1 for kw in nr_keywords if any(kw in col for col in columns)),
-                        '5GNR_BBU': sum(1 for kw in bbu_keywords if any(kw in col for col in columns))
-                    }
-                    max_score_type = max(scores, key=scores.get)
-                    if scores[max_score_type] > 0:
-                        # Remove duplicates before concatenating
-                        df = df.drop_duplicates()
-                        if max_score_type == 'LTE':
-                            self.lte_data = pd.concat([self.lte_data, df], ignore_index=True)
-                        elif max_score_type == '5GNR':
-                            self.nr_data = pd.concat([self.nr_data, df], ignore_index=True)
-                        elif max_score_type == '5GNR_BBU':
-                            self.bbu_data = pd.concat([self.bbu_data, df], ignore_index=True)
-            
-            # Remove duplicates from the final dataframes
-            self.lte_data = self.lte_data.drop_duplicates()
-            self.nr_data = self.nr_data.drop_duplicates()
-            self.bbu_data = self.bbu_data.drop_duplicates()
+            # Read and classify the dumps with the same loader the CLI uses
+            self.dataset.load(file_paths, progress=self.update_status)
+            self.lte_data = self.dataset.lte_data
+            self.nr_data = self.dataset.nr_data
+            self.bbu_data = self.dataset.bbu_data
+            self.range_market['values'] = [""] + self.dataset.markets()
+            self.update_status("Building LTE/NR co-location index...")
+            self.colocation = dataset_colocation(self.dataset)
+            self.update_status("Validating DSS references...")
+            self.dss_issues, self.dss_summary = validate_dss(self.dataset)
+            
+            # New data version invalidates every cached search result
+            self.data_version += 1
+            self.query_cache.clear()
+            self.update_cache_stats()
             
             # Build USID index
             self.build_index()
@@ -1282,7 +1478,8 @@ class NetworkSearchApp:
             # Build BBU index
             self.build_bbu_index()
             
-            messagebox.showinfo("Success", "Data loaded successfully!")
+            messagebox.showinfo("Success", "Data loaded successfully!\n" + describe_dss(self.dss_summary)
+                                + ("\nSee Analysis > DSS Validation" if len(self.dss_issues) else ""))
             self.update_status(f"Loaded {len(self.lte_data)} LTE, {len(self.nr_data)} 5GNR, and {len(self.bbu_data)} BBU records")
         
         except Exception as e:
@@ -1305,29 +1502,11 @@ class NetworkSearchApp:
             return str(value)
     
     def build_index(self):
-        """Build USID index for fast searching"""
+        """Report the USID index (an integer index built by the dataset at load)"""
         try:
-            self.usid_index = {}
-            
-            # Index LTE data
-            if not self.lte_data.empty:
-                usid_cols = self.mappings["LTE"]["USID"]
-                for _, row in self.lte_data.iterrows():
-                    usid = self.get_column_value(row, usid_cols, "LTE")
-                    if usid:
-                        # Store the entire row
-                        self.usid_index.setdefault(usid, []).append(("LTE", row))
-            
-            # Index 5GNR data
-            if not self.nr_data.empty:
-                usid_cols = self.mappings["5GNR"]["USID"]
-                for _, row in self.nr_data.iterrows():
-                    usid = self.get_column_value(row, usid_cols, "5GNR")
-                    if usid:
-                        # Store the entire row
-                        self.usid_index.setdefault(usid, []).append(("5GNR", row))
-            
-            self.update_status(f"Indexed {len(self.usid_index)} unique USIDs")
+            count = sum(len(self.dataset.index(tech, "USID")) for tech in ("LTE", "5GNR")
+                        if not self.dataset.frame(tech).empty)
+            self.update_status(f"Indexed {count} unique USIDs")
         except Exception as e:
             logging.error(f"Error in build_index: {str(e)}")
             self.update_status("Error building USID index")
@@ -1368,34 +1547,133 @@ class NetworkSearchApp:
                 messagebox.showwarning("Input Error", "Please enter a search value")
                 return
             
-            # Find specific matching records
-            matched_records = self.find_matching_records(search_type, search_value)
+            # Find and merge matching records, reusing cached results where possible
+            merged_records = self.cached_search(search_type, search_value)
+            self.update_cache_stats()
             
-            if not matched_records:
+            if not merged_records:
                 messagebox.showinfo("No Results", "No matching records found")
                 self.update_status("Search completed with no results")
                 return
             
-            # Merge records to ensure uniqueness and fill missing values
-            merged_records = self.merge_records(matched_records)
+            self.show_records(merged_records)
+            self.update_status(f"Found {len(merged_records)} records for {search_type}={search_value}")
+        except Exception as e:
+            logging.error(f"Error in perform_search: {str(e)}")
+            messagebox.showerror("Search Error", f"Search failed: {str(e)}")
+    
+    def show_records(self, records):
+        """Fill the result tabs with matched (tech, record) pairs"""
+        # Store matched records for all tabs
+        self.matched_records = records
+        
+        # Add the matched records to results
+        for tech, record in records:
+            self.add_to_main_tree(tech, record)
+            self.add_to_lte_tree(tech, record)
+            self.add_to_5g_tree(tech, record)
+        
+        # Auto-generate VDT data if enabled
+        if self.auto_generate_var.get():
+            self.generate_vdt_data()
+    
+    def cached_query(self, query_text):
+        """Return the QueryResult for a query, served from the query cache when possible"""
+        key = ("QUERY", query_text.strip(), self.data_version)
+        return self.query_cache.get_or_compute(key, lambda: QueryPlanner(self.dataset).execute(query_text))
+    
+    def perform_query(self):
+        """Run the structured query and show its matches in the result tabs"""
+        try:
+            query_text = self.query_entry.get().strip()
+            if not query_text:
+                messagebox.showwarning("Input Error", "Please enter a query")
+                return
             
-            # Store matched records for all tabs
-            self.matched_records = merged_records
+            self.clear_results()
+            result = self.cached_query(query_text)
+            self.update_cache_stats()
+            records = result.records()
             
-            # Add the matched records to results
-            for tech, record in merged_records:
-                self.add_to_main_tree(tech, record)
-                self.add_to_lte_tree(tech, record)
-                self.add_to_5g_tree(tech, record)
+            if not records:
+                messagebox.showinfo("No Results", "No matching records found")
+                self.update_status("Query completed with no results")
+                return
             
-            # Auto-generate VDT data if enabled
-            if self.auto_generate_var.get():
-                self.generate_vdt_data()
+            self.show_records(records)
+            self.update_status(f"Found {len(records)} records for query: {query_text}")
+        except QueryError as e:
+            messagebox.showerror("Query Error", str(e))
+        except Exception as e:
+            logging.error(f"Error in perform_query: {str(e)}")
+            messagebox.showerror("Query Error", f"Query failed: {str(e)}")
+    
+    def perform_range_filter(self):
+        """Turn the range row into a query and run it"""
+        try:
+            query_text = range_query(self.range_field.get(), self.range_min_entry.get().strip(),
+                                     self.range_max_entry.get().strip(), self.range_market.get())
+        except (QueryError, ValueError) as e:
+            messagebox.showerror("Input Error", f"Invalid range: {str(e)}")
+            return
+        # Show the generated query so it can be refined or explained
+        self.query_entry.delete(0, tk.END)
+        self.query_entry.insert(0, query_text)
+        self.perform_query()
+    
+    def explain_query(self):
+        """Show the plan chosen for the query and its timings"""
+        try:
+            query_text = self.query_entry.get().strip()
+            if not query_text:
+                messagebox.showwarning("Input Error", "Please enter a query")
+                return
             
-            self.update_status(f"Found {len(merged_records)} records for {search_type}={search_value}")
+            # Explain always executes fresh so the timings are real
+            plan = QueryPlanner(self.dataset).explain(query_text)
+            
+            window = tk.Toplevel(self.root)
+            window.title("Query Plan")
+            text = scrolledtext.ScrolledText(window, width=110, height=12, font=("Courier", 9))
+            text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+            text.insert(tk.END, plan)
+            text.configure(state=tk.DISABLED)
+        except QueryError as e:
+            messagebox.showerror("Query Error", str(e))
         except Exception as e:
-            logging.error(f"Error in perform_search: {str(e)}")
-            messagebox.showerror("Search Error", f"Search failed: {str(e)}")
+            logging.error(f"Error in explain_query: {str(e)}")
+            messagebox.showerror("Query Error", f"Explain failed: {str(e)}")
+    
+    def cached_search(self, search_type, search_value):
+        """Return merged records for a search, served from the query cache when possible"""
+        include_colocated = self.include_colocated_var.get()
+        key = (
+            search_type,
+            self.clean_value(search_value.strip()),
+            self.data_version,
+            tuple(self.lte_tree['columns']),
+            tuple(self.nr_tree['columns']),
+            include_colocated
+        )
+        
+        def compute():
+            records = self.merge_records(self.find_matching_records(search_type, search_value))
+            if include_colocated and records:
+                records = records + counterpart_records(self.dataset, self.colocation, records, self.mappings)
+            return records
+        
+        return self.query_cache.get_or_compute(key, compute)
+    
+    def update_cache_stats(self):
+        """Refresh the query cache stats panel"""
+        self.cache_stats_var.set(self.query_cache.format_stats())
+    
+    def clear_query_cache(self):
+        """Drop all cached search results and reset the statistics"""
+        self.query_cache.clear()
+        self.query_cache.reset_stats()
+        self.update_cache_stats()
+        self.update_status("Query cache cleared")
     
     def merge_records(self, records):
         """Merge duplicate records by filling missing values"""
@@ -1443,66 +1721,26 @@ class NetworkSearchApp:
             matched_records = []
             value = self.clean_value(value)
             
+            # Identifiers (including gNB IDs / ECIs derived from NCI and ENBID) are indexed at load
+            if search_type in ["USID", "NIC", "gnb ID", "ENBID", "cell ID", "ECI"]:
+                for tech, df in self.dataset.search_frames(search_type, value, merge=False).items():
+                    matched_records.extend((tech, row) for _, row in df.iterrows())
+            
             # Search through LTE data
-            if search_type in ["cell ID", "ENBID", "Site"] and not self.lte_data.empty:
-                lte_mapping = self.mappings["LTE"]
-                
-                # Search by cell ID
-                if search_type == "cell ID":
-                    col_names = lte_mapping["cell ID"]
-                    for _, row in self.lte_data.iterrows():
-                        cell_id = self.get_column_value(row, col_names, "LTE")
-                        if cell_id == value:
-                            matched_records.append(("LTE", row))
-                
-                # Search by ENBID
-                elif search_type == "ENBID":
-                    col_names = lte_mapping["ENBID"]
-                    for _, row in self.lte_data.iterrows():
-                        enbid = self.get_column_value(row, col_names, "LTE")
-                        if enbid == value:
-                            matched_records.append(("LTE", row))
-                
-                # Search by Site
-                elif search_type == "Site":
-                    col_names = lte_mapping["Site"]
-                    for _, row in self.lte_data.iterrows():
-                        site = self.get_column_value(row, col_names, "LTE")
-                        if site == value:
-                            matched_records.append(("LTE", row))
+            elif search_type == "Site" and not self.lte_data.empty:
+                col_names = self.mappings["LTE"]["Site"]
+                for _, row in self.lte_data.iterrows():
+                    site = self.get_column_value(row, col_names, "LTE")
+                    if site == value:
+                        matched_records.append(("LTE", row))
             
             # Search through 5GNR data
-            elif search_type in ["NIC", "gnb ID", "Site"] and not self.nr_data.empty:
-                nr_mapping = self.mappings["5GNR"]
-                
-                # Search by NIC
-                if search_type == "NIC":
-                    col_names = nr_mapping["NIC"]
-                    for _, row in self.nr_data.iterrows():
-                        nic = self.get_column_value(row, col_names, "5GNR")
-                        if nic == value:
-                            matched_records.append(("5GNR", row))
-                
-                # Search by gnb ID
-                elif search_type == "gnb ID":
-                    col_names = nr_mapping["gnb ID"]
-                    for _, row in self.nr_data.iterrows():
-                        gnb_id = self.get_column_value(row, col_names, "5GNR")
-                        if gnb_id == value:
-                            matched_records.append(("5GNR", row))
-                
-                # Search by Site
-                elif search_type == "Site":
-                    col_names = nr_mapping["Site"]
-                    for _, row in self.nr_data.iterrows():
-                        site = self.get_column_value(row, col_names, "5GNR")
-                        if site == value:
-                            matched_records.append(("5GNR", row))
-            
-            # Direct USID search
-            elif search_type == "USID":
-                if value in self.usid_index:
-                    matched_records = self.usid_index[value]
+            elif search_type == "Site" and not self.nr_data.empty:
+                col_names = self.mappings["5GNR"]["Site"]
+                for _, row in self.nr_data.iterrows():
+                    site = self.get_column_value(row, col_names, "5GNR")
+                    if site == value:
+                        matched_records.append(("5GNR", row))
             
             return matched_records
         except Exception as e:
@@ -1612,14 +1850,20 @@ class NetworkSearchApp:
                 "ADMINISTRATIVESTATE": self.get_column_value(record, mapping.get("ADMINISTRATIVESTATE", []), tech),
                 "OPERATIONALSTATE": self.get_column_value(record, mapping.get("OPERATIONALSTATE", []), tech)
             }
+            for key in DERIVED_ID_FIELDS[tech]:
+                values[key] = self.get_column_value(record, mapping.get(key, []), tech)
+            # Derived IDs the dump leaves empty come from the NIC or ENBID/cell ID
+            values = fill_derived_ids(pd.DataFrame([values]), tech, self.dataset.gnb_id_bits).iloc[0].to_dict()
             
             # Insert into treeview
             item = self.tree.insert("", "end", values=(
                 values["Source"],
                 values["NIC"],
                 values["gnb ID"],
+                values.get("NR cell ID", ""),
                 values["ENBID"],
                 values["cell ID"],
+                values.get("ECI", ""),
                 values["USID"],
                 values["Site"],
                 values["Azumuth"],
@@ -1862,25 +2106,15 @@ class NetworkSearchApp:
             
             file_path = filedialog.asksaveasfilename(
                 defaultextension=".xlsx",
-                filetypes=[("Excel files", "*.xlsx"), ("All files", "*.*")]
+                filetypes=EXPORT_FILETYPES
             )
             
             if not file_path:
                 return
             
-            # Get headers
-            headers = self.lte_tree['columns']
-            
-            # Create dataframe
-            data = []
-            for item in items:
-                data.append(self.lte_tree.item(item, 'values'))
-            
-            df = pd.DataFrame(data, columns=headers)
-            
-            # Save to Excel
-            df.to_excel(file_path, index=False)
-            self.update_status(f"Exported {len(data)} LTE rows to {os.path.basename(file_path)}")
+            # Stream rows straight from the tree to the file
+            stats = self.export_tree_items(self.lte_tree, items, file_path)
+            self.update_status(f"Exported LTE rows to {os.path.basename(file_path)}: {stats.summary()}")
             messagebox.showinfo("Success", "LTE data exported successfully!")
             
         except Exception as e:
@@ -1898,25 +2132,15 @@ class NetworkSearchApp:
             
             file_path = filedialog.asksaveasfilename(
                 defaultextension=".xlsx",
-                filetypes=[("Excel files", "*.xlsx"), ("All files", "*.*")]
+                filetypes=EXPORT_FILETYPES
             )
             
             if not file_path:
                 return
             
-            # Get headers
-            headers = self.nr_tree['columns']
-            
-            # Create dataframe
-            data = []
-            for item in items:
-                data.append(self.nr_tree.item(item, 'values'))
-            
-            df = pd.DataFrame(data, columns=headers)
-            
-            # Save to Excel
-            df.to_excel(file_path, index=False)
-            self.update_status(f"Exported {len(data)} 5G rows to {os.path.basename(file_path)}")
+            # Stream rows straight from the tree to the file
+            stats = self.export_tree_items(self.nr_tree, items, file_path)
+            self.update_status(f"Exported 5G rows to {os.path.basename(file_path)}: {stats.summary()}")
             messagebox.showinfo("Success", "5G data exported successfully!")
             
         except Exception as e:
@@ -1924,6 +2148,11 @@ class NetworkSearchApp:
             self.update_status(f"Export error: {str(e)}")
             messagebox.showerror("Export Error", f"Failed to export 5G data: {str(e)}")
     
+    def export_tree_items(self, tree, items, file_path):
+        """Stream the given tree rows to xlsx / csv / csv.gz and return the ExportStats"""
+        rows = (tree.item(item, 'values') for item in items)
+        return export_rows(rows, tree['columns'], file_path)
+    
     def export_results(self, items):
         """Export given items to Excel file"""
         try:
@@ -1933,25 +2162,15 @@ class NetworkSearchApp:
             
             file_path = filedialog.asksaveasfilename(
                 defaultextension=".xlsx",
-                filetypes=[("Excel files", "*.xlsx"), ("All files", "*.*")]
+                filetypes=EXPORT_FILETYPES
             )
             
             if not file_path:
                 return
             
-            # Get headers
-            headers = self.tree['columns']
-            
-            # Create dataframe
-            data = []
-            for item in items:
-                data.append(self.tree.item(item, 'values'))
-            
-            df = pd.DataFrame(data, columns=headers)
-            
-            # Save to Excel
-            df.to_excel(file_path, index=False)
-            self.update_status(f"Exported {len(data)} rows to {os.path.basename(file_path)}")
+            # Stream rows straight from the tree to the file
+            stats = self.export_tree_items(self.tree, items, file_path)
+            self.update_status(f"Exported to {os.path.basename(file_path)}: {stats.summary()}")
             messagebox.showinfo("Success", "Data exported successfully!")
             
         except Exception as e:
@@ -2201,6 +2420,31 @@ class NetworkSearchApp:
             logging.error(f"Error in calculate_path_distances: {str(e)}")
             messagebox.showerror("Error", f"Failed to calculate path distances: {str(e)}")
     
+    def optimize_point_route(self):
+        """Reorder the points into a short drive-test route starting at the master point"""
+        try:
+            if len(self.points) < 3:
+                messagebox.showinfo("Info", "At least three points are required to optimize a route")
+                return
+            start = self.points.index(self.master_point) if self.master_point in self.points else 0
+            order, original_km, optimized_km = optimize_route(self.points, start)
+            self.points = [self.points[i] for i in order]
+            self.points_listbox.delete(0, tk.END)
+            self.points_listbox.insert(tk.END, *[f"{name}: {lat:.6f}, {lon:.6f}" for name, lat, lon in self.points])
+            
+            # Path output follows the new order; the map reads self.points too
+            self.calculate_path_distances()
+            self.distance_text.config(state=tk.NORMAL)
+            self.distance_text.insert(tk.END, f"Route optimized from {self.points[0][0]}\n", "header")
+            self.distance_text.insert(tk.END, f"Original order: {original_km:.3f} km\n")
+            self.distance_text.insert(tk.END, f"Saved: {original_km - optimized_km:.3f} km\n", "bold")
+            self.distance_text.config(state=tk.DISABLED)
+            self.update_status(f"Optimized route over {len(self.points)} points: {optimized_km:.3f} km "
+                               f"({original_km - optimized_km:.3f} km saved)")
+        except Exception as e:
+            logging.error(f"Error in optimize_point_route: {str(e)}")
+            messagebox.showerror("Error", f"Failed to optimize route: {str(e)}")
+    
     def calculate_from_master(self):
         """Calculate distances from master point to all other points"""
         try:
@@ -2289,190 +2533,11 @@ class NetworkSearchApp:
     def generate_map_html(self):
         """Generate HTML with Google Maps showing all points with names and distances"""
         try:
-            # Create HTML content
-            html = f"""
-            <!DOCTYPE html>
-            <html>
-            <head>
-                <title>Network Points Map</title>
-                <style>
-                    body {{ margin: 0; padding: 0; }}
-                    #map {{ height: 100vh; width: 100%; }}
-                    #info-panel {{ position: absolute; top: 10px; left: 10px; background: white; padding: 10px; z-index: 1000; }}
-                </style>
-            </head>
-            <body>
-                <div id="info-panel"></div>
-                <div id="map"></div>
-                
-                <script>
-                    function initMap() {{
-                        // Create map
-                        const map = new google.maps.Map(document.getElementById("map"), {{
-                            zoom: 12,
-                            center: {{ lat: {self.points[0][1] if self.points else 0}, lng: {self.points[0][2] if self.points else 0} }},
-                            mapTypeId: 'terrain'
-                        }});
-                        
-                        // Create info window
-                        const infoWindow = new google.maps.InfoWindow();
-                        const infoPanel = document.getElementById("info-panel");
-                        
-                        // Array to store markers
-                        const markers = [];
-                        let infoContent = "<h3>Points and Distances</h3><ul>";
-                        
-                        // Add markers for each point
-                        {self.generate_markers_js()}
-                        
-                        // Draw paths if needed
-                        {self.generate_paths_js()}
-                        
-                        // Add master point info if exists
-                        {self.generate_master_info_js()}
-                        
-                        infoContent += "</ul>";
-                        infoPanel.innerHTML = infoContent;
-                    }}
-                </script>
-                <script async defer
-                    src="https://maps.googleapis.com/maps/api/js?key={self.api_key}&callback=initMap">
-                </script>
-            </body>
-            </html>
-            """
-            return html
+            return build_map_html(self.points, self.api_key, self.master_point)
         except Exception as e:
             logging.error(f"Error in generate_map_html: {str(e)}")
             return "<html><body>Error generating map</body></html>"
     
-    def generate_markers_js(self):
-        """Generate JavaScript code for markers"""
-        try:
-            js_code = ""
-            for i, (name, lat, lon) in enumerate(self.points):
-                # Add marker
-                js_code += f"""
-                    // Marker for {name}
-                    const marker{i} = new google.maps.Marker({{
-                        position: {{ lat: {lat}, lng: {lon} }},
-                        map: map,
-                        title: "{name}",
-                        label: "{i+1}",
-                    }});
-                    
-                    // Info window for {name}
-                    marker{i}.addListener('click', function() {{
-                        infoWindow.setContent('<div><strong>{name}</strong><br>Lat: {lat:.6f}<br>Lon: {lon:.6f}</div>');
-                        infoWindow.open(map, marker{i});
-                    }});
-                    
-                    markers.push(marker{i});
-                    infoContent += "<li><strong>{name}</strong> (Lat: {lat:.6f}, Lon: {lon:.6f})</li>";
-                """
-            return js_code
-        except Exception as e:
-            logging.error(f"Error in generate_markers_js: {str(e)}")
-            return ""
-    
-    def generate_paths_js(self):
-        """Generate JavaScript code for paths and distances"""
-        try:
-            if len(self.points) < 2:
-                return ""
-                
-            js_code = "// Create path\n const pathCoordinates = ["
-            
-            # Add coordinates
-            for name, lat, lon in self.points:
-                js_code += f"{{lat: {lat}, lng: {lon}}},"
-            
-            js_code += "];\n"
-            
-            # Draw polyline
-            js_code += """
-            const path = new google.maps.Polyline({
-                path: pathCoordinates,
-                geodesic: true,
-                strokeColor: "#FF0000",
-                strokeOpacity: 1.0,
-                strokeWeight: 2
-            });
-            path.setMap(map);
-            """
-            
-            # Add distance markers
-            js_code += "// Add distance markers\n"
-            for i in range(len(self.points) - 1):
-                name1, lat1, lon1 = self.points[i]
-                name2, lat2, lon2 = self.points[i+1]
-                distance = self.calculate_distance(lat1, lon1, lat2, lon2)
-                
-                # Midpoint for label
-                mid_lat = (lat1 + lat2) / 2
-                mid_lon = (lon1 + lon2) / 2
-                
-                js_code += f"""
-                // Distance between {name1} and {name2}
-                const distanceMarker{i} = new google.maps.Marker({{
-                    position: {{ lat: {mid_lat}, lng: {mid_lon} }},
-                    map: map,
-                    icon: {{
-                        path: google.maps.SymbolPath.CIRCLE,
-                        scale: 0  // Hide marker, just show label
-                    }},
-                    label: {{
-                        text: "{distance:.2f} km",
-                        color: "#0000FF",
-                        fontSize: "12px",
-                        fontWeight: "bold"
-                    }}
-                }});
-                """
-            
-            return js_code
-        except Exception as e:
-            logging.error(f"Error in generate_paths_js: {str(e)}")
-            return ""
-    
-    def generate_master_info_js(self):
-        """Generate JavaScript code for master point info"""
-        try:
-            if not self.master_point:
-                return ""
-                
-            master_name, master_lat, master_lon = self.master_point
-            js_code = f"""
-            // Highlight master point
-            const masterMarker = new google.maps.Marker({{
-                position: {{ lat: {master_lat}, lng: {master_lon} }},
-                map: map,
-                title: "Master: {master_name}",
-                label: "M",
-                icon: {{
-                    url: "http://maps.google.com/mapfiles/ms/icons/blue-dot.png"
-                }}
-            }});
-            
-            // Add master distances
-            infoContent += "<h4>Distances from Master Point:</h4><ul>";
-            """
-            
-            for name, lat, lon in self.points:
-                if (name, lat, lon) == self.master_point:
-                    continue
-                    
-                distance = self.calculate_distance(master_lat, master_lon, lat, lon)
-                js_code += f"""
-                infoContent += "<li>{master_name} to {name}: {distance:.3f} km</li>";
-                """
-            
-            js_code += "infoContent += \"</ul>\";"
-            return js_code
-        except Exception as e:
-            logging.error(f"Error in generate_master_info_js: {str(e)}")
-            return ""
-    
     def show_map(self):
         """Show map with all points"""
         try:
@@ -2480,44 +2545,22 @@ class NetworkSearchApp:
                 messagebox.showinfo("Info", "No points to show on map")
                 return
                 
-            # Check API key
+            # Without an API key the offline plot is the only map available
             if not self.api_key:
-                messagebox.showwarning("API Key Missing", 
-                    "Google Maps API key is required for map visualization. Please set the environment variable GOOGLE_MAPS_API_KEY")
+                self.update_status("No GOOGLE_MAPS_API_KEY set; showing the offline site plot")
+                self.show_site_plot()
                 return
             
-            # Create Google Maps URL
-            base_url = "https://maps.googleapis.com/maps/api/staticmap?"
-            size = "800x600"
             maptype = self.map_type.get()
-            zoom = self.map_zoom.get()
-            scale = "2"  # Higher resolution
-            
-            # Add markers
-            markers = []
-            for i, (name, lat, lon) in enumerate(self.points):
-                color = "blue" if self.master_point and (name, lat, lon) == self.master_point else "red"
-                label = chr(65 + i)  # A, B, C, ...
-                markers.append(f"markers=color:{color}%7Clabel:{label}%7C{lat},{lon}")
-            
-            # Add path if there are multiple points
-            path = ""
-            if len(self.points) > 1:
-                path_points = "|".join(f"{lat},{lon}" for _, lat, lon in self.points)
-                path = f"&path=color:0xff0000%7Cweight:5%7C{path_points}"
-            
-            # Create URL
-            url = f"{base_url}size={size}&maptype={maptype}&zoom={zoom}&scale={scale}&{('&'.join(markers))}{path}&key={self.api_key}"
-            
-            # Try to display map image
-            response = requests.get(url)
-            if response.status_code != 200:
-                error_details = response.text
-                if len(error_details) > 200:
-                    error_details = error_details[:200] + "..."
-                raise Exception(f"Google Maps API returned {response.status_code}: {error_details}")
-            
-            img_data = response.content
+            zoom = int(self.map_zoom.get())
+            params = static_map_params(self.points, self.master_point, zoom, maptype)
+            img_data = self.static_map_cache.get(params)
+            # Neighbouring zoom levels load in the background so stepping the zoom is instant
+            self.static_map_cache.prefetch([
+                static_map_params(self.points, self.master_point, z, maptype)
+                for z in (zoom - 1, zoom + 1) if 1 <= z <= 20
+            ])
+            
             img = Image.open(io.BytesIO(img_data))
             photo = ImageTk.PhotoImage(img)
             
@@ -2536,6 +2579,7 @@ class NetworkSearchApp:
             # Add legend to map
             self.map_label.config(text=legend_text, compound=tk.BOTTOM)
             self.dist_notebook.select(1)  # Show map tab
+            self.update_status(self.static_map_cache.format_stats())
             
         except Exception as e:
             logging.error(f"Error in show_map: {str(e)}")
@@ -2543,45 +2587,165 @@ class NetworkSearchApp:
             # Fallback to opening in browser
             self.open_google_maps()
     
+    def render_site_plot(self):
+        """Offline plot of the loaded cells around the distance points (all cells without points)"""
+        sectors = dataset_sectors(self.dataset)
+        if sectors.empty and not self.points:
+            raise ValueError("Load data or add points to plot")
+        return render_site_plot(sectors, self.points, self.master_point, size=(800, 600))
+    
+    def show_site_plot(self):
+        """Show the offline site plot in the map tab"""
+        try:
+            self.site_plot_image = self.render_site_plot()
+            photo = ImageTk.PhotoImage(self.site_plot_image)
+            self.map_label.config(image=photo, text="Offline plot: LTE orange, NR purple; path red, master blue",
+                                  compound=tk.BOTTOM)
+            self.map_label.image = photo  # Keep reference
+            self.dist_notebook.select(1)  # Show map tab
+        except Exception as e:
+            logging.error(f"Error in show_site_plot: {str(e)}")
+            messagebox.showerror("Plot Error", f"Failed to render site plot: {str(e)}")
+    
+    def save_site_plot(self):
+        """Save the offline site plot as a PNG"""
+        try:
+            file_path = filedialog.asksaveasfilename(
+                defaultextension=".png",
+                filetypes=[("PNG files", "*.png"), ("All files", "*.*")],
+                title="Save Site Plot"
+            )
+            if not file_path:
+                return
+            self.render_site_plot().save(file_path, format="PNG")
+            self.update_status(f"Saved site plot to {os.path.basename(file_path)}")
+        except Exception as e:
+            logging.error(f"Error in save_site_plot: {str(e)}")
+            messagebox.showerror("Plot Error", f"Failed to save site plot: {str(e)}")
+    
+    def export_sector_geometry(self):
+        """Export sector footprint polygons of all loaded cells as GeoJSON or KML"""
+        try:
+            table = dataset_geometry(self.dataset)
+            if table.empty:
+                messagebox.showinfo("Info", "No cells with coordinates loaded")
+                return
+            file_path = filedialog.asksaveasfilename(
+                defaultextension=".geojson",
+                filetypes=[("GeoJSON files", "*.geojson"), ("KML files", "*.kml"), ("All files", "*.*")],
+                title="Export Sector Geometry"
+            )
+            if not file_path:
+                return
+            count = write_sector_geometry(table, file_path)
+            self.update_status(f"Exported {count} sectors to {os.path.basename(file_path)}")
+            messagebox.showinfo("Success", f"Exported {count} sectors")
+        except Exception as e:
+            logging.error(f"Error in export_sector_geometry: {str(e)}")
+            messagebox.showerror("Export Error", f"Failed to export sectors: {str(e)}")
+    
     def use_for_distance(self):
-        """Use selected point from results for distance calculation"""
+        """Use the selected result rows (one point per site) for distance calculation"""
         try:
             selection = self.tree.selection()
             if not selection:
                 return
-                
-            item = selection[0]
-            values = self.tree.item(item, 'values')
-            col_names = self.tree['columns']
-            
-            # Find latitude and longitude columns
-            lat_idx = col_names.index("LATITUDE")
-            lon_idx = col_names.index("LONGITUDE")
-            
-            lat_str = values[lat_idx]
-            lon_str = values[lon_idx]
-            
-            # Get name from the record
-            name_idx = col_names.index("Site") if "Site" in col_names else None
-            name = values[name_idx] if name_idx is not None else f"Point {len(self.points) + 1}"
-            
-            # Clean and convert
-            lat = float(lat_str) if lat_str else None
-            lon = float(lon_str) if lon_str else None
-            
-            if lat is None or lon is None:
-                raise ValueError("Missing coordinates")
-                
-            # Add to points
-            self.points.append((name, lat, lon))
-            self.points_listbox.insert(tk.END, f"{name}: {lat:.6f}, {lon:.6f}")
-            
-        except (ValueError, IndexError) as e:
-            messagebox.showerror("Error", "Could not get valid coordinates from this row")
+            added = self.add_distance_points(self.tree_site_points(selection))
+            if not added:
+                messagebox.showerror("Error", "Could not get valid coordinates from the selected rows")
         except Exception as e:
             logging.error(f"Error in use_for_distance: {str(e)}")
             messagebox.showerror("Error", f"Failed to use for distance: {str(e)}")
     
+    def send_results_to_distance(self):
+        """Send every result row to the Distance tab, deduplicated to site coordinates"""
+        try:
+            items = self.tree.get_children()
+            if not items:
+                messagebox.showinfo("Info", "No results to send")
+                return
+            added = self.add_distance_points(self.tree_site_points(items))
+            self.update_status(f"Sent {added} sites from {len(items)} result rows to the Distance tab")
+        except Exception as e:
+            logging.error(f"Error in send_results_to_distance: {str(e)}")
+            messagebox.showerror("Error", f"Failed to send results to distance: {str(e)}")
+    
+    def tree_site_points(self, items):
+        """(site, lat, lon) per site of the given result rows, at the mean of its cells"""
+        col_names = list(self.tree['columns'])
+        if "LATITUDE" not in col_names or "LONGITUDE" not in col_names:
+            raise ValueError("Results have no LATITUDE/LONGITUDE columns")
+        lat_idx = col_names.index("LATITUDE")
+        lon_idx = col_names.index("LONGITUDE")
+        site_idx = col_names.index("Site") if "Site" in col_names else None
+        rows = [self.tree.item(item, 'values') for item in items]
+        sites = [row[site_idx] if site_idx is not None and row[site_idx] else f"{row[lat_idx]},{row[lon_idx]}"
+                 for row in rows]
+        return site_points(sites, [row[lat_idx] for row in rows], [row[lon_idx] for row in rows])
+    
+    def add_distance_points(self, points):
+        """Append points not already in the list (by name); returns how many were added"""
+        existing = {name for name, _, _ in self.points}
+        new_points = [p for p in points if p[0] not in existing]
+        self.points.extend(new_points)
+        self.points_listbox.insert(tk.END, *[f"{name}: {lat:.6f}, {lon:.6f}" for name, lat, lon in new_points])
+        return len(new_points)
+    
+    def show_nearest_site_stats(self):
+        """Distance from every point to its nearest other point, with summary statistics"""
+        try:
+            if len(self.points) < 2:
+                messagebox.showinfo("Info", "At least two points are required")
+                return
+            table = nearest_site_table(self.points)
+            stats = distance_stats(table["Distance (km)"])
+            
+            self.distance_text.config(state=tk.NORMAL)
+            self.distance_text.delete(1.0, tk.END)
+            self.distance_text.insert(tk.END, "Inter-site Distance Statistics:\n", "header")
+            self.distance_text.insert(tk.END, f"Sites: {len(table)}\n")
+            if stats["count"]:
+                for label, key in [("Min", "min"), ("Mean", "mean"), ("Median", "median"),
+                                   ("90th percentile", "p90"), ("Max", "max")]:
+                    self.distance_text.insert(tk.END, f"{label} nearest-site distance: {stats[key]:.3f} km\n")
+            self.distance_text.insert(tk.END, "\nNearest Other Site:\n", "header")
+            for row in table.sort_values("Distance (km)").itertuples(index=False):
+                self.distance_text.insert(tk.END, f"{row[0]} -> {row[3]}: {row[4]:.3f} km\n")
+            self.distance_text.config(state=tk.DISABLED)
+            self.dist_notebook.select(0)
+            self.update_status(f"Nearest-site distances for {len(table)} sites")
+        except Exception as e:
+            logging.error(f"Error in show_nearest_site_stats: {str(e)}")
+            messagebox.showerror("Error", f"Failed to calculate nearest sites: {str(e)}")
+    
+    def export_site_distances(self):
+        """Export nearest-site distances and all site pairs within the given distance"""
+        try:
+            if len(self.points) < 2:
+                messagebox.showinfo("Info", "At least two points are required")
+                return
+            max_km = float(self.site_pair_km_var.get())
+            file_path = filedialog.asksaveasfilename(
+                defaultextension=".xlsx",
+                filetypes=[("Excel files", "*.xlsx"), ("All files", "*.*")],
+                title="Export Site Distances"
+            )
+            if not file_path:
+                return
+            nearest = nearest_site_table(self.points)
+            pairs = site_pair_table(self.points, max_km)
+            write_xlsx_sheets([
+                ("Nearest Site", list(nearest.columns), nearest.itertuples(index=False, name=None)),
+                (f"Pairs within {max_km:g} km", list(pairs.columns), pairs.itertuples(index=False, name=None))
+            ], file_path)
+            self.update_status(f"Exported {len(nearest)} sites and {len(pairs)} site pairs to {os.path.basename(file_path)}")
+            messagebox.showinfo("Success", "Site distances exported successfully!")
+        except ValueError as e:
+            messagebox.showerror("Input Error", str(e))
+        except Exception as e:
+            logging.error(f"Error in export_site_distances: {str(e)}")
+            messagebox.showerror("Export Error", f"Failed to export site distances: {str(e)}")
+    
     def prompt_master_point(self, event):
         """Prompt user to confirm if selected point should be master point on left-click"""
         try:
@@ -2693,17 +2857,13 @@ class NetworkSearchApp:
                 return
             file_path = filedialog.asksaveasfilename(
                 defaultextension=".xlsx",
-                filetypes=[("Excel files", "*.xlsx"), ("All files", "*.*")]
+                filetypes=EXPORT_FILETYPES
             )
             if not file_path:
                 return
-            headers = self.nr_tree['columns']
-            data = []
-            for item in selected:
-                data.append(self.nr_tree.item(item, 'values'))
-            df = pd.DataFrame(data, columns=headers)
-            df.to_excel(file_path, index=False)
-            self.update_status(f"Exported {len(data)} rows to {os.path.basename(file_path)}")
+            # Stream the selected rows straight from the tree to the file
+            stats = self.export_tree_items(self.nr_tree, selected, file_path)
+            self.update_status(f"Exported to {os.path.basename(file_path)}: {stats.summary()}")
             messagebox.showinfo("Success", "Data exported successfully!")
         except Exception as e:
             logging.error(f"Error in export_5g_selected_to_excel: {str(e)}")
@@ -3,10 +3,10 @@ import os
 import streamlit as st
 import logging
 from datetime import datetime
-import openpyxl
 import math
 from math import radians, sin, cos, sqrt, atan2
-import io
+from network_data import vdt_report_bytes
+from neighbours import network_neighbours
 
 # Configure logging
 logging.basicConfig(filename='network_search.log', level=logging.ERROR,
@@ -136,63 +136,17 @@ class NetworkSearchApp:
     def generate_vdt_report(self, project_name):
         """Generate and download the VDT report as an Excel file"""
         try:
-            lte_sites = sorted(set(self.get_column_value(record, self.mappings["LTE"]["Site"], "LTE")
-                                 for tech, record in st.session_state.matched_records
-                                 if tech == "LTE" and self.get_column_value(record, self.mappings["LTE"]["Site"], "LTE")))
-            nr_sites = sorted(set(self.get_column_value(record, self.mappings["5GNR"]["Site"], "5GNR")
-                                for tech, record in st.session_state.matched_records
-                                if tech == "5GNR" and self.get_column_value(record, self.mappings["5GNR"]["Site"], "5GNR")))
-            if not lte_sites and not nr_sites:
-                st.error("No sites found. Please perform a search first.")
+            # First-tier neighbours come from every loaded site, not just the matched ones
+            neighbours = network_neighbours({"LTE": st.session_state.lte_data, "5GNR": st.session_state.nr_data},
+                                            self.mappings)
+            content, lte_count, nr_count = vdt_report_bytes(project_name, st.session_state.matched_records,
+                                                            self.mappings, neighbours=neighbours)
+            if content is None:
+                st.error("No sites found in VDT tab. Please generate VDT data first.")
                 return
-
-            wb = openpyxl.Workbook()
-            # LTE Sheet
-            lte_data = [
-                ["Type", "Value", "Remarks", "Buffer", ""],
-                ["projectName", project_name, "", "0.01", ""],
-                ["startTime", datetime.now().strftime("%Y-%m-%d %H:%M:%S"), "Use exact format. Add \" ' \" before", "Default keep it 0.01. Can increase it to accommodate TA Plot", ""],
-                ["endTime", datetime.now().strftime("%Y-%m-%d %H:%M:%S"), "Use exact format. Add \" ' \" before", "", ""],
-                ["Site Name List", "ZOOM (Default = 0 for automatic zoom, enter integer value for manual zoom\nEg. value: 5 will fetch plots up to 5 km diagonally from site in both directions.)",
-                 "Neighbour list (comma separated), if blank first tier neighbours will be considered", "Carrier List(comma separated)", ""]
-            ]
-            for site in lte_sites:
-                earfcns = sorted(set(self.get_column_value(record, self.mappings["LTE"]["EARFCNDL"], "LTE")
-                                   for tech, record in st.session_state.matched_records
-                                   if tech == "LTE" and self.get_column_value(record, self.mappings["LTE"]["Site"], "LTE") == site
-                                   and self.get_column_value(record, self.mappings["LTE"]["EARFCNDL"], "LTE")))
-                lte_data.append([site, "0", "", ",".join(earfcns), ""])
-            ws_lte = wb.create_sheet("LTE")
-            for row in lte_data:
-                ws_lte.append(row)
-
-            # NR Sheet (Fixed at line 814)
-            nr_data = [
-                ["Type", "Value", "Remarks", "Buffer", "", ""],
-                ["projectName", st.session_state.project_name, "", "0.01", "", ""],
-                ["startTime", datetime.now().strftime("%Y-%m-%d %H:%M:%S"), "Use exact format. Add \" ' \" before", "Default keep it 0.01. Can increase it to accommodate TA Plot", "", ""],
-                ["endTime", datetime.now().strftime("%Y-%m-%d %H:%M:%S"), "Use exact format. Add \" ' \" before", "", "", ""],
-                ["Site Name List", "ZOOM (Default = 0 for automatic zoom, enter integer value for manual zoom\nEg. value: 5 will fetch plots up to 5 km diagonally from site in both directions.)",
-                 "Neighbour list (comma separated), if blank first tier neighbours will be considered",
-                 "Carrier List(comma separated)", "", ""]
-            ]
-            for site in nr_sites:
-                arfcns = sorted(set(self.get_column_value(record, self.mappings["5GNR"]["SSBFREQUENCY"], "5GNR")
-                                  for tech, record in st.session_state.matched_records
-                                  if tech == "5GNR" and self.get_column_value(record, self.mappings["5GNR"]["Site"], "5GNR") == site
-                                  and self.get_column_value(record, self.mappings["5GNR"]["SSBFREQUENCY"], "5GNR")))
-                nr_data.append([site, "0", "", ",".join(arfcns), "", ""])
-            ws_nr = wb.create_sheet("NR")
-            for row in nr_data:
-                ws_nr.append(row)
-
-            wb.remove(wb["Sheet"])
-            output = io.BytesIO()
-            wb.save(output)
-            output.seek(0)
-            st.download_button(label="Download VDT Report", data=output, file_name="VDT_Report.xlsx",
+            st.download_button(label="Download VDT Report", data=content, file_name="VDT_Report.xlsx",
                              mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
-            self.update_status(f"VDT report generated with {len(lte_sites)} LTE and {len(nr_sites)} NR sites")
+            self.update_status(f"VDT report generated with {lte_count} LTE and {nr_count} NR sites")
         except Exception as e:
             logging.error(f"Error in generate_vdt_report: {str(e)}")
             self.update_status(f"Error generating VDT report: {str(e)}")
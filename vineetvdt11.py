@@ -3,12 +3,16 @@ import os
 import streamlit as st
 import logging
 from datetime import datetime
-import openpyxl
 import math
 from math import radians, sin, cos, sqrt, atan2
 import io
 import base64
 import difflib
+from network_data import vdt_report_bytes
+from neighbours import network_neighbours
+from site_distances import site_points, nearest_site_table, distance_stats, site_pair_table
+from export_engine import write_xlsx_sheets
+from route_optimizer import optimize_route
 
 # Configure logging
 logging.basicConfig(filename='network_search.log', level=logging.ERROR,
@@ -374,6 +378,15 @@ class NetworkSearchApp:
                     self.calculate_path_distances()
                 if st.button("Calculate from Master"):
                     self.calculate_from_master()
+                if st.button("Optimize Route"):
+                    self.optimize_point_route()
+                if st.button("Nearest Site Stats"):
+                    self.calculate_nearest_sites()
+                pair_km = st.number_input("Site pairs within (km):", min_value=0.1, value=10.0, key="site_pair_km")
+                if len(st.session_state.points) >= 2:
+                    st.download_button("Export Site Distances", self.site_distances_bytes(pair_km),
+                                       file_name="site_distances.xlsx",
+                                       mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
                 if 'distance_results' in st.session_state and st.session_state.distance_results:
                     st.text_area("Distance Results:", st.session_state.distance_results, height=300, key="distance_results")
             with dist_tabs[1]:
@@ -581,57 +594,22 @@ class NetworkSearchApp:
             self.update_status(f"Generated {len(cr_data)} 5G CRs for {nr_cr_type}")
 
     def generate_vdt_report(self, project_name):
-        lte_sites = sorted(set(self.get_column_value(record, self.mappings["LTE"]["Site"], "LTE")
-                             for tech, record in st.session_state.matched_records if tech == "LTE" and self.get_column_value(record, self.mappings["LTE"]["Site"], "LTE")))
-        nr_sites = sorted(set(self.get_column_value(record, self.mappings["5GNR"]["Site"], "5GNR")
-                            for tech, record in st.session_state.matched_records if tech == "5GNR" and self.get_column_value(record, self.mappings["5GNR"]["Site"], "5GNR")))
-        if not lte_sites and not nr_sites:
+        """Generate VDT report Excel"""
+        # First-tier neighbours come from every loaded site, not just the matched ones
+        neighbours = network_neighbours({"LTE": st.session_state.lte_data, "5GNR": st.session_state.nr_data},
+                                        self.mappings)
+        content, lte_count, nr_count = vdt_report_bytes(project_name, st.session_state.matched_records,
+                                                        self.mappings, neighbours=neighbours)
+        if content is None:
             st.error("No sites found in VDT tab. Please generate VDT data first.")
             return
-        wb = openpyxl.Workbook()
-        # LTE Sheet
-        lte_data = [
-            ["Type", "Value", "Remarks", "Buffer", ""],
-            ["projectName", project_name, "", "0.01", ""],
-            ["startTime", datetime.now().strftime("%Y-%m-%d %H:%M:%S"), "Use exact format. Add \" ' \" before", "Default keep it 0.01. Can increase it to accommodate TA Plot", ""],
-            ["endTime", datetime.now().strftime("%Y-%m-%d %H:%M:%S"), "Use exact format. Add \" ' \" before", "", ""],
-            ["Site Name List", "ZOOM (Default = 0 for automatic zoom, enter integer value for manual zoom\nEg. value: 5 will fetch plots up to 5 km diagonally from site in both directions.)",
-             "Neighbour list (comma separated), if blank first tier neighbours will be considered", "Carrier List(comma separated)", ""]
-        ]
-        for site in lte_sites:
-            earfcns = sorted(set(self.get_column_value(record, self.mappings["LTE"]["EARFCNDL"], "LTE")
-                               for tech, record in st.session_state.matched_records
-                               if tech == "LTE" and self.get_column_value(record, self.mappings["LTE"]["Site"], "LTE") == site
-                               and self.get_column_value(record, self.mappings["LTE"]["EARFCNDL"], "LTE")))
-            lte_data.append([site, "0", "", ",".join(earfcns), ""])
-        ws_lte = wb.create_sheet("LTE")
-        for row in lte_data:
-            ws_lte.append(row)
-        # NR Sheet
-        nr_data = [
-            ["Type", "Value", "Remarks", "Buffer", "", ""],
-            ["projectName", project_name, "", "0.01", "", ""],
-            ["startTime", datetime.now().strftime("%Y-%m-%d %H:%M:%S"), "Use exact format. Add \" ' \" before", "Default keep it 0.01. Can increase it to accommodate TA Plot", "", ""],
-            ["endTime", datetime.now().strftime("%Y-%m-%d %H:%M:%S"), "Use exact format. Add \" ' \" before", "", "", ""],
-            ["Site Name List", "ZOOM (Default = 0 for automatic zoom, enter integer value for manual zoom\nEg. value: 5 will fetch plots up to 5 km diagonally from site in both directions.)",
-             "Neighbour list (comma separated), if blank first tier neighbours will be considered", "Carrier List(comma separated)", "", ""]
-        ]
-        for site in nr_sites:
-            arfcns = sorted(set(self.get_column_value(record, self.mappings["5GNR"]["SSBFREQUENCY"], "5GNR")
-                              for tech, record in st.session_state.matched_records
-                              if tech == "5GNR" and self.get_column_value(record, self.mappings["5GNR"]["Site"], "5GNR") == site
-                              and self.get_column_value(record, self.mappings["5GNR"]["SSBFREQUENCY"], "5GNR")))
-            nr_data.append([site, "0", "", ",".join(arfcns), "", ""])
-        ws_nr = wb.create_sheet("NR")
-        for row in nr_data:
-            ws_nr.append(row)
-        wb.remove(wb["Sheet"])
-        output = io.BytesIO()
-        wb.save(output)
-        output.seek(0)
-        st.download_button(label="Download VDT Report", data=output, file_name="VDT_Report.xlsx",
-                         mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
-        self.update_status(f"VDT report generated with {len(lte_sites)} LTE and {len(nr_sites)} NR sites")
+        st.download_button(
+            label="Download VDT Report",
+            data=content,
+            file_name="VDT_Report.xlsx",
+            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        )
+        self.update_status(f"VDT report generated with {lte_count} LTE and {nr_count} NR sites")
 
     def add_point(self, name, lat, lon):
         try:
@@ -714,6 +692,51 @@ class NetworkSearchApp:
         st.session_state.distance_results = "\n".join(results)
         self.update_status(f"Calculated distances from master point {master[0]}")
 
+    def optimize_point_route(self):
+        points = st.session_state.points
+        if len(points) < 3:
+            st.error("Need at least 3 points to optimize a route")
+            return
+        master = st.session_state.master_point
+        start = points.index(master) if master in points else 0
+        order, original_km, optimized_km = optimize_route(points, start)
+        st.session_state.points = [points[i] for i in order]
+        # The map and the leg list below follow the new order
+        st.session_state.distance_results = "\n".join([
+            f"Optimized route from {st.session_state.points[0][0]}: {optimized_km:.2f} km "
+            f"(original order {original_km:.2f} km, saved {original_km - optimized_km:.2f} km)",
+            ""
+        ] + [f"{a[0]} to {b[0]}: {self.haversine_distance(a[1], a[2], b[1], b[2]):.2f} km"
+             for a, b in zip(st.session_state.points, st.session_state.points[1:])])
+        self.update_status(f"Optimized route over {len(points)} points, saved {original_km - optimized_km:.2f} km")
+
+    def calculate_nearest_sites(self):
+        if len(st.session_state.points) < 2:
+            st.error("Need at least 2 points to find nearest sites")
+            return
+        table = nearest_site_table(st.session_state.points)
+        stats = distance_stats(table["Distance (km)"])
+        results = [f"Sites: {len(table)}"]
+        if stats["count"]:
+            results += [f"{label} nearest-site distance: {stats[key]:.3f} km"
+                        for label, key in [("Min", "min"), ("Mean", "mean"), ("Median", "median"),
+                                           ("90th percentile", "p90"), ("Max", "max")]]
+        results.append("")
+        results += [f"{row[0]} -> {row[3]}: {row[4]:.3f} km"
+                    for row in table.sort_values("Distance (km)").itertuples(index=False)]
+        st.session_state.distance_results = "\n".join(results)
+        self.update_status(f"Nearest-site distances for {len(table)} sites")
+
+    def site_distances_bytes(self, max_km):
+        nearest = nearest_site_table(st.session_state.points)
+        pairs = site_pair_table(st.session_state.points, max_km)
+        output = io.BytesIO()
+        write_xlsx_sheets([
+            ("Nearest Site", list(nearest.columns), nearest.itertuples(index=False, name=None)),
+            (f"Pairs within {max_km:g} km", list(pairs.columns), pairs.itertuples(index=False, name=None))
+        ], output)
+        return output.getvalue()
+
     def haversine_distance(self, lat1, lon1, lat2, lon2):
         R = 6371  # Earth radius in kilometers
         lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
@@ -763,13 +786,15 @@ class NetworkSearchApp:
     def use_for_distance(self, df):
         try:
             if 'LATITUDE' in df.columns and 'LONGITUDE' in df.columns:
-                for _, row in df.iterrows():
-                    lat = float(row['LATITUDE']) if pd.notna(row['LATITUDE']) else None
-                    lon = float(row['LONGITUDE']) if pd.notna(row['LONGITUDE']) else None
-                    if lat is not None and lon is not None:
-                        name = row.get('Site', f"Point {len(st.session_state.points) + 1}")
-                        self.add_point(name, lat, lon)
-                self.update_status(f"Added {len(df)} points from search results")
+                # One point per site, at the mean position of its cells
+                if 'Site' in df.columns:
+                    sites = df['Site'].fillna("").astype(str)
+                else:
+                    sites = df['LATITUDE'].astype(str) + "," + df['LONGITUDE'].astype(str)
+                existing = {p[0] for p in st.session_state.points}
+                new_points = [p for p in site_points(sites, df['LATITUDE'], df['LONGITUDE']) if p[0] not in existing]
+                st.session_state.points.extend(new_points)
+                self.update_status(f"Added {len(new_points)} sites from {len(df)} search results")
             else:
                 st.error("Selected data must contain LATITUDE and LONGITUDE columns")
         except Exception as e:
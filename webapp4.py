@@ -3,7 +3,6 @@ import os
 import streamlit as st
 import logging
 from datetime import datetime
-import openpyxl
 import math
 from math import radians, sin, cos, sqrt, atan2
 import webbrowser
@@ -12,6 +11,9 @@ import requests
 import tempfile
 import base64
 import numpy as np
+from network_data import vdt_report_bytes
+from neighbours import network_neighbours
+from map_html import build_map_html
 
 # Configure logging
 logging.basicConfig(filename='network_search.log', level=logging.ERROR,
@@ -652,73 +654,21 @@ class NetworkSearchApp:
 
     def generate_vdt_report(self):
         """Generate VDT report Excel"""
-        lte_sites = sorted(set(row["Site"] for row in [
-            {
-                "Site": self.get_column_value(record, self.mappings["LTE"]["Site"], "LTE")
-            } for tech, record in st.session_state.matched_records if tech == "LTE"
-        ] if row["Site"]))
-        nr_sites = sorted(set(row["SITE"] for row in [
-            {
-                "SITE": self.get_column_value(record, self.mappings["5GNR"]["Site"], "5GNR")
-            } for tech, record in st.session_state.matched_records if tech == "5GNR"
-        ] if row["SITE"]))
-        if not lte_sites and not nr_sites:
+        # First-tier neighbours come from every loaded site, not just the matched ones
+        neighbours = network_neighbours({"LTE": st.session_state.lte_data, "5GNR": st.session_state.nr_data},
+                                        self.mappings)
+        content, lte_count, nr_count = vdt_report_bytes(st.session_state.project_name, st.session_state.matched_records,
+                                                        self.mappings, neighbours=neighbours)
+        if content is None:
             st.error("No sites found in VDT tab. Please generate VDT data first.")
             return
-        wb = openpyxl.Workbook()
-        # LTE Sheet
-        lte_data = [
-            ["Type", "Value", "Remarks", "Buffer", ""],
-            ["projectName", st.session_state.project_name, "", "0.01", ""],
-            ["startTime", datetime.now().strftime("%Y-%m-%d %H:%M:%S"), "Use exact format. Add \" ' \" before", "Default keep it 0.01. Can increase it to accommodate TA Plot", ""],
-            ["endTime", datetime.now().strftime("%Y-%m-%d %H:%M:%S"), "Use exact format. Add \" ' \" before", "", ""],
-            ["Site Name List", "ZOOM (Default = 0 for automatic zoom, enter integer value for manual zoom\nEg. value: 5 will fetch plots up to 5 km diagonally from site in both directions.", 
-             "Neighbour list (comma separated), if blank first tier neighbours will be considered", 
-             "Carrier List(comma separated)", ""]
-        ]
-        for site in lte_sites:
-            earfcns = sorted(set(
-                self.get_column_value(record, self.mappings["LTE"]["EARFCNDL"], "LTE")
-                for tech, record in st.session_state.matched_records
-                if tech == "LTE" and self.get_column_value(record, self.mappings["LTE"]["Site"], "LTE") == site
-                and self.get_column_value(record, self.mappings["LTE"]["EARFCNDL"], "LTE")
-            ))
-            lte_data.append([site, "0", "", ",".join(earfcns), ""])
-        ws_lte = wb.create_sheet("LTE")
-        for row in lte_data:
-            ws_lte.append(row)
-        # NR Sheet
-        nr_data = [
-            ["Type", "Value", "Remarks", "Buffer", "", ""],
-            ["projectName", st.session_state.project_name, "", "0.01", "", ""],
-            ["startTime", datetime.now().strftime("%Y-%m-%d %H:%M:%S"), "Use exact format. Add \" ' \" before", "Default keep it 0.01. Can increase it to accommodate TA Plot", "", ""],
-            ["endTime", datetime.now().strftime("%Y-%m-%d %H:%M:%S"), "Use exact format. Add \" ' \" before", "", "", ""],
-            ["Site Name List", "ZOOM (Default = 0 for automatic zoom, enter integer value for manual zoom\nEg. value: 5 will fetch plots up to 5 km diagonally from site in both directions.", 
-             "Neighbour list (comma separated), if blank first tier neighbours will be considered", 
-             "Carrier List(comma separated)", "", ""]
-        ]
-        for site in nr_sites:
-            arfcns = sorted(set(
-                self.get_column_value(record, self.mappings["5GNR"]["SSBFREQUENCY"], "5GNR")
-                for tech, record in st.session_state.matched_records
-                if tech == "5GNR" and self.get_column_value(record, self.mappings["5GNR"]["Site"], "5GNR") == site
-                and self.get_column_value(record, self.mappings["5GNR"]["SSBFREQUENCY"], "5GNR")
-            ))
-            nr_data.append([site, "0", "", ",".join(arfcns), "", ""])
-        ws_nr = wb.create_sheet("NR")
-        for row in nr_data:
-            ws_nr.append(row)
-        wb.remove(wb["Sheet"])
-        output = io.BytesIO()
-        wb.save(output)
-        output.seek(0)
         st.download_button(
             label="Download VDT Report",
-            data=output,
+            data=content,
             file_name="VDT_Report.xlsx",
             mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
         )
-        self.update_status(f"VDT report generated with {len(lte_sites)} LTE and {len(nr_sites)} NR sites")
+        self.update_status(f"VDT report generated with {lte_count} LTE and {nr_count} NR sites")
 
     def add_point(self, name, lat, lon):
         """Add a point to the distance calculator"""
@@ -885,148 +835,13 @@ class NetworkSearchApp:
     def generate_map_html(self):
         """Generate HTML with Google Maps showing all points with names and distances"""
         try:
-            html = f"""
-            <!DOCTYPE html>
-            <html>
-            <head>
-                <title>Network Points Map</title>
-                <style>
-                    body {{ margin: 0; padding: 0; }}
-                    #map {{ height: 100vh; width: 100%; }}
-                    #info-panel {{ position: absolute; top: 10px; left: 10px; background: white; padding: 10px; z-index: 1000; }}
-                </style>
-            </head>
-            <body>
-                <div id="info-panel"></div>
-                <div id="map"></div>
-                <script>
-                    function initMap() {{
-                        const map = new google.maps.Map(document.getElementById("map"), {{
-                            zoom: {st.session_state.map_zoom},
-                            center: {{ lat: {st.session_state.points[0][1] if st.session_state.points else 0}, lng: {st.session_state.points[0][2] if st.session_state.points else 0} }},
-                            mapTypeId: '{st.session_state.map_type}'
-                        }});
-                        const infoWindow = new google.maps.InfoWindow();
-                        const infoPanel = document.getElementById("info-panel");
-                        const markers = [];
-                        let infoContent = "<h3>Points and Distances</h3><ul>";
-                        {self.generate_markers_js()}
-                        {self.generate_paths_js()}
-                        {self.generate_master_info_js()}
-                        infoContent += "</ul>";
-                        infoPanel.innerHTML = infoContent;
-                    }}
-                </script>
-                <script async defer src="https://maps.googleapis.com/maps/api/js?key={self.api_key}&libraries=geometry&loading=async&callback=initMap"></script>
-            </body>
-            </html>
-            """
-            return html
+            return build_map_html(st.session_state.points, self.api_key, st.session_state.master_point,
+                                  zoom=st.session_state.map_zoom, map_type=st.session_state.map_type,
+                                  label_style="letter")
         except Exception as e:
             logging.error(f"Error in generate_map_html: {str(e)}")
             return "<html><body>Error generating map</body></html>"
 
-    def generate_markers_js(self):
-        """Generate JavaScript code for markers"""
-        try:
-            js_code = ""
-            for i, (name, lat, lon) in enumerate(st.session_state.points):
-                js_code += f"""
-                    const marker{i} = new google.maps.Marker({{
-                        position: {{ lat: {lat}, lng: {lon} }},
-                        map: map,
-                        title: "{name}",
-                        label: "{chr(65 + i)}"
-                    }});
-                    marker{i}.addListener('click', function() {{
-                        infoWindow.setContent('<div><strong>{name}</strong><br>Lat: {lat:.6f}<br>Lon: {lon:.6f}</div>');
-                        infoWindow.open(map, marker{i});
-                    }});
-                    markers.push(marker{i});
-                    infoContent += "<li><strong>{name}</strong> (Lat: {lat:.6f}, Lon: {lon:.6f})</li>";
-                """
-            return js_code
-        except Exception as e:
-            logging.error(f"Error in generate_markers_js: {str(e)}")
-            return ""
-
-    def generate_paths_js(self):
-        """Generate JavaScript code for paths and distances"""
-        try:
-            if len(st.session_state.points) < 2:
-                return ""
-            js_code = "const pathCoordinates = ["
-            for _, lat, lon in st.session_state.points:
-                js_code += f"{{lat: {lat}, lng: {lon}}},"
-            js_code += "];"
-            js_code += """
-            const path = new google.maps.Polyline({
-                path: pathCoordinates,
-                geodesic: true,
-                strokeColor: "#FF0000",
-                strokeOpacity: 1.0,
-                strokeWeight: 2
-            });
-            path.setMap(map);
-            """
-            for i in range(len(st.session_state.points) - 1):
-                name1, lat1, lon1 = st.session_state.points[i]
-                name2, lat2, lon2 = st.session_state.points[i + 1]
-                distance = self.calculate_distance(lat1, lon1, lat2, lon2)
-                mid_lat = (lat1 + lat2) / 2
-                mid_lon = (lon1 + lon2) / 2
-                js_code += f"""
-                const distanceMarker{i} = new google.maps.Marker({{
-                    position: {{ lat: {mid_lat}, lng: {mid_lon} }},
-                    map: map,
-                    icon: {{
-                        path: google.maps.SymbolPath.CIRCLE,
-                        scale: 0
-                    }},
-                    label: {{
-                        text: "{distance:.2f} km",
-                        color: "#0000FF",
-                        fontSize: "12px",
-                        fontWeight: "bold"
-                    }}
-                }});
-                """
-            return js_code
-        except Exception as e:
-            logging.error(f"Error in generate_paths_js: {str(e)}")
-            return ""
-
-    def generate_master_info_js(self):
-        """Generate JavaScript code for master point info"""
-        try:
-            if not st.session_state.master_point:
-                return ""
-            master_name, master_lat, master_lon = st.session_state.master_point
-            js_code = f"""
-            const masterMarker = new google.maps.Marker({{
-                position: {{ lat: {master_lat}, lng: {master_lon} }},
-                map: map,
-                title: "Master: {master_name}",
-                label: "M",
-                icon: {{
-                    url: "http://maps.google.com/mapfiles/ms/icons/blue-dot.png"
-                }}
-            }});
-            infoContent += "<h4>Distances from Master Point:</h4><ul>";
-            """
-            for name, lat, lon in st.session_state.points:
-                if (name, lat, lon) == st.session_state.master_point:
-                    continue
-                distance = self.calculate_distance(master_lat, master_lon, lat, lon)
-                js_code += f"""
-                infoContent += "<li>{master_name} to {name}: {distance:.3f} km</li>";
-                """
-            js_code += "infoContent += \"</ul>\";"
-            return js_code
-        except Exception as e:
-            logging.error(f"Error in generate_master_info_js: {str(e)}")
-            return ""
-
     def show_map(self):
         """Show map with all points"""
         if not st.session_state.points:
@@ -3,15 +3,31 @@ import os
 import streamlit as st
 import logging
 from datetime import datetime
-import openpyxl
 import math
 from math import radians, sin, cos, sqrt, atan2
 import webbrowser
 import io
 import requests
 import tempfile
+import time
+import uuid
 import base64
 import numpy as np
+from query_cache import QueryCache
+from network_data import NetworkDataset, RANGE_INDEX_FIELDS, vdt_report_bytes
+from neighbours import cached_neighbours
+from query_planner import QueryPlanner, QueryError, range_query
+from export_engine import export_dataframe, EXPORT_FORMATS
+from vdt_batch import generate_vdt_batch, describe_result
+from map_html import build_map_html
+from site_plot import dataset_sectors, render_site_plot, plot_png_bytes
+from colocation import dataset_colocation
+from dss_audit import validate_dss, describe_dss
+
+# Exports are written under the app's static folder (served with server.enableStaticServing, see
+# .streamlit/config.toml) and removed after an hour
+EXPORT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static", "exports")
+EXPORT_MAX_AGE_SECONDS = 3600
 
 # Configure logging
 logging.basicConfig(filename='network_search.log', level=logging.ERROR,
@@ -66,6 +82,16 @@ class NetworkSearchApp:
             st.session_state.auto_generate = True
         if 'distance_results' not in st.session_state:
             st.session_state.distance_results = ""
+        if 'data_version' not in st.session_state:
+            st.session_state.data_version = 0
+        if 'query_cache' not in st.session_state:
+            st.session_state.query_cache = QueryCache(max_entries=256, max_bytes=256 * 1024 * 1024)
+        if 'dataset' not in st.session_state:
+            st.session_state.dataset = NetworkDataset()
+        if 'colocation' not in st.session_state:
+            st.session_state.colocation = dataset_colocation(st.session_state.dataset)
+        if 'export_format' not in st.session_state:
+            st.session_state.export_format = "xlsx"
 
         # Market mapping
         self.market_mapping = {
@@ -173,6 +199,9 @@ class NetworkSearchApp:
         with col3:
             if st.button("Search"):
                 self.perform_search()
+        self.create_range_filter_panel()
+        self.create_cache_stats_panel()
+        st.selectbox("Export Format:", EXPORT_FORMATS, key="export_format")
 
         # Tabs
         tabs = st.tabs(["Main Results", "LTE Parameters", "5G Parameters", "VDT Sheet", "Distance Calculator"])
@@ -197,6 +226,36 @@ class NetworkSearchApp:
         with tabs[4]:
             self.create_distance_tab()
 
+    def create_range_filter_panel(self):
+        """Numeric range filter answered from the dataset's sorted range indexes"""
+        with st.expander("Range Filter"):
+            col1, col2, col3, col4, col5 = st.columns([2, 1, 1, 2, 1])
+            with col1:
+                st.selectbox("Parameter:", RANGE_INDEX_FIELDS, key="range_field")
+            with col2:
+                st.text_input("Min:", key="range_min")
+            with col3:
+                st.text_input("Max:", key="range_max")
+            with col4:
+                st.selectbox("Market:", [""] + st.session_state.dataset.markets(), key="range_market")
+            with col5:
+                if st.button("Filter", key="range_filter"):
+                    self.perform_range_filter()
+
+    def create_cache_stats_panel(self):
+        """Show query cache hit rate and time saved"""
+        stats = st.session_state.query_cache.stats()
+        with st.expander("Query Cache Stats"):
+            col1, col2, col3, col4 = st.columns([1, 1, 1, 1])
+            col1.metric("Hit Rate", f"{stats['hit_rate'] * 100:.1f}%", f"{stats['hits']} hits / {stats['misses']} misses")
+            col2.metric("Time Saved", f"{stats['saved_seconds']:.2f} s")
+            col3.metric("Entries", stats["entries"], f"{stats['evictions']} evicted", delta_color="off")
+            col4.metric("Size", f"{stats['bytes'] / (1024 * 1024):.1f} MB")
+            if st.button("Clear Cache", key="clear_query_cache"):
+                st.session_state.query_cache.clear()
+                st.session_state.query_cache.reset_stats()
+                self.update_status("Query cache cleared")
+
     def create_main_tab(self):
         """Create main results tab"""
         st.subheader("Main Results")
@@ -313,6 +372,8 @@ class NetworkSearchApp:
                 self.generate_vdt_report()
         with col3:
             st.checkbox("Auto-Generate on Search", value=st.session_state.auto_generate, key="auto_generate")
+        if st.button("Generate All Markets (Zip)", key="vdt_batch"):
+            self.generate_vdt_batch()
         if not st.session_state.vdt_data.empty:
             st.dataframe(st.session_state.vdt_data, use_container_width=True)
 
@@ -364,6 +425,8 @@ class NetworkSearchApp:
                     st.number_input("Zoom:", min_value=1, max_value=20, value=st.session_state.map_zoom, key="map_zoom")
                 if st.button("Show Map", key="show_map"):
                     self.show_map()
+                if st.button("Offline Plot", key="offline_plot"):
+                    self.show_site_plot()
                 if st.session_state.points:
                     st.write("Map Legend:")
                     for i, (name, _, _) in enumerate(st.session_state.points):
@@ -389,8 +452,21 @@ class NetworkSearchApp:
             st.session_state.lte_data = pd.concat(new_lte_data, ignore_index=True) if new_lte_data else pd.DataFrame()
             st.session_state.nr_data = pd.concat(new_nr_data, ignore_index=True) if new_nr_data else pd.DataFrame()
             st.session_state.bbu_data = pd.concat(new_bbu_data, ignore_index=True) if new_bbu_data else pd.DataFrame()
+            # Numeric parameters are parsed and range-indexed once per load
+            dataset = NetworkDataset(self.mappings)
+            dataset.set_frames(st.session_state.lte_data, st.session_state.nr_data, st.session_state.bbu_data)
+            dataset.build_range_indexes()
+            st.session_state.dataset = dataset
+            st.session_state.colocation = dataset_colocation(dataset)
+            st.session_state.dss_issues, dss_summary = validate_dss(dataset)
+            # New data version invalidates every cached search result
+            st.session_state.data_version += 1
+            st.session_state.query_cache.clear()
             self.update_status(f"Loaded {len(files)} files")
             st.success("Data loading completed!")
+            if not st.session_state.dss_issues.empty:
+                st.warning(describe_dss(dss_summary))
+                st.dataframe(st.session_state.dss_issues)
         except Exception as e:
             logging.error(f"Error in load_data: {str(e)}")
             self.update_status(f"Error loading files: {str(e)}")
@@ -421,98 +497,145 @@ class NetworkSearchApp:
         if not st.session_state.search_value:
             st.error("Please enter a search value")
             return
+        key = (
+            st.session_state.search_type,
+            st.session_state.search_value.strip().lower(),
+            st.session_state.data_version,
+            tuple(st.session_state.lte_columns),
+            tuple(st.session_state.nr_columns)
+        )
+        new_matched_records, lte_data, nr_data = st.session_state.query_cache.get_or_compute(key, self.run_search)
+        st.session_state.matched_records = new_matched_records
+        if st.session_state.auto_generate:
+            self.generate_vdt_data(lte_data, nr_data)
+        self.update_status(f"Found {len(new_matched_records)} matching records")
+        st.success(f"Found {len(new_matched_records)} matching records")
+
+    def run_search(self):
+        """Scan the loaded data for the current search and build the tab rows"""
         new_matched_records = []
-        main_data = []
         lte_data = []
         nr_data = []
+        search_value = st.session_state.search_value.strip().lower()
         def search_in_data(data, tech):
             mapping = self.mappings[tech][st.session_state.search_type]
             for _, record in data.iterrows():
                 for col_name in mapping:
                     if col_name in record and pd.notna(record[col_name]) and \
-                       st.session_state.search_value.lower() in str(record[col_name]).lower():
-                        new_matched_records.append((tech, record.to_dict()))
-                        row_data = {"Source": tech}
-                        for key in self.mappings[tech]:
-                            row_data[key] = self.get_column_value(record, self.mappings[tech][key], tech)
-                        main_data.append(row_data)
-                        if tech == "LTE":
-                            lte_row = {
-                                "Source": tech,
-                                "Site": row_data["Site"],
-                                "cell": row_data["cell"],
-                                "CELLRANGE": row_data["CELLRANGE"],
-                                "CRSGAIN": row_data["CRSGAIN"],
-                                "QRXLEVMIN": row_data["QRXLEVMIN"],
-                                "EARFCNDL": row_data["EARFCNDL"]
-                            }
-                            for col in st.session_state.lte_columns:
-                                if col not in lte_row:
-                                    lte_row[col] = self.get_column_value(record, [col], tech)
-                            lte_data.append(lte_row)
-                        elif tech == "5GNR":
-                            nr_row = {
-                                "Source": tech,
-                                "USID": row_data["USID"],
-                                "SITE": row_data["Site"],
-                                "NRCELL_NAME": row_data["cell"],
-                                "Digital Tilt": row_data["Digital Tilt"],
-                                "Power": row_data["Power"],
-                                "PCI": row_data["PCI"],
-                                "ADMINISTRATIVESTATE": row_data["ADMINISTRATIVESTATE"],
-                                "CELLBARRED": row_data["CELLBARRED"],
-                                "CELLRESERVEDFOROPERATOR": row_data["CELLRESERVEDFOROPERATOR"],
-                                "OPERATIONALSTATE": row_data["OPERATIONALSTATE"],
-                                "CELLRANGE": row_data["CELLRANGE"],
-                                "SSBFREQUENCY": row_data["SSBFREQUENCY"],
-                                "CONFIGURATION": row_data["CONFIGURATION"]
-                            }
-                            for col in st.session_state.nr_columns:
-                                if col not in nr_row:
-                                    nr_row[col] = self.get_column_value(record, [col], tech)
-                            nr_data.append(nr_row)
+                       search_value in str(record[col_name]).lower():
+                        self.append_result_rows(tech, record, new_matched_records, lte_data, nr_data)
                         break
         if not st.session_state.lte_data.empty:
             search_in_data(st.session_state.lte_data, "LTE")
         if not st.session_state.nr_data.empty:
             search_in_data(st.session_state.nr_data, "5GNR")
+        return new_matched_records, lte_data, nr_data
+
+    def append_result_rows(self, tech, record, new_matched_records, lte_data, nr_data):
+        """Add one matched record and its LTE / 5G tab row"""
+        new_matched_records.append((tech, record.to_dict()))
+        row_data = {"Source": tech}
+        for key in self.mappings[tech]:
+            row_data[key] = self.get_column_value(record, self.mappings[tech][key], tech)
+        if tech == "LTE":
+            lte_row = {
+                "Source": tech,
+                "Site": row_data["Site"],
+                "cell": row_data["cell"],
+                "CELLRANGE": row_data["CELLRANGE"],
+                "CRSGAIN": row_data["CRSGAIN"],
+                "QRXLEVMIN": row_data["QRXLEVMIN"],
+                "EARFCNDL": row_data["EARFCNDL"]
+            }
+            for col in st.session_state.lte_columns:
+                if col not in lte_row:
+                    lte_row[col] = self.get_column_value(record, [col], tech)
+            lte_data.append(lte_row)
+        elif tech == "5GNR":
+            nr_row = {
+                "Source": tech,
+                "USID": row_data["USID"],
+                "SITE": row_data["Site"],
+                "NRCELL_NAME": row_data["cell"],
+                "Digital Tilt": row_data["Digital Tilt"],
+                "Power": row_data["Power"],
+                "PCI": row_data["PCI"],
+                "ADMINISTRATIVESTATE": row_data["ADMINISTRATIVESTATE"],
+                "CELLBARRED": row_data["CELLBARRED"],
+                "CELLRESERVEDFOROPERATOR": row_data["CELLRESERVEDFOROPERATOR"],
+                "OPERATIONALSTATE": row_data["OPERATIONALSTATE"],
+                "CELLRANGE": row_data["CELLRANGE"],
+                "SSBFREQUENCY": row_data["SSBFREQUENCY"],
+                "CONFIGURATION": row_data["CONFIGURATION"]
+            }
+            for col in st.session_state.nr_columns:
+                if col not in nr_row:
+                    nr_row[col] = self.get_column_value(record, [col], tech)
+            nr_data.append(nr_row)
+
+    def perform_range_filter(self):
+        """Run the range filter through the query planner and show its matches"""
+        try:
+            query_text = range_query(st.session_state.range_field, st.session_state.range_min,
+                                     st.session_state.range_max, st.session_state.range_market)
+        except (QueryError, ValueError) as e:
+            st.error(f"Invalid range: {str(e)}")
+            return
+        key = ("RANGE", query_text, st.session_state.data_version,
+               tuple(st.session_state.lte_columns), tuple(st.session_state.nr_columns))
+
+        def run_range_filter():
+            result = QueryPlanner(st.session_state.dataset).execute(query_text, merge=False)
+            new_matched_records, lte_data, nr_data = [], [], []
+            for tech, record in result.records():
+                self.append_result_rows(tech, record, new_matched_records, lte_data, nr_data)
+            return new_matched_records, lte_data, nr_data, result.explain()
+
+        new_matched_records, lte_data, nr_data, plan = st.session_state.query_cache.get_or_compute(key, run_range_filter)
         st.session_state.matched_records = new_matched_records
         if st.session_state.auto_generate:
             self.generate_vdt_data(lte_data, nr_data)
-        self.update_status(f"Found {len(new_matched_records)} matching records")
+        self.update_status(f"Found {len(new_matched_records)} records for {query_text}")
         st.success(f"Found {len(new_matched_records)} matching records")
+        st.code(plan)
 
     def generate_vdt_data(self, lte_rows, nr_rows):
         """Generate VDT data"""
-        lte_sites = sorted(set(row["Site"] for row in lte_rows if row["Site"]))
-        nr_sites = sorted(set(row["SITE"] for row in nr_rows if row["SITE"]))
-        max_len = max(len(lte_sites), len(nr_sites))
-        vdt_rows = []
-        for i in range(max_len):
-            vdt_rows.append({
-                "LTE Site": lte_sites[i] if i < len(lte_sites) else "",
-                "NR Site": nr_sites[i] if i < len(nr_sites) else ""
-            })
-        st.session_state.vdt_data = pd.DataFrame(vdt_rows)
+        lte_sites = set(row["Site"] for row in lte_rows if row["Site"])
+        nr_sites = set(row["SITE"] for row in nr_rows if row["SITE"])
+        # Each LTE anchor sits beside its co-located NR sites; unpaired sites get their own row
+        vdt_rows = st.session_state.colocation.vdt_pairs(lte_sites, nr_sites)
+        st.session_state.vdt_data = pd.DataFrame(vdt_rows, columns=["LTE Site", "NR Site"])
         self.update_status(f"Generated VDT data with {len(vdt_rows)} rows")
 
     def export_to_excel(self, df, filename):
-        """Export DataFrame to Excel"""
+        """Export DataFrame in the selected format, streamed to disk and served from there"""
         try:
-            output = io.BytesIO()
-            df.to_excel(output, index=False)
-            output.seek(0)
-            st.download_button(
-                label=f"Download {filename}",
-                data=output,
-                file_name=filename,
-                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-            )
-            self.update_status(f"Exported {len(df)} rows to {filename}")
+            fmt = st.session_state.export_format
+            filename = f"{os.path.splitext(filename)[0]}.{fmt}"
+            os.makedirs(EXPORT_DIR, exist_ok=True)
+            self.remove_old_exports()
+            served_name = f"{uuid.uuid4().hex}_{filename}"
+            stats = export_dataframe(df, os.path.join(EXPORT_DIR, served_name), fmt)
+            # Streamlit's static file handler streams the file, so it is never read into memory here
+            st.markdown(f'<a href="app/static/exports/{served_name}" download="{filename}">Download {filename}</a>',
+                        unsafe_allow_html=True)
+            self.update_status(f"Exported {filename}: {stats.summary()}")
         except Exception as e:
             logging.error(f"Error in export_to_excel: {str(e)}")
             st.error(f"Export failed: {str(e)}")
 
+    def remove_old_exports(self, max_age_seconds=EXPORT_MAX_AGE_SECONDS):
+        """Delete served exports older than max_age_seconds"""
+        cutoff = time.time() - max_age_seconds
+        for name in os.listdir(EXPORT_DIR):
+            path = os.path.join(EXPORT_DIR, name)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+            except OSError:
+                pass
+
     def export_lte_to_excel(self):
         """Export LTE data to Excel"""
         lte_data = [
@@ -654,73 +777,51 @@ class NetworkSearchApp:
 
     def generate_vdt_report(self):
         """Generate VDT report Excel"""
-        lte_sites = sorted(set(row["Site"] for row in [
-            {
-                "Site": self.get_column_value(record, self.mappings["LTE"]["Site"], "LTE")
-            } for tech, record in st.session_state.matched_records if tech == "LTE"
-        ] if row["Site"]))
-        nr_sites = sorted(set(row["SITE"] for row in [
-            {
-                "SITE": self.get_column_value(record, self.mappings["5GNR"]["Site"], "5GNR")
-            } for tech, record in st.session_state.matched_records if tech == "5GNR"
-        ] if row["SITE"]))
-        if not lte_sites and not nr_sites:
+        # First-tier neighbours come from every loaded site, not just the matched ones
+        neighbours = cached_neighbours(st.session_state.dataset)
+        content, lte_count, nr_count = vdt_report_bytes(st.session_state.project_name, st.session_state.matched_records,
+                                                        self.mappings, neighbours=neighbours)
+        if content is None:
             st.error("No sites found in VDT tab. Please generate VDT data first.")
             return
-        wb = openpyxl.Workbook()
-        # LTE Sheet
-        lte_data = [
-            ["Type", "Value", "Remarks", "Buffer", ""],
-            ["projectName", st.session_state.project_name, "", "0.01", ""],
-            ["startTime", datetime.now().strftime("%Y-%m-%d %H:%M:%S"), "Use exact format. Add \" ' \" before", "Default keep it 0.01. Can increase it to accommodate TA Plot", ""],
-            ["endTime", datetime.now().strftime("%Y-%m-%d %H:%M:%S"), "Use exact format. Add \" ' \" before", "", ""],
-            ["Site Name List", "ZOOM (Default = 0 for automatic zoom, enter integer value for manual zoom\nEg. value: 5 will fetch plots up to 5 km diagonally from site in both directions.", 
-             "Neighbour list (comma separated), if blank first tier neighbours will be considered", 
-             "Carrier List(comma separated)", ""]
-        ]
-        for site in lte_sites:
-            earfcns = sorted(set(
-                self.get_column_value(record, self.mappings["LTE"]["EARFCNDL"], "LTE")
-                for tech, record in st.session_state.matched_records
-                if tech == "LTE" and self.get_column_value(record, self.mappings["LTE"]["Site"], "LTE") == site
-                and self.get_column_value(record, self.mappings["LTE"]["EARFCNDL"], "LTE")
-            ))
-            lte_data.append([site, "0", "", ",".join(earfcns), ""])
-        ws_lte = wb.create_sheet("LTE")
-        for row in lte_data:
-            ws_lte.append(row)
-        # NR Sheet
-        nr_data = [
-            ["Type", "Value", "Remarks", "Buffer", "", ""],
-            ["projectName", st.session_state.project_name, "", "0.01", "", ""],
-            ["startTime", datetime.now().strftime("%Y-%m-%d %H:%M:%S"), "Use exact format. Add \" ' \" before", "Default keep it 0.01. Can increase it to accommodate TA Plot", "", ""],
-            ["endTime", datetime.now().strftime("%Y-%m-%d %H:%M:%S"), "Use exact format. Add \" ' \" before", "", "", ""],
-            ["Site Name List", "ZOOM (Default = 0 for automatic zoom, enter integer value for manual zoom\nEg. value: 5 will fetch plots up to 5 km diagonally from site in both directions.", 
-             "Neighbour list (comma separated), if blank first tier neighbours will be considered", 
-             "Carrier List(comma separated)", "", ""]
-        ]
-        for site in nr_sites:
-            arfcns = sorted(set(
-                self.get_column_value(record, self.mappings["5GNR"]["SSBFREQUENCY"], "5GNR")
-                for tech, record in st.session_state.matched_records
-                if tech == "5GNR" and self.get_column_value(record, self.mappings["5GNR"]["Site"], "5GNR") == site
-                and self.get_column_value(record, self.mappings["5GNR"]["SSBFREQUENCY"], "5GNR")
-            ))
-            nr_data.append([site, "0", "", ",".join(arfcns), "", ""])
-        ws_nr = wb.create_sheet("NR")
-        for row in nr_data:
-            ws_nr.append(row)
-        wb.remove(wb["Sheet"])
-        output = io.BytesIO()
-        wb.save(output)
-        output.seek(0)
         st.download_button(
             label="Download VDT Report",
-            data=output,
+            data=content,
             file_name="VDT_Report.xlsx",
             mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
         )
-        self.update_status(f"VDT report generated with {len(lte_sites)} LTE and {len(nr_sites)} NR sites")
+        self.update_status(f"VDT report generated with {lte_count} LTE and {nr_count} NR sites")
+
+    def generate_vdt_batch(self):
+        """One VDT report per ED_Market of the loaded data, bundled into a zip"""
+        try:
+            dataset = st.session_state.dataset
+            if dataset.lte_data.empty and dataset.nr_data.empty:
+                st.error("Please load data first")
+                return
+            bar = st.progress(0.0)
+            lines = st.empty()
+            done_lines = []
+
+            def progress(done, total, result):
+                done_lines.append(describe_result(result))
+                bar.progress(done / total, text=f"{done}/{total} markets")
+                lines.text("\n".join(done_lines))
+
+            start = datetime.now()
+            output = io.BytesIO()
+            results = generate_vdt_batch(dataset, output, market_mapping=self.market_mapping, progress=progress)
+            elapsed = (datetime.now() - start).total_seconds()
+            st.download_button(
+                label="Download VDT Reports",
+                data=output.getvalue(),
+                file_name=f"VDT_Reports_{datetime.now().strftime('%Y%m%d')}.zip",
+                mime="application/zip"
+            )
+            self.update_status(f"Generated {len(results)} VDT reports in {elapsed:.2f}s")
+        except Exception as e:
+            logging.error(f"Error in generate_vdt_batch: {str(e)}")
+            st.error(f"Failed to generate VDT reports: {str(e)}")
 
     def add_point(self, name, lat, lon):
         """Add a point to the distance calculator"""
@@ -887,148 +988,13 @@ class NetworkSearchApp:
     def generate_map_html(self):
         """Generate HTML with Google Maps showing all points with names and distances"""
         try:
-            html = f"""
-            <!DOCTYPE html>
-            <html>
-            <head>
-                <title>Network Points Map</title>
-                <style>
-                    body {{ margin: 0; padding: 0; }}
-                    #map {{ height: 100vh; width: 100%; }}
-                    #info-panel {{ position: absolute; top: 10px; left: 10px; background: white; padding: 10px; z-index: 1000; }}
-                </style>
-            </head>
-            <body>
-                <div id="info-panel"></div>
-                <div id="map"></div>
-                <script>
-                    function initMap() {{
-                        const map = new google.maps.Map(document.getElementById("map"), {{
-                            zoom: {st.session_state.map_zoom},
-                            center: {{ lat: {st.session_state.points[0][1] if st.session_state.points else 0}, lng: {st.session_state.points[0][2] if st.session_state.points else 0} }},
-                            mapTypeId: '{st.session_state.map_type}'
-                        }});
-                        const infoWindow = new google.maps.InfoWindow();
-                        const infoPanel = document.getElementById("info-panel");
-                        const markers = [];
-                        let infoContent = "<h3>Points and Distances</h3><ul>";
-                        {self.generate_markers_js()}
-                        {self.generate_paths_js()}
-                        {self.generate_master_info_js()}
-                        infoContent += "</ul>";
-                        infoPanel.innerHTML = infoContent;
-                    }}
-                </script>
-                <script async defer src="https://maps.googleapis.com/maps/api/js?key={self.api_key}&libraries=geometry&loading=async&callback=initMap"></script>
-            </body>
-            </html>
-            """
-            return html
+            return build_map_html(st.session_state.points, self.api_key, st.session_state.master_point,
+                                  zoom=st.session_state.map_zoom, map_type=st.session_state.map_type,
+                                  label_style="letter")
         except Exception as e:
             logging.error(f"Error in generate_map_html: {str(e)}")
             return "<html><body>Error generating map</body></html>"
 
-    def generate_markers_js(self):
-        """Generate JavaScript code for markers"""
-        try:
-            js_code = ""
-            for i, (name, lat, lon) in enumerate(st.session_state.points):
-                js_code += f"""
-                    const marker{i} = new google.maps.Marker({{
-                        position: {{ lat: {lat}, lng: {lon} }},
-                        map: map,
-                        title: "{name}",
-                        label: "{chr(65 + i)}"
-                    }});
-                    marker{i}.addListener('click', function() {{
-                        infoWindow.setContent('<div><strong>{name}</strong><br>Lat: {lat:.6f}<br>Lon: {lon:.6f}</div>');
-                        infoWindow.open(map, marker{i});
-                    }});
-                    markers.push(marker{i});
-                    infoContent += "<li><strong>{name}</strong> (Lat: {lat:.6f}, Lon: {lon:.6f})</li>";
-                """
-            return js_code
-        except Exception as e:
-            logging.error(f"Error in generate_markers_js: {str(e)}")
-            return ""
-
-    def generate_paths_js(self):
-        """Generate JavaScript code for paths and distances"""
-        try:
-            if len(st.session_state.points) < 2:
-                return ""
-            js_code = "const pathCoordinates = ["
-            for _, lat, lon in st.session_state.points:
-                js_code += f"{{lat: {lat}, lng: {lon}}},"
-            js_code += "];"
-            js_code += """
-            const path = new google.maps.Polyline({
-                path: pathCoordinates,
-                geodesic: true,
-                strokeColor: "#FF0000",
-                strokeOpacity: 1.0,
-                strokeWeight: 2
-            });
-            path.setMap(map);
-            """
-            for i in range(len(st.session_state.points) - 1):
-                name1, lat1, lon1 = st.session_state.points[i]
-                name2, lat2, lon2 = st.session_state.points[i + 1]
-                distance = self.calculate_distance(lat1, lon1, lat2, lon2)
-                mid_lat = (lat1 + lat2) / 2
-                mid_lon = (lon1 + lon2) / 2
-                js_code += f"""
-                const distanceMarker{i} = new google.maps.Marker({{
-                    position: {{ lat: {mid_lat}, lng: {mid_lon} }},
-                    map: map,
-                    icon: {{
-                        path: google.maps.SymbolPath.CIRCLE,
-                        scale: 0
-                    }},
-                    label: {{
-                        text: "{distance:.2f} km",
-                        color: "#0000FF",
-                        fontSize: "12px",
-                        fontWeight: "bold"
-                    }}
-                }});
-                """
-            return js_code
-        except Exception as e:
-            logging.error(f"Error in generate_paths_js: {str(e)}")
-            return ""
-
-    def generate_master_info_js(self):
-        """Generate JavaScript code for master point info"""
-        try:
-            if not st.session_state.master_point:
-                return ""
-            master_name, master_lat, master_lon = st.session_state.master_point
-            js_code = f"""
-            const masterMarker = new google.maps.Marker({{
-                position: {{ lat: {master_lat}, lng: {master_lon} }},
-                map: map,
-                title: "Master: {master_name}",
-                label: "M",
-                icon: {{
-                    url: "http://maps.google.com/mapfiles/ms/icons/blue-dot.png"
-                }}
-            }});
-            infoContent += "<h4>Distances from Master Point:</h4><ul>";
-            """
-            for name, lat, lon in st.session_state.points:
-                if (name, lat, lon) == st.session_state.master_point:
-                    continue
-                distance = self.calculate_distance(master_lat, master_lon, lat, lon)
-                js_code += f"""
-                infoContent += "<li>{master_name} to {name}: {distance:.3f} km</li>";
-                """
-            js_code += "infoContent += \"</ul>\";"
-            return js_code
-        except Exception as e:
-            logging.error(f"Error in generate_master_info_js: {str(e)}")
-            return ""
-
     def show_map(self):
         """Show map with all points"""
         if not st.session_state.points:
@@ -1049,6 +1015,23 @@ class NetworkSearchApp:
             logging.error(f"Error in show_map: {str(e)}")
             st.error(f"Failed to load map: {str(e)}")
 
+    def show_site_plot(self):
+        """Render the offline site plot (no API key or network needed)"""
+        try:
+            sectors = dataset_sectors(st.session_state.dataset)
+            if sectors.empty and not st.session_state.points:
+                st.error("Load data or add points to plot")
+                return
+            image = render_site_plot(sectors, st.session_state.points, st.session_state.master_point)
+            content = plot_png_bytes(image)
+            st.image(content, caption="LTE orange, NR purple; path red, master blue")
+            st.download_button("Download Plot PNG", content, file_name="site_plot.png", mime="image/png",
+                               key="download_site_plot")
+            self.update_status("Rendered offline site plot")
+        except Exception as e:
+            logging.error(f"Error in show_site_plot: {str(e)}")
+            st.error(f"Failed to render site plot: {str(e)}")
+
     def clear_results(self):
         """Clear all search results"""
         st.session_state.matched_records = []